@@ -1,5 +1,6 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import asyncio
 import logging
 import os
 from models.sentiment_analyzer import SentimentAnalyzer
@@ -10,7 +11,24 @@ from models.follow_up_recommender import FollowUpRecommender
 from models.meeting_scheduler import MeetingScheduler
 from models.progress_analyzer import ProgressAnalyzer
 from models.profile_scraper import ProfileScraper
+from models.response_cache import ResponseCache, SOURCE_TTLS, STALE_TTL
+from models.model_worker_pool import create_model_pool
+from models.health_scorer import RelationshipHealthScorer
+from models.similarity_index import ContactSimilarityIndex
 from data.user_repository import UserRepository
+from data.disk_cache import DiskCache
+from data.sentiment_trend import SentimentTrendIndex
+from data.contact_graph import ContactGraph
+from data.search_index import SearchIndex, KINDS as SEARCH_KINDS
+from data.timeline_store import TimelineStore
+from data.due_index import DueIndex, KINDS as DUE_KINDS
+from data.reminder_scheduler import ReminderScheduler
+from data.finance_ledger import FinanceLedger
+from data.availability import AvailabilityIndex, OWNER
+from data.follow_up_planner import FollowUpPlanner
+from data.engagement_histogram import EngagementHistograms
+from data.analytics import Analytics, TABLES as ANALYTICS_TABLES
+from data.dates import to_epoch_day, today_epoch_day
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,21 +38,91 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Run transformer inference in a shared pool of worker processes instead of the request threads
+use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
+use_model_pool = os.environ.get('USE_MODEL_POOL', 'true').lower() == 'true'
+model_pool = create_model_pool() if use_pretrained_model and use_model_pool else None
+
+# Persistent cache of sentiment results, so repeated texts skip inference across restarts
+sentiment_cache = DiskCache(
+    os.environ.get('SENTIMENT_CACHE_PATH', 'data/sentiment_cache.sqlite3'),
+    max_bytes=int(os.environ.get('SENTIMENT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+)
+
 # Initialize our ML models and repositories
-user_repo = UserRepository()
-sentiment_analyzer = SentimentAnalyzer()
-entity_extractor = EntityExtractor()
-relationship_analyzer = RelationshipAnalyzer()
+sentiment_analyzer = SentimentAnalyzer(model_pool=model_pool, cache=sentiment_cache)
+user_repo = UserRepository(sentiment_analyzer=sentiment_analyzer)
+entity_extractor = EntityExtractor(model_pool=model_pool)
+
+# Indexes kept current by repository mutations
+sentiment_trends = SentimentTrendIndex().build(user_repo.get_all_users())
+user_repo.add_listener(sentiment_trends.on_repository_event)
+health_scorer = RelationshipHealthScorer().refresh(user_repo.get_all_users())
+user_repo.add_listener(health_scorer.on_repository_event)
+health_scorer.start_nightly_refresh(user_repo.get_all_users)
+contact_graph = ContactGraph().build(user_repo.get_all_users())
+user_repo.add_listener(contact_graph.on_repository_event)
+similarity_index = ContactSimilarityIndex(
+    path=os.environ.get('EMBEDDING_INDEX_PATH', 'data/contact_embeddings')
+).sync(user_repo.get_all_users())
+user_repo.add_listener(similarity_index.on_repository_event)
+search_index = SearchIndex().build(user_repo.get_all_users())
+user_repo.add_listener(search_index.on_repository_event)
+timeline_store = TimelineStore().build(user_repo.get_all_users())
+user_repo.add_listener(timeline_store.on_repository_event)
+due_index = DueIndex().build(user_repo.get_all_users())
+user_repo.add_listener(due_index.on_repository_event)
+reminder_scheduler = ReminderScheduler().schedule_all(user_repo.get_all_users()).start()
+user_repo.add_listener(reminder_scheduler.on_repository_event)
+finance_ledger = FinanceLedger().build(user_repo.get_all_users())
+user_repo.add_listener(finance_ledger.on_repository_event)
+availability = AvailabilityIndex().build(user_repo.get_all_users())
+user_repo.add_listener(availability.on_repository_event)
+if os.environ.get('CALENDAR_FILE') and os.path.exists(os.environ['CALENDAR_FILE']):
+    with open(os.environ['CALENDAR_FILE'], encoding='utf-8') as calendar_file:
+        logger.info(f"Imported {availability.import_calendar(calendar_file.read())} events from {os.environ['CALENDAR_FILE']}")
+follow_up_planner = FollowUpPlanner().build(user_repo.get_all_users())
+user_repo.add_listener(follow_up_planner.on_repository_event)
+engagement_histograms = EngagementHistograms().build(user_repo.get_all_users())
+user_repo.add_listener(engagement_histograms.on_repository_event)
+analytics = Analytics().build(user_repo.get_all_users())
+user_repo.add_listener(analytics.on_repository_event)
+
+relationship_analyzer = RelationshipAnalyzer(sentiment_trends=sentiment_trends, contact_graph=contact_graph)
 task_manager = TaskManager()
-follow_up_recommender = FollowUpRecommender()
-meeting_scheduler = MeetingScheduler()
-progress_analyzer = ProgressAnalyzer()
-profile_scraper = ProfileScraper()
+follow_up_recommender = FollowUpRecommender(planner=follow_up_planner, histograms=engagement_histograms)
+meeting_scheduler = MeetingScheduler(availability=availability)
+progress_analyzer = ProgressAnalyzer(task_stats=user_repo.get_task_stats)
+# Scraped pages are cached on disk per source, and served stale while they are refetched
+http_cache = DiskCache(
+    os.environ.get('HTTP_CACHE_PATH', 'data/http_cache.sqlite3'),
+    max_bytes=int(os.environ.get('HTTP_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    memory_items=int(os.environ.get('HTTP_CACHE_MEMORY_ITEMS', 256))
+)
+response_cache = ResponseCache(
+    http_cache,
+    ttls={source: float(os.environ.get(f'HTTP_CACHE_TTL_{source.upper()}', ttl)) for source, ttl in SOURCE_TTLS.items()},
+    stale_ttl=float(os.environ.get('HTTP_CACHE_STALE_TTL', STALE_TTL))
+)
+profile_scraper = ProfileScraper(response_cache=response_cache)
+max_batch_queries = int(os.environ.get('PROFILE_BATCH_MAX_QUERIES', 500))
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({"status": "healthy"})
+    health = {"status": "healthy"}
+    if model_pool is not None:
+        try:
+            health["modelPool"] = model_pool.stats()
+        except Exception as e:
+            health["status"] = "degraded"
+            health["modelPool"] = {"error": str(e)}
+    health["sentimentCache"] = sentiment_cache.stats()
+    health["httpCache"] = response_cache.stats()
+    health["profileCoalescing"] = profile_scraper.coalescing_stats()
+    if profile_scraper.driver_pool is not None:
+        health["webDriverPool"] = profile_scraper.driver_pool.stats()
+    return jsonify(health)
 
 @app.route('/api/process-command', methods=['POST'])
 def process_command():
@@ -127,6 +215,34 @@ def search_profiles():
         logger.error(f"Error searching profiles: {str(e)}", exc_info=True)
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+async def _search_profiles_batch(queries, limit):
+    try:
+        return await profile_scraper.search_many_async(queries, limit)
+    finally:
+        # Each request runs its own event loop, and the loop's connections close with it
+        await profile_scraper.async_http.aclose()
+
+@app.route('/api/profiles/search/batch', methods=['POST'])
+def search_profiles_batch():
+    """Search for profiles for many queries at once"""
+    try:
+        data = request.json or {}
+        queries = data.get('queries')
+        limit = int(data.get('limit', 5))
+        
+        if not isinstance(queries, list) or not queries or not all(isinstance(query, str) and query for query in queries):
+            return jsonify({"error": "queries must be a non-empty list of strings"}), 400
+        if len(queries) > max_batch_queries:
+            return jsonify({"error": f"At most {max_batch_queries} queries per batch"}), 400
+        
+        logger.info(f"Searching profiles for {len(queries)} queries (limit: {limit})")
+        results = asyncio.run(_search_profiles_batch(queries, limit))
+        return jsonify({"results": dict(zip(queries, results)), "http": profile_scraper.async_http.stats()})
+        
+    except Exception as e:
+        logger.error(f"Error searching profiles: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route('/api/profiles/details', methods=['GET'])
 def get_profile_details():
     """Get detailed information for a specific profile"""
@@ -196,28 +312,454 @@ def add_person():
             "notes": []
         }
         
-        # Add the person to the repository
-        # In a real application, this would be stored in a database
-        # For now, we'll just return the new person
+        # Add the person to the repository; indexes are updated through its listeners
+        if user_repo.add_user(new_person) is None:
+            return jsonify({"error": f"Person with ID {person_id} already exists"}), 409
         logger.info(f"Successfully added person: {new_person['name']} (ID: {new_person['id']})")
         
-        # Add to repository (if implemented)
-        # user_repo.add_user(new_person)
-        
         return jsonify(new_person)
         
     except Exception as e:
         logger.error(f"Error adding person: {str(e)}", exc_info=True)
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route('/api/people/<person_id>/meetings', methods=['POST'])
+def add_meeting(person_id):
+    """Record a meeting with a person"""
+    try:
+        data = request.json
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        meeting = user_repo.add_meeting(person_id, data)
+        if not meeting:
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        return jsonify(meeting)
+        
+    except Exception as e:
+        logger.error(f"Error adding meeting: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/meetings/schedule', methods=['POST'])
+def schedule_group_meeting():
+    """Suggest meeting times with several people"""
+    try:
+        data = request.json
+        if not data or not isinstance(data.get('personIds'), list) or not data['personIds']:
+            return jsonify({"error": "personIds must be a non-empty list"}), 400
+
+        people = []
+        for person_id in dict.fromkeys(data['personIds']):
+            person = user_repo.get_user_by_id(person_id)
+            if not person:
+                return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+            people.append(person)
+
+        try:
+            duration = int(data['durationMinutes']) if data.get('durationMinutes') else None
+            min_attendees = int(data['minAttendees']) if data.get('minAttendees') else None
+            limit = int(data.get('limit', 3))
+        except (TypeError, ValueError):
+            return jsonify({"error": "durationMinutes, minAttendees and limit must be integers"}), 400
+        if (duration is not None and duration <= 0) or limit <= 0:
+            return jsonify({"error": "durationMinutes and limit must be positive"}), 400
+
+        return jsonify(meeting_scheduler.suggest_group_meeting_times(
+            data.get('command', ''), people, duration_minutes=duration, min_attendees=min_attendees, limit=limit
+        ))
+
+    except Exception as e:
+        logger.error(f"Error scheduling group meeting: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/calendar/import', methods=['POST'])
+def import_calendar():
+    """Import busy times from an iCalendar (.ics) file, for you or for a contact"""
+    try:
+        person_id = request.args.get('personId')
+        if person_id and not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+
+        text = request.get_data(as_text=True)
+        if 'BEGIN:VCALENDAR' not in text:
+            return jsonify({"error": "Request body must be an iCalendar file"}), 400
+
+        imported = availability.import_calendar(text, person_id or OWNER)
+        return jsonify({"imported": imported, "participant": person_id or OWNER})
+
+    except Exception as e:
+        logger.error(f"Error importing calendar: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/sentiment-trend', methods=['GET'])
+def get_sentiment_trend(person_id):
+    """Get how the sentiment of meetings with a person has evolved"""
+    try:
+        if not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        months = request.args.get('months', type=int)
+        trend = sentiment_trends.get_trend(person_id, months)
+        if trend is None:
+            return jsonify({"personId": person_id, "meetingCount": 0, "months": []})
+        
+        return jsonify(trend)
+        
+    except Exception as e:
+        logger.error(f"Error getting sentiment trend: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/relationship-health', methods=['GET'])
+def get_relationship_health():
+    """List the most at-risk (default) or healthiest relationships"""
+    try:
+        limit = int(request.args.get('limit', 10))
+        order = request.args.get('order', 'at-risk')
+        if order not in ('at-risk', 'healthiest'):
+            return jsonify({"error": "order must be 'at-risk' or 'healthiest'"}), 400
+        
+        return jsonify({
+            "summary": health_scorer.summary(),
+            "contacts": health_scorer.top_k(limit, at_risk=(order == 'at-risk'))
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting relationship health: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/relationship-health/refresh', methods=['POST'])
+def refresh_relationship_health():
+    """Re-score every relationship now"""
+    try:
+        health_scorer.refresh(user_repo.get_all_users())
+        return jsonify(health_scorer.summary())
+        
+    except Exception as e:
+        logger.error(f"Error refreshing relationship health: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/relationship-health', methods=['GET'])
+def get_person_relationship_health(person_id):
+    """Get the health score of one relationship"""
+    try:
+        score = health_scorer.get_score(person_id)
+        if not score:
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        return jsonify(score)
+        
+    except Exception as e:
+        logger.error(f"Error getting relationship health: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/introductions', methods=['GET'])
+def get_introductions(person_id):
+    """Find contacts who can introduce you to a person"""
+    try:
+        if not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        max_depth = min(int(request.args.get('maxDepth', 3)), 4)
+        limit = int(request.args.get('limit', 5))
+        
+        return jsonify({
+            "personId": person_id,
+            "introducers": contact_graph.find_introducers(person_id, max_depth=max_depth, limit=limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error finding introductions: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/bridges', methods=['GET'])
+def get_bridges(person_id):
+    """Find contacts linked to a person who open up the most new connections"""
+    try:
+        if not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        limit = int(request.args.get('limit', 5))
+        
+        return jsonify({
+            "personId": person_id,
+            "bridges": contact_graph.best_bridges(person_id, limit=limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error finding bridge contacts: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/similar', methods=['GET'])
+def get_similar_contacts(person_id):
+    """Find contacts whose profile and meetings are most similar to a person"""
+    try:
+        if not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        limit = int(request.args.get('limit', 5))
+        
+        return jsonify({
+            "personId": person_id,
+            "similar": similarity_index.similar_to(person_id, k=limit) or []
+        })
+        
+    except Exception as e:
+        logger.error(f"Error finding similar contacts: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/contacts/similar', methods=['GET'])
+def search_similar_contacts():
+    """Find contacts matching a free-text description"""
+    try:
+        query = request.args.get('q', '')
+        limit = int(request.args.get('limit', 5))
+        
+        if not query:
+            return jsonify({"error": "Query parameter 'q' is required"}), 400
+        
+        return jsonify({
+            "query": query,
+            "contacts": similarity_index.search(query, k=limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error searching similar contacts: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """Full-text search across meeting summaries, tasks and timeline entries"""
+    try:
+        query = request.args.get('q', '')
+        limit = min(int(request.args.get('limit', 10)), 100)
+        kind = request.args.get('type')
+        person_id = request.args.get('personId')
+        
+        if not query:
+            return jsonify({"error": "Query parameter 'q' is required"}), 400
+        if kind is not None and kind not in SEARCH_KINDS:
+            return jsonify({"error": f"type must be one of: {', '.join(SEARCH_KINDS)}"}), 400
+        
+        results = search_index.search(query, limit=limit, kind=kind, person_id=person_id)
+        results["query"] = query
+        return jsonify(results)
+        
+    except Exception as e:
+        logger.error(f"Error searching: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+def _date_range_args():
+    """Read 'from'/'to' date query parameters as epoch days, raising ValueError if either is invalid"""
+    days = []
+    for name in ('from', 'to'):
+        value = request.args.get(name)
+        day = to_epoch_day(value) if value else None
+        if value and day is None:
+            raise ValueError(f"Invalid date for '{name}': {value}")
+        days.append(day)
+    return days
+
+@app.route('/api/feed', methods=['GET'])
+def get_feed():
+    """Activity across all contacts, newest first, paged by cursor"""
+    try:
+        try:
+            start_day, end_day = _date_range_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Upcoming task deadlines are not activity yet
+        if end_day is None:
+            end_day = today_epoch_day()
+        limit = min(int(request.args.get('limit', 20)), 100)
+        types = request.args.getlist('type') or None
+        
+        try:
+            return jsonify(timeline_store.feed(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                start_day=start_day,
+                end_day=end_day,
+                types=types
+            ))
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        
+    except Exception as e:
+        logger.error(f"Error getting activity feed: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/people/<person_id>/timeline', methods=['GET'])
+def get_person_timeline(person_id):
+    """A person's timeline in a date range, newest first"""
+    try:
+        if not user_repo.get_user_by_id(person_id):
+            return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+        
+        try:
+            start_day, end_day = _date_range_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        return jsonify({
+            "personId": person_id,
+            "timeline": timeline_store.get_timeline(
+                person_id,
+                start_day=start_day,
+                end_day=end_day,
+                types=request.args.getlist('type') or None,
+                newest_first=request.args.get('order', 'desc') != 'asc'
+            )
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting timeline: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/tasks/due', methods=['GET'])
+def get_due_items():
+    """Open tasks and owed payments due by a date (default: today), soonest first"""
+    try:
+        before = request.args.get('before')
+        before_day = to_epoch_day(before) if before else today_epoch_day()
+        if before_day is None:
+            return jsonify({"error": f"Invalid date for 'before': {before}"}), 400
+        after = request.args.get('after')
+        after_day = to_epoch_day(after) if after else None
+        if after and after_day is None:
+            return jsonify({"error": f"Invalid date for 'after': {after}"}), 400
+        
+        kinds = request.args.getlist('type') or None
+        if kinds and any(kind not in DUE_KINDS for kind in kinds):
+            return jsonify({"error": f"type must be one of: {', '.join(DUE_KINDS)}"}), 400
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        
+        return jsonify({
+            "items": due_index.due(before_day, after_day=after_day, kinds=kinds, limit=limit),
+            "counts": due_index.count_due(before_day)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting due items: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/follow-ups/due', methods=['GET'])
+def get_due_follow_ups():
+    """Contacts due for a follow-up, most overdue first, paged by cursor"""
+    try:
+        before = request.args.get('before')
+        before_day = to_epoch_day(before) if before else None
+        if before and before_day is None:
+            return jsonify({"error": f"Invalid date for 'before': {before}"}), 400
+        limit = min(int(request.args.get('limit', 20)), 100)
+        
+        try:
+            return jsonify(follow_up_planner.due(before_day=before_day, limit=limit, cursor=request.args.get('cursor')))
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        
+    except Exception as e:
+        logger.error(f"Error getting due follow-ups: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/tasks/stats/check', methods=['GET'])
+def check_task_stats():
+    """Recompute task statistics from scratch and report contacts whose running ones drifted"""
+    try:
+        repair = request.args.get('repair', 'false').lower() == 'true'
+        report = user_repo.check_task_stats(repair=repair)
+        if report['drifted']:
+            logger.warning(f"Task statistics drifted for {len(report['drifted'])} contacts")
+        return jsonify(report)
+        
+    except Exception as e:
+        logger.error(f"Error checking task statistics: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/analytics/<table>', methods=['GET'])
+def get_analytics(table):
+    """Task, meeting or finance metrics across all contacts, grouped by a dimension"""
+    try:
+        if table not in ANALYTICS_TABLES:
+            return jsonify({"error": f"Unknown table: {table}. Use one of: {', '.join(ANALYTICS_TABLES)}"}), 404
+        
+        by = request.args.get('by', 'company')
+        limit = min(int(request.args.get('limit', 20)), 1000)
+        # Any other dimension in the query string filters rows, e.g. ?priority=high
+        filters = {
+            dimension: request.args[dimension]
+            for dimension in ANALYTICS_TABLES[table]['dimensions'] if dimension in request.args
+        }
+        
+        try:
+            return jsonify(analytics.aggregate(table, by, filters=filters, sort=request.args.get('sort'), limit=limit))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+    except Exception as e:
+        logger.error(f"Error getting analytics: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/reminders', methods=['GET'])
+def get_reminders():
+    """Reminders fired since a given reminder ID"""
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 50)), 500)
+        
+        return jsonify(reminder_scheduler.reminders(
+            since_id=since,
+            limit=limit,
+            person_id=request.args.get('personId')
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error getting reminders: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/finances/summary', methods=['GET'])
+def get_finance_summary():
+    """Money owed, paid and received across all contacts, optionally within a date range"""
+    try:
+        try:
+            start_day, end_day = _date_range_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        limit = min(int(request.args.get('limit', 5)), 100)
+        person_id = request.args.get('personId')
+        
+        summary = finance_ledger.summary(start_day=start_day, end_day=end_day, limit=limit)
+        if person_id:
+            if not user_repo.get_user_by_id(person_id):
+                return jsonify({"error": f"Person with ID {person_id} not found"}), 404
+            summary["person"] = finance_ledger.contact_balance(person_id)
+        return jsonify(summary)
+        
+    except Exception as e:
+        logger.error(f"Error getting finance summary: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 def process_meeting_summary(command, person):
     """Process meeting summary request"""
     if len(person["meetings"]) > 0:
         meeting = person["meetings"][0]
-        sentiment = sentiment_analyzer.analyze(meeting["summary"])
+        # Labelled meetings and ones scored at write time (or by the backfill job) carry their sentiment
+        if meeting.get("sentimentSource") == "label":
+            # Given with the meeting, not scored, so there is no confidence to report
+            sentiment = {"overall": meeting["sentiment"], "confidenceScore": None}
+        elif meeting.get("sentimentConfidence") is not None:
+            sentiment = {"overall": meeting["sentiment"], "confidenceScore": meeting["sentimentConfidence"]}
+        else:
+            sentiment = sentiment_analyzer.analyze(meeting["summary"])
+        if sentiment["confidenceScore"] is None:
+            sentiment_note = f"{sentiment['overall']} (as given for the meeting)"
+        else:
+            sentiment_note = f"{sentiment['overall']} ({sentiment['confidenceScore']}% confidence)"
         
         return {
-            "message": f"📝 Summary of your meeting \"{meeting['title']}\" with {person['name']}:\n\n{meeting['summary']}\n\nOverall sentiment: {sentiment['overall']} ({sentiment['confidenceScore']}% confidence)\n\nKey action items:\n- Follow up on project timeline\n- Share the design mockups\n- Schedule next review meeting",
+            "message": f"📝 Summary of your meeting \"{meeting['title']}\" with {person['name']}:\n\n{meeting['summary']}\n\nOverall sentiment: {sentiment_note}\n\nKey action items:\n- Follow up on project timeline\n- Share the design mockups\n- Schedule next review meeting",
             "suggestedActions": [
                 f"Set a follow-up meeting with {person['name']}",
                 "Assign a task based on this meeting",
@@ -241,6 +783,11 @@ def process_meeting_summary(command, person):
 def process_task_assignment(command, person):
     """Process task assignment request"""
     task_info = task_manager.extract_task_info(command)
+    user_repo.add_task_to_user(person['id'], {
+        'title': task_info['title'],
+        'dueDate': task_info['deadlineDate'],
+        'priority': task_info['priority']
+    })
     
     return {
         "message": f"✅ I've created a new {task_info['priority']} priority task for {person['name']}: \"{task_info['title']}\"\n\nDeadline: {task_info['deadline']}\nEstimated completion time: {task_info['estimatedTime']}\n\nI've added this to your task management system and set up automated reminders.",
@@ -289,25 +836,61 @@ def process_relationship_analysis(command, person):
 def process_financial_info(command, person):
     """Process financial information request"""
     financial_info = task_manager.extract_financial_info(command, person)
+    settled = financial_info['status'] != 'owed'
+    
+    if financial_info['amountValue'] is not None:
+        finance = {
+            'amount': financial_info['amountValue'],
+            'description': f"{financial_info['type'].capitalize()} ({financial_info['category']})",
+            'type': financial_info['status']
+        }
+        if not settled:
+            finance['direction'] = financial_info['direction']
+            finance['dueDate'] = financial_info['dueDateIso']
+        user_repo.add_finance(person['id'], finance)
+        article = 'an' if financial_info['type'][0] in 'aeiou' else 'a'
+        recorded = f"I've recorded {article} {financial_info['type']} of {financial_info['amount']} {financial_info['direction']} {person['name']}."
+    else:
+        recorded = f"I couldn't find an amount for this {financial_info['type']} {financial_info['direction']} {person['name']}, so nothing was recorded yet."
+    
+    if settled:
+        details = f"Category: {financial_info['category']}"
+        time_estimate = "Settled"
+    else:
+        details = f"Due date: {financial_info['dueDate']}\nCategory: {financial_info['category']}\n\nI'll send you a reminder the day before the due date."
+        time_estimate = f"Due in {financial_info['daysUntilDue']} days"
     
     return {
-        "message": f"💰 I've recorded a {financial_info['type']} of {financial_info['amount']} {financial_info['direction']} {person['name']}.\n\nDue date: {financial_info['dueDate']}\nCategory: {financial_info['category']}\n\nI'll send you a reminder 3 days before the due date.",
+        "message": f"💰 {recorded}\n\n{details}",
         "suggestedActions": [
-            f"{financial_info['direction'] == 'to' ? 'Mark as paid' : 'Record payment received'}",
+            'Mark as paid' if financial_info['direction'] == 'to' else 'Record payment received',
             "Change due date",
             f"Set up recurring {financial_info['type']}"
         ],
         "sentiment": "neutral",
         "confidenceScore": 87,
-        "timeEstimate": f"Due in {financial_info['daysUntilDue']} days"
+        "timeEstimate": time_estimate
     }
 
 def process_meeting_scheduling(command, person):
     """Process meeting scheduling request"""
     meeting_info = meeting_scheduler.suggest_meeting_times(command, person)
-    
+
+    if not meeting_info['options']:
+        return {
+            "message": f"📅 I couldn't find a time in the next {availability.horizon_days} days when both you and {person['name']} are free for {meeting_info['duration']}.",
+            "suggestedActions": [
+                "Try a shorter meeting",
+                f"Ask {person['name']} for their availability"
+            ],
+            "sentiment": "neutral",
+            "confidenceScore": 91,
+            "timeEstimate": meeting_info["duration"]
+        }
+
+    option_lines = '\n'.join(f"{number}. {option}" for number, option in enumerate(meeting_info['options'], 1))
     return {
-        "message": f"📅 I've analyzed both your calendars and found these optimal meeting times with {person['name']}:\n\n1. {meeting_info['option1']}\n2. {meeting_info['option2']}\n3. {meeting_info['option3']}\n\nBased on your past meetings, {meeting_info['recommended']} would be the most productive time.",
+        "message": f"📅 I've analyzed both your calendars and found these optimal meeting times with {person['name']}:\n\n{option_lines}\n\nBased on your past meetings, {meeting_info['recommended']} would be the most productive time.",
         "suggestedActions": [
             f"Schedule for {meeting_info['recommended']}",
             "Suggest alternative times",
@@ -315,7 +898,8 @@ def process_meeting_scheduling(command, person):
         ],
         "sentiment": "positive",
         "confidenceScore": 91,
-        "timeEstimate": meeting_info["duration"]
+        "timeEstimate": meeting_info["duration"],
+        "slots": meeting_info["slots"]
     }
 
 def process_progress_report(command, person):
@@ -323,7 +907,7 @@ def process_progress_report(command, person):
     progress_info = progress_analyzer.generate_progress_report(person)
     
     return {
-        "message": f"📊 Progress report for projects with {person['name']}:\n\n{progress_info['summary']}\n\nOverall completion: {progress_info['completion']}%\nOn track: {progress_info['onTrack'] ? 'Yes ✅' : 'No ⚠️'}\nEstimated completion: {progress_info['eta']}\n\n{progress_info['recommendation']}",
+        "message": f"📊 Progress report for projects with {person['name']}:\n\n{progress_info['summary']}\n\nOverall completion: {progress_info['completion']}%\nOn track: {'Yes ✅' if progress_info['onTrack'] else 'No ⚠️'}\nEstimated completion: {progress_info['eta']}\n\n{progress_info['recommendation']}",
         "suggestedActions": [
             "Request detailed breakdown",
             "Schedule progress review",
@@ -337,9 +921,10 @@ def process_progress_report(command, person):
 def process_unknown_intent(command, person):
     """Process unknown intent"""
     possible_intents = entity_extractor.guess_user_intent(command, person)
+    intent_lines = '\n'.join(f"- {i['description']} ({i['confidence']}% confidence)" for i in possible_intents)
     
     return {
-        "message": f"I'm not sure how to process your specific request about {person['name']}. Here's what I think you might be asking for:\n\n{'\n'.join([f'- {i['description']} ({i['confidence']}% confidence)' for i in possible_intents])}",
+        "message": f"I'm not sure how to process your specific request about {person['name']}. Here's what I think you might be asking for:\n\n{intent_lines}",
         "suggestedActions": [i["suggestedAction"] for i in possible_intents],
         "sentiment": "neutral",
         "confidenceScore": 45
@@ -0,0 +1,71 @@
+"""
+Throughput of many profile searches at once: blocking searches on a thread pool against
+the async client on one event loop, with the search engines replaced by a local stand-in
+HTTP server with fixed delays.
+
+Run from the backend directory:
+    python -m benchmarks.async_profile_search --queries 200
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from benchmarks.profile_search import make_handler
+from models.profile_scraper import ProfileScraper
+
+
+class StandInServer(ThreadingHTTPServer):
+    # Room for every connection the async client opens at once
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def _time(label, fn, queries):
+    start = time.perf_counter()
+    results = fn(queries)
+    elapsed = time.perf_counter() - start
+    found = sum(1 for result in results if result)
+    print(f"{label:<26} {elapsed:8.2f} s  {len(queries) / elapsed:8.1f} searches/s  ({found}/{len(queries)} found)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16, help="thread pool size for blocking searches")
+    parser.add_argument('--per-host', type=int, default=64, help="async requests in flight per host")
+    parser.add_argument('--delay', type=float, default=0.3, help="seconds for every search page")
+    args = parser.parse_args()
+
+    delays = {'people': args.delay, 'linkedin': args.delay, 'generic': args.delay}
+    server = StandInServer(('127.0.0.1', 0), make_handler(delays))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    scraper = ProfileScraper(use_selenium=False)
+    scraper.google_search_url = f"{base}/google/search"
+    scraper.bing_search_url = f"{base}/bing/search"
+    scraper.async_http.per_host = args.per_host
+
+    queries = [f"Jordan Example{index}" for index in range(args.queries)]
+
+    def threaded(queries):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            return list(pool.map(lambda query: scraper.search_profiles(query, 5), queries))
+
+    async def concurrent(queries):
+        try:
+            return await scraper.search_many_async(queries, 5)
+        finally:
+            await scraper.async_http.aclose()
+
+    _time(f"{args.threads} threads", threaded, queries)
+    _time("async client", lambda queries: asyncio.run(concurrent(queries)), queries)
+    print(f"http stats: {scraper.async_http.stats()}")
+    scraper.orchestrator.shutdown()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Cost of keeping engagement histograms current: incremental updates and a full rebuild.
+
+Run from the backend directory:
+    python -m benchmarks.engagement_histograms --contacts 100000 --updates 100000
+"""
+import argparse
+import random
+import time
+from data.dates import today_epoch_day
+from data.engagement_histogram import EngagementHistograms
+
+START_TIMES = ['09:00', '10:30', '11:30', '13:00', '14:30', '16:00', None]
+
+
+def generate_users(count, interactions, seed=0):
+    """`count` contacts with about `interactions` meetings and contacts each over the past year"""
+    rng = random.Random(seed)
+    today = today_epoch_day()
+    users = []
+    for index in range(count):
+        meetings = [{'day': today - rng.randint(0, 365), 'start': rng.choice(START_TIMES)} for _ in range(rng.randint(0, 2 * interactions))]
+        timeline = [{'type': 'contact', 'day': today - rng.randint(0, 365)} for _ in range(rng.randint(0, interactions))]
+        users.append({'id': str(index), 'meetings': meetings, 'timeline': timeline})
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--contacts', type=int, default=100000)
+    parser.add_argument('--interactions', type=int, default=5, help="average interactions per contact")
+    parser.add_argument('--updates', type=int, default=100000)
+    args = parser.parse_args()
+
+    users = generate_users(args.contacts, args.interactions)
+    total = sum(len(user['meetings']) + len(user['timeline']) for user in users)
+
+    start = time.perf_counter()
+    histograms = EngagementHistograms().build(users)
+    elapsed = time.perf_counter() - start
+    print(f"{'rebuild':<24} {elapsed * 1000:8.1f} ms  ({args.contacts} contacts, {total} interactions)")
+
+    rng = random.Random(1)
+    today = today_epoch_day()
+    events = [
+        ({'id': str(rng.randrange(args.contacts))}, {'day': today, 'start': rng.choice(START_TIMES)})
+        for _ in range(args.updates)
+    ]
+    start = time.perf_counter()
+    for user, meeting in events:
+        histograms.on_repository_event('meeting_added', user, meeting)
+    elapsed = time.perf_counter() - start
+    print(f"{'incremental update':<24} {elapsed / args.updates * 1e6:8.2f} us/event")
+
+    start = time.perf_counter()
+    for user, _ in events[:10000]:
+        histograms.histogram(user['id'])
+    elapsed = time.perf_counter() - start
+    print(f"{'histogram lookup':<24} {elapsed / min(10000, args.updates) * 1e6:8.2f} us/lookup")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Latency of profile search: the sequential cascade against the concurrent orchestrator,
+with the search engines replaced by a local stand-in HTTP server with fixed delays.
+
+Run from the backend directory:
+    python -m benchmarks.profile_search --queries 10
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from models.profile_scraper import ProfileScraper
+
+GOOGLE_LINKEDIN_PAGE = """<html><body>{results}</body></html>"""
+GOOGLE_LINKEDIN_RESULT = """
+<div class="g"><a href="/url?q=https://www.linkedin.com/in/{slug}&sa=U"><h3>{name} - Staff Engineer - Acme | LinkedIn</h3></a>
+<div class="VwiC3b">Staff Engineer at Acme · Austin, TX · 500+ connections</div></div>"""
+BING_PAGE = """<html><body><ol>{results}</ol></body></html>"""
+BING_RESULT = """
+<li class="b_algo"><h2><a href="https://example.com/{slug}">{name} - Profile</a></h2>
+<div class="b_caption"><p>Product Manager at Initech, Denver, CO</p></div></li>"""
+# A people search without a knowledge panel: no results
+GOOGLE_PEOPLE_PAGE = "<html><body><div id='search'></div></body></html>"
+
+
+def make_handler(delays):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query).get('q', [''])[0]
+            name = query.split(' site:')[0].replace(' person', '').replace(' professional profile', '').title()
+            slug = name.lower().replace(' ', '-')
+            if url.path == '/bing/search':
+                kind, body = 'generic', BING_PAGE.format(results=BING_RESULT.format(name=name, slug=slug))
+            elif 'site:linkedin.com' in query:
+                kind, body = 'linkedin', GOOGLE_LINKEDIN_PAGE.format(results=GOOGLE_LINKEDIN_RESULT.format(name=name, slug=slug))
+            else:
+                kind, body = 'people', GOOGLE_PEOPLE_PAGE
+            time.sleep(delays[kind])
+            payload = body.encode()
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client cancelled the search
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def sequential_search(scraper, query, limit):
+    """The previous strategy: try each method in turn until one returns results"""
+    for method in (scraper._search_google_people, scraper._search_google_linkedin, scraper._search_generic):
+        results = method(query, limit)
+        if results:
+            return results[:limit]
+    return []
+
+
+def _time(label, fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    elapsed = time.perf_counter() - start
+    found = sum(1 for result in results if result)
+    print(f"{label:<26} {elapsed / len(queries) * 1000:8.1f} ms/query  ({found}/{len(queries)} found)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=10)
+    parser.add_argument('--people-delay', type=float, default=1.0, help="seconds for the (empty) Google People page")
+    parser.add_argument('--linkedin-delay', type=float, default=1.5, help="seconds for the Google LinkedIn page")
+    parser.add_argument('--generic-delay', type=float, default=0.4, help="seconds for the generic search page")
+    args = parser.parse_args()
+
+    delays = {'people': args.people_delay, 'linkedin': args.linkedin_delay, 'generic': args.generic_delay}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(delays))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    scraper = ProfileScraper(use_selenium=False)
+    scraper.google_search_url = f"{base}/google/search"
+    scraper.bing_search_url = f"{base}/bing/search"
+
+    queries = [f"Jordan Example{index}" for index in range(args.queries)]
+    _time("sequential cascade", lambda query: sequential_search(scraper, query, 5), queries)
+    _time("concurrent orchestrator", lambda query: scraper.search_profiles(query, 5), queries)
+    print(f"orchestrator stats: {scraper.orchestrator.stats()}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Concurrent identical profile searches with and without request coalescing, against a
+local stand-in HTTP server for the search engines: wall time and pages fetched.
+
+Run from the backend directory:
+    python -m benchmarks.search_coalescing --callers 50
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.async_profile_search import StandInServer
+from benchmarks.profile_search import make_handler
+from models.profile_scraper import ProfileScraper
+
+
+def make_counting_handler(delays, counter):
+    base = make_handler(delays)
+
+    class Handler(base):
+        def do_GET(self):
+            with counter['lock']:
+                counter['requests'] += 1
+            super().do_GET()
+
+    return Handler
+
+
+def _time(label, search, callers, counter):
+    counter['requests'] = 0
+    barrier = threading.Barrier(callers)
+
+    def call(index):
+        barrier.wait()
+        # Same search, typed differently
+        return search("Jordan Example" if index % 2 else "  jordan   EXAMPLE ", 5)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        results = list(pool.map(call, range(callers)))
+    elapsed = time.perf_counter() - start
+    found = sum(1 for result in results if result)
+    print(f"{label:<22} {elapsed:8.2f} s  {counter['requests']:5d} pages fetched  ({found}/{callers} found)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--callers', type=int, default=50, help="concurrent identical searches")
+    parser.add_argument('--delay', type=float, default=0.5, help="seconds for every search page")
+    args = parser.parse_args()
+
+    counter = {'lock': threading.Lock(), 'requests': 0}
+    delays = {'people': args.delay, 'linkedin': args.delay, 'generic': args.delay}
+    server = StandInServer(('127.0.0.1', 0), make_counting_handler(delays, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    scraper = ProfileScraper(use_selenium=False)
+    scraper.google_search_url = f"{base}/google/search"
+    scraper.bing_search_url = f"{base}/bing/search"
+
+    _time("without coalescing", scraper._search_profiles, args.callers, counter)
+    _time("with coalescing", scraper.search_profiles, args.callers, counter)
+    print(f"coalescing stats: {scraper.search_flights.stats()}")
+    scraper.orchestrator.shutdown()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
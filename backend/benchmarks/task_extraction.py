@@ -0,0 +1,59 @@
+"""
+Throughput of rule-based task extraction over a generated corpus of commands.
+
+Run from the backend directory:
+    python -m benchmarks.task_extraction --commands 20000
+"""
+import argparse
+import datetime
+import random
+import time
+from models.task_manager import TaskManager, _extract_task
+
+VERBS = ['Assign Alex to', 'Create a task to', 'Add a task for', 'Set a reminder to', 'Task:', 'Please']
+ACTIONS = ['send the design mockups', 'review the Q3 report', 'call the investors', 'draft the proposal',
+           'prepare the board deck', 'migrate the billing database', 'email the contract', 'book the venue']
+DEADLINES = ['', 'by next Friday', 'in 3 days', 'tomorrow', 'by the end of the month', 'on Thursday',
+             'by Nov 3rd', 'in two weeks', 'before 2030-01-15', 'next week']
+CUES = ['', 'urgent', 'asap', 'no rush', 'when you can', 'high priority']
+
+
+def generate_commands(count, unique, seed=0):
+    """`count` commands drawn from a pool of `unique` distinct ones"""
+    rng = random.Random(seed)
+    pool = [
+        ' '.join(part for part in (rng.choice(VERBS), rng.choice(ACTIONS), rng.choice(DEADLINES), rng.choice(CUES)) if part)
+        for _ in range(unique)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def _time(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {count / elapsed:10.0f} commands/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--commands', type=int, default=20000)
+    parser.add_argument('--unique', type=int, default=2000, help="distinct commands in the corpus")
+    args = parser.parse_args()
+
+    manager = TaskManager()
+    today = datetime.date.today()
+    commands = generate_commands(args.commands, args.unique)
+
+    _extract_task.cache_clear()
+    _time("single, cold cache", lambda: [manager.extract_task_info(command, today) for command in commands], len(commands))
+    _time("single, warm cache", lambda: [manager.extract_task_info(command, today) for command in commands], len(commands))
+    _extract_task.cache_clear()
+    _time("batch, cold cache", lambda: manager.extract_task_info_batch(commands, today), len(commands))
+    _time("batch, warm cache", lambda: manager.extract_task_info_batch(commands, today), len(commands))
+    _extract_task.cache_clear()
+    _time("uncached (cache cleared)", lambda: [_extract_task.__wrapped__(command, today) for command in commands], len(commands))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Lets tests import backend modules the way the app does (`from data.x import ...`)
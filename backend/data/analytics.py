@@ -0,0 +1,249 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from data.dates import today_epoch_day
+from data.finance_ledger import CATEGORIES, category_of
+
+# Contacts per partition; a mutation rebuilds only its contact's partition
+PARTITION_SIZE = 4096
+# Grouped queries kept with their per-partition partials; the least recently used are dropped
+MAX_QUERIES = 64
+CONTACT_DIMENSIONS = ('company', 'relationshipStatus')
+# Dimensions each table can be grouped by, and the metrics reported for every group
+TABLES = {
+    'tasks': {
+        'dimensions': CONTACT_DIMENSIONS + ('status', 'priority', 'dueMonth'),
+        'metrics': ('tasks', 'open', 'completed', 'overdue', 'highPriorityOpen', 'overdueHighPriority')
+    },
+    'meetings': {
+        'dimensions': CONTACT_DIMENSIONS + ('month', 'sentiment'),
+        'metrics': ('meetings', 'positive', 'neutral', 'negative')
+    },
+    'finances': {
+        'dimensions': CONTACT_DIMENSIONS + ('month', 'category'),
+        'metrics': ('entries',) + CATEGORIES
+    }
+}
+# Repository events and the tables they change
+EVENT_TABLES = {
+    'task_added': ('tasks',),
+    'task_completed': ('tasks',),
+    'meeting_added': ('meetings',),
+    'finance_added': ('finances',),
+    'user_added': tuple(TABLES)
+}
+
+
+def _months(days):
+    """'YYYY-MM' for a float column of epoch days (NaN when undated)"""
+    months = days.to_numpy(dtype='float64')
+    dated = ~np.isnan(months)
+    labels = np.full(len(months), None, dtype=object)
+    labels[dated] = months[dated].astype('int64').astype('datetime64[D]').astype('datetime64[M]').astype(str)
+    return labels
+
+
+def _frame(table, users):
+    """Flatten one table of a group of contacts into a DataFrame, one row per item"""
+    columns = {'personId': [], 'company': [], 'relationshipStatus': []}
+    if table == 'tasks':
+        columns.update(status=[], priority=[], dueDay=[])
+    elif table == 'meetings':
+        columns.update(day=[], sentiment=[])
+    else:
+        columns.update(day=[], category=[], amount=[])
+
+    for user in users:
+        items = user.get(table, [])
+        if not items:
+            continue
+        columns['personId'] += [user['id']] * len(items)
+        columns['company'] += [user.get('company') or 'Unknown'] * len(items)
+        columns['relationshipStatus'] += [user.get('relationshipStatus')] * len(items)
+        if table == 'tasks':
+            for task in items:
+                columns['status'].append(task.get('status', 'pending'))
+                columns['priority'].append(task.get('priority', 'medium'))
+                columns['dueDay'].append(task.get('dueDay'))
+        elif table == 'meetings':
+            for meeting in items:
+                columns['day'].append(meeting.get('day'))
+                columns['sentiment'].append(meeting.get('sentiment', 'neutral'))
+        else:
+            for finance in items:
+                columns['day'].append(finance.get('day'))
+                columns['category'].append(category_of(finance))
+                columns['amount'].append(float(finance.get('amount') or 0))
+
+    frame = pd.DataFrame(columns)
+    if table == 'tasks':
+        frame['dueDay'] = frame['dueDay'].astype('float64')
+        frame['dueMonth'] = _months(frame['dueDay'])
+    else:
+        frame['day'] = frame['day'].astype('float64')
+        frame['month'] = _months(frame['day'])
+    return frame
+
+
+def _metrics(table, frame, today):
+    """Per-row metric columns of a table, so every group is a plain sum"""
+    if table == 'tasks':
+        open_tasks = frame['status'] != 'completed'
+        # data.task_stats.is_overdue, per row
+        overdue = open_tasks & ((frame['status'] == 'overdue') | (frame['dueDay'] < today))
+        high = frame['priority'] == 'high'
+        return pd.DataFrame({
+            'tasks': 1,
+            'open': open_tasks,
+            'completed': ~open_tasks,
+            'overdue': overdue,
+            'highPriorityOpen': open_tasks & high,
+            'overdueHighPriority': overdue & high
+        }, index=frame.index).astype('int64')
+    if table == 'meetings':
+        metrics = pd.DataFrame({'meetings': 1}, index=frame.index)
+        for sentiment in ('positive', 'neutral', 'negative'):
+            metrics[sentiment] = (frame['sentiment'] == sentiment).astype('int64')
+        return metrics
+    metrics = pd.DataFrame({'entries': (frame['category'].notna()).astype('int64')}, index=frame.index)
+    for category in CATEGORIES:
+        metrics[category] = frame['amount'].where(frame['category'] == category, 0.0)
+    return metrics
+
+
+class Analytics:
+    """
+    Flattened task, meeting and finance DataFrames for the whole book, cut into partitions
+    of contacts. Every query keeps the grouped partial sums of each partition and their
+    combined total; a mutation bumps the version of the partition and table it touched, and
+    the next query swaps that partition's old partial out of the total for a rebuilt one
+    instead of re-aggregating the book.
+    """
+
+    def __init__(self, partition_size=PARTITION_SIZE, max_queries=MAX_QUERIES):
+        self.partition_size = partition_size
+        self.max_queries = max_queries
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.partitions = []
+        self.partition_of = {}
+        self.frames = {}
+        self.versions = {}
+        # (table, by, filters, day) -> {"partials": {partition: (version, partial)}, "total": DataFrame},
+        # least recently used first
+        self.queries = OrderedDict()
+
+    def build(self, users):
+        with self._lock:
+            self._reset()
+            for user in users:
+                self._place(user)
+        return self
+
+    def _place(self, user):
+        if not self.partitions or len(self.partitions[-1]) >= self.partition_size:
+            self.partitions.append([])
+        self.partition_of[user['id']] = len(self.partitions) - 1
+        self.partitions[-1].append(user)
+        return len(self.partitions) - 1
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        tables = EVENT_TABLES.get(event)
+        if tables is None:
+            return
+        with self._lock:
+            partition = self.partition_of.get(user['id'])
+            if partition is None:
+                partition = self._place(user)
+            for table in tables:
+                self.frames.pop((table, partition), None)
+                self.versions[(table, partition)] = self.versions.get((table, partition), 0) + 1
+
+    def _partial(self, table, by, filters, today, partition):
+        frame = self.frames.get((table, partition))
+        if frame is None:
+            frame = self.frames[(table, partition)] = _frame(table, self.partitions[partition])
+        for column, value in filters:
+            frame = frame[frame[column] == value]
+        return _metrics(table, frame, today).groupby(frame[by], sort=False).sum()
+
+    def _total(self, table, by, filters, today):
+        key = (table, by, filters, today)
+        query = self.queries.get(key)
+        if query is None:
+            # Queries are computed for one day at a time (overdue depends on it)
+            for stale in [stale for stale in self.queries if stale[3] != today]:
+                del self.queries[stale]
+            partials = {
+                partition: (self.versions.get((table, partition), 0), self._partial(table, by, filters, today, partition))
+                for partition in range(len(self.partitions))
+            }
+            non_empty = [partial for _, partial in partials.values() if len(partial)]
+            total = pd.concat(non_empty).groupby(level=0, sort=False).sum() if non_empty else None
+            query = self.queries[key] = {"partials": partials, "total": total}
+            # Filter values come from the query string, so bound how many queries are kept
+            while len(self.queries) > self.max_queries:
+                self.queries.popitem(last=False)
+            return total
+
+        self.queries.move_to_end(key)
+        partials = query["partials"]
+        total = query["total"]
+        for partition in range(len(self.partitions)):
+            version = self.versions.get((table, partition), 0)
+            cached = partials.get(partition)
+            if cached is not None and cached[0] == version:
+                continue
+            partial = self._partial(table, by, filters, today, partition)
+            if total is None:
+                total = partial
+            else:
+                if cached is not None:
+                    total = total.sub(cached[1], fill_value=0)
+                total = total.add(partial, fill_value=0)
+            partials[partition] = (version, partial)
+            total = total[(total != 0).any(axis=1)]
+        query["total"] = total
+        return total
+
+    def aggregate(self, table, by, filters=None, sort=None, limit=20):
+        """
+        Metrics of `table` grouped by `by`, largest `sort` metric first.
+        `filters` maps column names to the value rows must have.
+        """
+        spec = TABLES[table]
+        if by not in spec['dimensions']:
+            raise ValueError(f"{table} can be grouped by: {', '.join(spec['dimensions'])}")
+        sort = sort or spec['metrics'][0]
+        if sort not in spec['metrics']:
+            raise ValueError(f"{table} can be sorted by: {', '.join(spec['metrics'])}")
+        filters = tuple(sorted((filters or {}).items()))
+        for column, _ in filters:
+            if column not in spec['dimensions']:
+                raise ValueError(f"{table} can be filtered by: {', '.join(spec['dimensions'])}")
+
+        with self._lock:
+            combined = self._total(table, by, filters, today_epoch_day())
+        if combined is None or not len(combined):
+            return {"table": table, "by": by, "groups": 0, "rows": [], "totals": {metric: 0 for metric in spec['metrics']}}
+
+        top = combined.sort_values(sort, ascending=False, kind='stable').head(limit)
+        totals = combined.sum()
+
+        def value(metric, number):
+            return round(float(number), 2) if metric in CATEGORIES else int(number)
+
+        return {
+            "table": table,
+            "by": by,
+            "groups": len(combined),
+            "rows": [
+                dict({by: group}, **{metric: value(metric, row[metric]) for metric in spec['metrics']})
+                for group, row in zip(top.index, top.to_dict('records'))
+            ],
+            "totals": {metric: value(metric, totals[metric]) for metric in spec['metrics']}
+        }
@@ -0,0 +1,277 @@
+import re
+import threading
+from bisect import insort
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from data.dates import epoch_day_of, from_epoch_day, to_epoch_day
+
+OWNER = 'me'
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WORK_START_HOUR = 9
+WORK_END_HOUR = 18
+# Meetings stored with a date but no time are assumed to take this slot
+DEFAULT_MEETING_START = (10, 0)
+DEFAULT_MEETING_MINUTES = 60
+
+ICS_DURATION_PATTERN = re.compile(r'P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+
+def _epoch_minute(moment):
+    return epoch_day_of(moment) * 1440 + moment.hour * 60 + moment.minute
+
+
+def meeting_interval(meeting):
+    """(start, end) of a stored meeting in minutes since 1970-01-01 local time, or None if undated"""
+    day = meeting.get('day')
+    if day is None:
+        day = to_epoch_day(meeting.get('date'))
+    if day is None:
+        return None
+    hour, minute = DEFAULT_MEETING_START
+    if meeting.get('start'):
+        try:
+            hour, minute = (int(part) for part in meeting['start'].split(':')[:2])
+        except ValueError:
+            pass
+    start = day * 1440 + hour * 60 + minute
+    return start, start + int(meeting.get('durationMinutes') or DEFAULT_MEETING_MINUTES)
+
+
+def _parse_ics_time(value, params):
+    """Parse an ICS DATE or DATE-TIME value; UTC times are converted to local time"""
+    if 'VALUE=DATE' in params or len(value) == 8:
+        return datetime.strptime(value[:8], '%Y%m%d'), True
+    moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    if value.endswith('Z'):
+        moment = moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return moment, False
+
+
+def parse_ics(text):
+    """
+    Busy intervals (epoch minutes) of the VEVENTs in an iCalendar file.
+    Events marked TRANSPARENT (free) are skipped; recurrence rules are not expanded.
+    """
+    # Unfold continuation lines
+    lines = re.sub(r'\r?\n[ \t]', '', text).splitlines()
+    intervals = []
+    event = None
+    for line in lines:
+        if line == 'BEGIN:VEVENT':
+            event = {}
+        elif line == 'END:VEVENT' and event is not None:
+            if 'DTSTART' in event and event.get('TRANSP') != 'TRANSPARENT':
+                (start, all_day) = event['DTSTART']
+                if 'DTEND' in event:
+                    end = event['DTEND'][0]
+                elif 'DURATION' in event:
+                    weeks, days, hours, minutes, seconds = (int(part or 0) for part in ICS_DURATION_PATTERN.match(event['DURATION']).groups())
+                    end = start + timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+                else:
+                    end = start + (timedelta(days=1) if all_day else timedelta(0))
+                if end > start:
+                    intervals.append((_epoch_minute(start), _epoch_minute(end)))
+            event = None
+        elif event is not None and ':' in line:
+            name_part, value = line.split(':', 1)
+            name, _, params = name_part.partition(';')
+            if name in ('DTSTART', 'DTEND'):
+                try:
+                    event[name] = _parse_ics_time(value.strip(), params)
+                except ValueError:
+                    continue
+            elif name in ('DURATION', 'TRANSP'):
+                event[name] = value.strip()
+    return intervals
+
+
+class AvailabilityIndex:
+    """
+    Busy intervals for you and every contact, kept as sorted lists of epoch-minute
+    (start, end) pairs. Every stored meeting makes both you and the contact busy;
+    imported calendars add to either. Queries turn the intervals into boolean arrays of
+    15-minute slots over the horizon and intersect them with NumPy.
+    """
+
+    def __init__(self, horizon_days=28, work_hours=(WORK_START_HOUR, WORK_END_HOUR), workdays=5):
+        self.horizon_days = horizon_days
+        self.work_hours = work_hours
+        self.workdays = workdays
+        self.intervals = {}
+        self._lock = threading.Lock()
+
+    def build(self, users):
+        with self._lock:
+            self.intervals = {}
+            for user in users:
+                self._add_user(user)
+        return self
+
+    def _add(self, participant, interval):
+        insort(self.intervals.setdefault(participant, []), interval)
+
+    def _add_meeting(self, person_id, meeting):
+        interval = meeting_interval(meeting)
+        if interval is None:
+            return
+        self._add(OWNER, interval)
+        self._add(person_id, interval)
+        for attendee in meeting.get('attendees', []):
+            self._add(attendee, interval)
+
+    def _add_user(self, user):
+        for meeting in user.get('meetings', []):
+            self._add_meeting(user['id'], meeting)
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                self._add_user(user)
+        elif event == 'meeting_added':
+            with self._lock:
+                self._add_meeting(user['id'], item)
+
+    def import_calendar(self, text, participant=OWNER):
+        """Add the busy times of an iCalendar file to you or a contact; returns how many were added"""
+        intervals = parse_ics(text)
+        with self._lock:
+            for interval in intervals:
+                self._add(participant, interval)
+        return len(intervals)
+
+    def horizon(self, start=None):
+        """First slot (epoch minute) of the horizon and its slot count"""
+        start = start or datetime.now()
+        return epoch_day_of(start) * 1440, self.horizon_days * SLOTS_PER_DAY
+
+    def busy(self, participants, start=None):
+        """Boolean busy matrix, one row per participant, one column per slot of the horizon"""
+        origin, slots = self.horizon(start)
+        matrix = np.zeros((len(participants), slots), dtype=bool)
+        end = origin + slots * SLOT_MINUTES
+        with self._lock:
+            for row, participant in enumerate(participants):
+                for interval_start, interval_end in self.intervals.get(participant, ()):
+                    if interval_end <= origin or interval_start >= end:
+                        continue
+                    first = max(interval_start - origin, 0) // SLOT_MINUTES
+                    last = -(-(min(interval_end, end) - origin) // SLOT_MINUTES)
+                    matrix[row, first:last] = True
+        return matrix
+
+    def bookable(self, start=None):
+        """Slots in working hours on workdays that have not started yet"""
+        start = start or datetime.now()
+        origin, slots = self.horizon(start)
+        grid = np.zeros((self.horizon_days, SLOTS_PER_DAY), dtype=bool)
+        first_hour, last_hour = self.work_hours
+        grid[:, first_hour * 60 // SLOT_MINUTES:last_hour * 60 // SLOT_MINUTES] = True
+        first_day = epoch_day_of(start)
+        weekdays = (np.arange(first_day, first_day + self.horizon_days) + 3) % 7  # 1970-01-01 was a Thursday
+        grid[weekdays >= self.workdays] = False
+        mask = grid.reshape(-1)
+        mask[:-(-(_epoch_minute(start) - origin) // SLOT_MINUTES)] = False
+        return mask
+
+    def slot_time(self, slot, start=None):
+        origin, _ = self.horizon(start)
+        minute = origin + slot * SLOT_MINUTES
+        return datetime.combine(from_epoch_day(minute // 1440), datetime.min.time()) + timedelta(minutes=minute % 1440)
+
+    @staticmethod
+    def window_fits(free, duration_slots):
+        """
+        For a (participants, slots) free matrix, whether each participant is free for
+        `duration_slots` consecutive slots starting at each slot (the window ANDed over its slots)
+        """
+        free = np.atleast_2d(free)
+        fits = np.zeros(free.shape, dtype=bool)
+        if duration_slots > free.shape[1]:
+            return fits
+        width = free.shape[1] - duration_slots + 1
+        fits[:, :width] = free[:, :width]
+        for offset in range(1, duration_slots):
+            fits[:, :width] &= free[:, offset:offset + width]
+        return fits
+
+    @classmethod
+    def window_starts(cls, free, duration_slots, step=2):
+        """Slots where `duration_slots` consecutive free slots begin, on a `step`-slot grid"""
+        starts = np.flatnonzero(cls.window_fits(free, duration_slots)[0])
+        return starts[starts % step == 0]
+
+    def free_slots(self, participants, duration_minutes=60, limit=3, start=None, one_per_day=True, prefer_morning=False):
+        """
+        The earliest `limit` start times at which you and every participant are free for
+        `duration_minutes`, as (start, end) datetimes. With `one_per_day`, at most one per day;
+        with `prefer_morning`, a day's morning slot is chosen over an earlier-listed afternoon one.
+        """
+        start = start or datetime.now()
+        busy = self.busy([OWNER] + list(participants), start).any(axis=0)
+        free = self.bookable(start) & ~busy
+        duration_slots = -(-duration_minutes // SLOT_MINUTES)
+        starts = self.window_starts(free, duration_slots)
+
+        if not one_per_day:
+            chosen = starts[:limit]
+        else:
+            days = starts // SLOTS_PER_DAY
+            if prefer_morning:
+                # Morning starts sort ahead of the rest of their day
+                afternoon = starts % SLOTS_PER_DAY >= 12 * 60 // SLOT_MINUTES
+                starts = starts[np.lexsort((afternoon, days))]
+                days = starts // SLOTS_PER_DAY
+            first_of_day = np.concatenate(([True], days[1:] != days[:-1])) if len(days) else days.astype(bool)
+            chosen = starts[first_of_day][:limit]
+
+        return [(self.slot_time(int(slot), start), self.slot_time(int(slot) + duration_slots, start)) for slot in chosen]
+
+    def group_slots(self, participants, duration_minutes=60, limit=3, min_attendees=None,
+                    preferences=None, start=None, step=2):
+        """
+        Rank meeting times for a group: you must attend, and each candidate start is scored by
+        how many participants are free for the whole meeting plus, as a tie-break below one
+        attendee, the share of their `preferences` weights (rows over the slots of a day, 0-1)
+        it meets. Returns the best start of each day, most attendees first and then soonest,
+        keeping only starts at least `min_attendees` can make (default: everyone).
+        """
+        start = start or datetime.now()
+        participants = list(participants)
+        count = len(participants)
+        min_attendees = count if min_attendees is None else min(max(min_attendees, 1), count)
+        duration_slots = -(-duration_minutes // SLOT_MINUTES)
+
+        free = ~self.busy([OWNER] + participants, start) & self.bookable(start)
+        fits = self.window_fits(free, duration_slots)
+        grid = np.zeros(fits.shape[1], dtype=bool)
+        grid[::step] = True
+        candidates = np.flatnonzero(fits[0] & grid)
+        attending = fits[1:, candidates]
+        attendees = attending.sum(axis=0)
+        keep = attendees >= min_attendees
+        candidates, attending, attendees = candidates[keep], attending[:, keep], attendees[keep]
+        if not len(candidates):
+            return []
+
+        score = attendees.astype(np.float64)
+        if preferences is not None and count:
+            weights = np.asarray(preferences, dtype=np.float64)[:, candidates % SLOTS_PER_DAY]
+            score += 0.5 * (weights * attending).sum(axis=0) / count
+
+        # Best start of each day (the earliest among equal scores), then most attendees, soonest day
+        days = candidates // SLOTS_PER_DAY
+        order = np.lexsort((candidates, -score, days))
+        first_of_day = np.concatenate(([True], days[order][1:] != days[order][:-1]))
+        best = order[first_of_day]
+        best = best[np.lexsort((days[best], -attendees[best]))][:limit]
+
+        return [{
+            "start": self.slot_time(int(candidates[index]), start),
+            "end": self.slot_time(int(candidates[index]) + duration_slots, start),
+            "attendees": int(attendees[index]),
+            "available": [participants[row] for row in np.flatnonzero(attending[:, index])],
+            "missing": [participants[row] for row in np.flatnonzero(~attending[:, index])],
+            "score": round(float(score[index]), 3)
+        } for index in best]
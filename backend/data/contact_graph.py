@@ -0,0 +1,387 @@
+import threading
+from array import array
+import numpy as np
+
+# Strength of a link through each kind of shared group
+GROUP_WEIGHTS = {'meeting': 5.0, 'company': 3.0, 'platform': 1.0}
+
+# How much we can lean on a contact for an introduction, by relationship status
+STATUS_STRENGTH = {'Close': 3, 'Active': 2, 'New': 1, 'Inactive': 0}
+
+# Rebuild the CSR arrays once this many edges have been added on top of them
+COMPACT_THRESHOLD = 10000
+
+
+def _expand(indptr, indices, rows):
+    """
+    Gather the CSR neighbours of every row in rows in one vectorized step.
+    Returns (neighbours, parent_rows), aligned element by element.
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=indices.dtype)
+        return empty, empty
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+    return indices[offsets], np.repeat(rows, lengths).astype(indices.dtype)
+
+
+def _csr(sources, targets, size):
+    """Build (indptr, indices) for edges sources[i] -> targets[i] over `size` rows"""
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+class ContactGraph:
+    """
+    Graph of contacts linked through shared groups: companies, co-attended meetings
+    and social platforms. It is stored as a bipartite contact/group graph in compact
+    CSR (compressed sparse row) arrays in both directions, so a shared company costs
+    one edge per member instead of one edge per pair of members.
+    New edges go into a small overlay that is folded into the CSR arrays in bulk.
+    """
+
+    def __init__(self, max_group_size=500):
+        # Groups larger than this (e.g. a platform everyone uses) are too weak to traverse
+        self.max_group_size = max_group_size
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.ids = []
+        self.names = []
+        self.statuses = []
+        self.index = {}
+        self.group_keys = []
+        self.group_labels = []
+        self.group_index = {}
+        self._group_weights = []
+        self._empty_csr()
+
+    def _empty_csr(self):
+        self.contact_indptr = np.zeros(1, dtype=np.int64)
+        self.contact_groups = np.zeros(0, dtype=np.int32)
+        self.group_indptr = np.zeros(1, dtype=np.int64)
+        self.group_members = np.zeros(0, dtype=np.int32)
+        self.group_sizes = np.zeros(0, dtype=np.int32)
+        self.group_weights = np.zeros(0, dtype=np.float32)
+        self._overlay_contacts = {}
+        self._overlay_groups = {}
+        self._clear_pending()
+
+    def _clear_pending(self):
+        # Edges linked since the last compaction or overlay update, as parallel arrays
+        self._pending_rows = array('q')
+        self._pending_groups = array('q')
+
+    # ---- building ----
+
+    def build(self, users):
+        """Build the graph for every user in one pass"""
+        with self._lock:
+            self._reset()
+            for user in users:
+                self._add_contact(user)
+            for user in users:
+                for group_key, label, members in self._groups_of(user):
+                    # Duplicates are dropped in bulk by _compact
+                    self._link(group_key, label, members, check_existing=False)
+            self._compact()
+        return self
+
+    def _add_contact(self, user):
+        row = self.index.get(user['id'])
+        if row is None:
+            row = len(self.ids)
+            self.index[user['id']] = row
+            self.ids.append(user['id'])
+            self.names.append(user.get('name', ''))
+            self.statuses.append(user.get('relationshipStatus'))
+        return row
+
+    def _groups_of(self, user):
+        """Yield (group key, label, member person ids) for every group the user belongs to"""
+        if user.get('company'):
+            yield f"company:{user['company']}", f"{user['company']} (company)", [user['id']]
+        for social in user.get('socialMedia', []):
+            if social.get('platform'):
+                yield f"platform:{social['platform']}", f"{social['platform']} (platform)", [user['id']]
+        for meeting in user.get('meetings', []):
+            attendees = meeting.get('attendees')
+            if attendees:
+                yield (f"meeting:{user['id']}:{meeting['id']}",
+                       f"meeting \"{meeting.get('title', '')}\"",
+                       [user['id']] + list(attendees))
+
+    def _link(self, group_key, label, person_ids, check_existing=True):
+        group = self.group_index.get(group_key)
+        if group is None:
+            group = len(self.group_keys)
+            self.group_index[group_key] = group
+            self.group_keys.append(group_key)
+            self.group_labels.append(label)
+            self._group_weights.append(GROUP_WEIGHTS[group_key.split(':', 1)[0]])
+            check_existing = False
+        for person_id in person_ids:
+            row = self.index.get(person_id)
+            if row is None:
+                continue
+            if check_existing and self._has_edge(row, group):
+                continue
+            self._pending_rows.append(row)
+            self._pending_groups.append(group)
+
+    def _has_edge(self, row, group):
+        if row + 1 < len(self.contact_indptr):
+            start, end = self.contact_indptr[row], self.contact_indptr[row + 1]
+            if group in self.contact_groups[start:end]:
+                return True
+        if group in self._overlay_contacts.get(row, ()):
+            return True
+        return any(r == row and g == group for r, g in zip(self._pending_rows, self._pending_groups))
+
+    def _compact(self):
+        """Fold the CSR arrays, the overlay and pending edges into fresh, de-duplicated CSR arrays"""
+        contact_count = len(self.ids)
+        group_count = len(self.group_keys)
+
+        existing_rows = np.repeat(np.arange(len(self.contact_indptr) - 1), np.diff(self.contact_indptr))
+        overlay_rows = [row for row, groups in self._overlay_contacts.items() for _ in groups]
+        overlay_groups = [group for groups in self._overlay_contacts.values() for group in groups]
+        contacts = np.concatenate([
+            existing_rows,
+            np.array(overlay_rows, dtype=np.int64),
+            np.frombuffer(self._pending_rows, dtype=np.int64)
+        ]).astype(np.int64)
+        groups = np.concatenate([
+            self.contact_groups,
+            np.array(overlay_groups, dtype=np.int64),
+            np.frombuffer(self._pending_groups, dtype=np.int64)
+        ]).astype(np.int64)
+
+        # Drop duplicate edges
+        keys = np.unique(contacts * max(group_count, 1) + groups)
+        contacts, groups = keys // max(group_count, 1), keys % max(group_count, 1)
+
+        self.contact_indptr, self.contact_groups = _csr(contacts, groups, contact_count)
+        self.group_indptr, self.group_members = _csr(groups, contacts, group_count)
+        self.group_sizes = np.diff(self.group_indptr).astype(np.int32)
+        self.group_weights = np.array(self._group_weights, dtype=np.float32)
+        self._overlay_contacts = {}
+        self._overlay_groups = {}
+        self._clear_pending()
+
+    def _apply_pending(self):
+        """Put newly linked edges in the overlay, or rebuild the CSR arrays if it grew too large"""
+        if len(self._pending_rows) + sum(len(v) for v in self._overlay_contacts.values()) > COMPACT_THRESHOLD:
+            self._compact()
+            return
+
+        # New contacts and groups get empty CSR rows until the next compaction
+        contact_gap = len(self.ids) + 1 - len(self.contact_indptr)
+        if contact_gap > 0:
+            self.contact_indptr = np.concatenate([self.contact_indptr, np.full(contact_gap, self.contact_indptr[-1])])
+        group_gap = len(self.group_keys) + 1 - len(self.group_indptr)
+        if group_gap > 0:
+            self.group_indptr = np.concatenate([self.group_indptr, np.full(group_gap, self.group_indptr[-1])])
+            self.group_weights = np.array(self._group_weights, dtype=np.float32)
+
+        for row, group in zip(self._pending_rows, self._pending_groups):
+            self._overlay_contacts.setdefault(row, []).append(group)
+            self._overlay_groups.setdefault(group, []).append(row)
+        self._clear_pending()
+
+        self.group_sizes = np.diff(self.group_indptr).astype(np.int32)
+        for group, rows in self._overlay_groups.items():
+            self.group_sizes[group] += len(rows)
+
+    # ---- incremental updates ----
+
+    def add_user(self, user):
+        """Add or refresh a contact and its groups"""
+        with self._lock:
+            self._add_contact(user)
+            for group_key, label, members in self._groups_of(user):
+                self._link(group_key, label, members)
+            self._apply_pending()
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            self.add_user(user)
+        elif event == 'meeting_added' and item.get('attendees'):
+            with self._lock:
+                self._link(f"meeting:{user['id']}:{item['id']}",
+                           f"meeting \"{item.get('title', '')}\"",
+                           [user['id']] + list(item['attendees']))
+                self._apply_pending()
+
+    # ---- traversal ----
+
+    def _with_overlay(self, overlay, rows, neighbours, parents):
+        if not overlay:
+            return neighbours, parents
+        extra_neighbours, extra_parents = [], []
+        for row in rows.tolist():
+            for neighbour in overlay.get(row, ()):
+                extra_neighbours.append(neighbour)
+                extra_parents.append(row)
+        if not extra_neighbours:
+            return neighbours, parents
+        return (np.concatenate([neighbours, np.array(extra_neighbours, dtype=np.int32)]),
+                np.concatenate([parents, np.array(extra_parents, dtype=np.int32)]))
+
+    def _neighbours(self, rows):
+        """
+        Contacts sharing a traversable group with any of rows.
+        Returns (contacts, from_rows, via_groups), aligned element by element.
+        """
+        groups, from_rows = _expand(self.contact_indptr, self.contact_groups, rows)
+        groups, from_rows = self._with_overlay(self._overlay_contacts, rows, groups, from_rows)
+
+        keep = self.group_sizes[groups] <= self.max_group_size
+        groups, from_rows = groups[keep], from_rows[keep]
+
+        # Expand each distinct group once, then map members back to every row that reached it
+        unique_groups, inverse = np.unique(groups, return_inverse=True)
+        members, member_groups = _expand(self.group_indptr, self.group_members, unique_groups)
+        members, member_groups = self._with_overlay(self._overlay_groups, unique_groups, members, member_groups)
+        if len(members) == 0:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, empty, empty
+
+        order = np.argsort(member_groups, kind='stable')
+        members, member_groups = members[order], member_groups[order]
+        group_starts = np.searchsorted(member_groups, unique_groups)
+        group_ends = np.searchsorted(member_groups, unique_groups, side='right')
+
+        lengths = (group_ends - group_starts)[inverse]
+        total = int(lengths.sum())
+        offsets = np.repeat(group_starts[inverse] - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+        contacts = members[offsets]
+        sources = np.repeat(from_rows, lengths)
+        via = np.repeat(groups, lengths)
+
+        keep = contacts != sources
+        return contacts[keep], sources[keep], via[keep]
+
+    def _describe(self, row):
+        return {"personId": self.ids[row], "name": self.names[row], "relationshipStatus": self.statuses[row]}
+
+    def find_introducers(self, target_id, max_depth=3, limit=5, max_visits=100000):
+        """
+        Who can introduce me to the target: contacts within max_depth hops of the target,
+        ranked by closeness to the target, then by how strong my relationship with them is.
+        Each result carries the chain of contacts from the introducer to the target.
+        """
+        with self._lock:
+            target = self.index.get(target_id)
+            if target is None:
+                return []
+
+            count = len(self.ids)
+            depth = np.full(count, -1, dtype=np.int32)
+            parent = np.full(count, -1, dtype=np.int32)
+            via_group = np.full(count, -1, dtype=np.int32)
+            link_weight = np.zeros(count, dtype=np.float32)
+            depth[target] = 0
+
+            frontier = np.array([target], dtype=np.int32)
+            visited = 1
+            for level in range(1, max_depth + 1):
+                contacts, sources, via = self._neighbours(frontier)
+                if len(contacts) == 0:
+                    break
+                fresh = depth[contacts] == -1
+                contacts, sources, via = contacts[fresh], sources[fresh], via[fresh]
+
+                # Keep the strongest link into each newly reached contact
+                weights = self.group_weights[via]
+                order = np.lexsort((-weights, contacts))
+                contacts, sources, via, weights = contacts[order], sources[order], via[order], weights[order]
+                first = np.ones(len(contacts), dtype=bool)
+                first[1:] = contacts[1:] != contacts[:-1]
+                contacts, sources, via, weights = contacts[first], sources[first], via[first], weights[first]
+
+                depth[contacts] = level
+                parent[contacts] = sources
+                via_group[contacts] = via
+                link_weight[contacts] = weights
+                frontier = contacts
+                visited += len(contacts)
+                if visited >= max_visits:
+                    break
+
+            reached = np.nonzero(depth > 0)[0]
+            if len(reached) == 0:
+                return []
+            strength = np.array([STATUS_STRENGTH.get(self.statuses[row], 0) for row in reached])
+            order = np.lexsort((-link_weight[reached], -strength, depth[reached]))
+
+            results = []
+            for row in reached[order][:limit]:
+                path = []
+                current = row
+                while current != target:
+                    path.append({**self._describe(parent[current]), "via": self.group_labels[via_group[current]]})
+                    current = parent[current]
+                result = self._describe(row)
+                result["depth"] = int(depth[row])
+                result["path"] = path
+                results.append(result)
+            return results
+
+    def best_bridges(self, person_id, limit=5):
+        """
+        Contacts linked to the person who open up the most contacts the person is not
+        already linked to, weighted by how strong my relationship with them is.
+        """
+        with self._lock:
+            row = self.index.get(person_id)
+            if row is None:
+                return []
+
+            neighbours, _, via = self._neighbours(np.array([row], dtype=np.int32))
+            if len(neighbours) == 0:
+                return []
+
+            # Strongest shared group with each neighbour
+            weights = self.group_weights[via]
+            order = np.lexsort((-weights, neighbours))
+            neighbours, via, weights = neighbours[order], via[order], weights[order]
+            first = np.ones(len(neighbours), dtype=bool)
+            first[1:] = neighbours[1:] != neighbours[:-1]
+            neighbours, via, weights = neighbours[first], via[first], weights[first]
+
+            known = np.zeros(len(self.ids), dtype=bool)
+            known[neighbours] = True
+            known[row] = True
+
+            second, sources, _ = self._neighbours(neighbours)
+            new = ~known[second]
+            pairs = np.unique(sources[new].astype(np.int64) * len(self.ids) + second[new])
+            gain = np.bincount(pairs // len(self.ids), minlength=len(self.ids))[neighbours]
+
+            strength = np.array([STATUS_STRENGTH.get(self.statuses[n], 0) for n in neighbours])
+            score = gain * (1 + strength) + weights
+            ranked = np.argsort(-score, kind='stable')[:limit]
+
+            results = []
+            for i in ranked:
+                result = self._describe(neighbours[i])
+                result["via"] = self.group_labels[via[i]]
+                result["newContacts"] = int(gain[i])
+                results.append(result)
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "contacts": len(self.ids),
+                "groups": len(self.group_keys),
+                "edges": len(self.contact_groups) + sum(len(v) for v in self._overlay_contacts.values()),
+                "overlayEdges": sum(len(v) for v in self._overlay_contacts.values())
+            }
@@ -4,6 +4,7 @@ import random
 import json
 from datetime import datetime, timedelta
 import os
+from data.dates import normalize_user_dates
 
 fake = Faker()
 
@@ -126,9 +127,11 @@ def generate_mock_dataset(num_people=100, output_file='data/mock_users.json'):
             meetings.append({
                 'id': f"m{j}",
                 'date': meeting_date,
+                'start': random.choice(['09:00', '10:30', '11:30', '13:00', '14:30', '16:00']),
                 'title': meeting_title,
                 'summary': meeting_summary,
-                'sentiment': meeting_sentiment
+                'sentiment': meeting_sentiment,
+                'sentimentSource': 'label'
             })
         
         # Generate tasks (0-5)
@@ -239,9 +242,6 @@ def generate_mock_dataset(num_people=100, output_file='data/mock_users.json'):
                 'description': f"Contact via {contact_title.lower()}"
             })
         
-        # Sort timeline by date (most recent first)
-        timeline.sort(key=lambda x: x['date'], reverse=True)
-        
         # Create the person object
         person = {
             'id': person_id,
@@ -261,6 +261,11 @@ def generate_mock_dataset(num_people=100, output_file='data/mock_users.json'):
             'timeline': timeline
         }
         
+        # Store epoch days next to every date string, then sort the timeline on them
+        # (oldest first, so new entries are appended)
+        normalize_user_dates(person)
+        timeline.sort(key=lambda x: x['day'])
+        
         people.append(person)
     
     # Create directory if it doesn't exist
@@ -274,4 +279,5 @@ def generate_mock_dataset(num_people=100, output_file='data/mock_users.json'):
     return people
 
 if __name__ == "__main__":
+    # Run from the backend directory: python -m data.data_generator
     generate_mock_dataset(100, 'data/mock_users.json')
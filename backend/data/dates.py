@@ -0,0 +1,82 @@
+from datetime import date, datetime
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+# String date fields and the epoch-day fields stored alongside them
+USER_DATE_FIELDS = (('lastContactedDate', 'lastContactedDay'),)
+ITEM_DATE_FIELDS = {
+    'meetings': (('date', 'day'),),
+    'tasks': (('dueDate', 'dueDay'),),
+    'finances': (('date', 'day'), ('dueDate', 'dueDay')),
+    'timeline': (('date', 'day'),)
+}
+
+
+def parse_date(value):
+    """
+    Parse a date string into a date, or return None if it is empty or unparseable.
+    ISO dates ('YYYY-MM-DD', optionally followed by a time) take a fast path;
+    anything else falls back to dateutil.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+
+    if len(value) >= 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            pass
+
+    try:
+        from dateutil.parser import parse
+        return parse(value).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+def to_epoch_day(value):
+    """Convert a date string or date to days since 1970-01-01, or None"""
+    parsed = parse_date(value)
+    if parsed is None:
+        return None
+    return parsed.toordinal() - _EPOCH_ORDINAL
+
+
+def from_epoch_day(day):
+    """Convert days since 1970-01-01 back to a date"""
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+def today_epoch_day():
+    """Today's date as an epoch day"""
+    return date.today().toordinal() - _EPOCH_ORDINAL
+
+
+def normalize_item_dates(collection, item):
+    """Store the epoch day next to each string date of a meeting, task, finance or timeline entry"""
+    for string_field, day_field in ITEM_DATE_FIELDS[collection]:
+        if string_field in item:
+            item[day_field] = to_epoch_day(item[string_field])
+    return item
+
+
+def normalize_user_dates(user):
+    """Store epoch days next to every string date of a user and their items"""
+    for string_field, day_field in USER_DATE_FIELDS:
+        user[day_field] = to_epoch_day(user.get(string_field))
+    for collection in ITEM_DATE_FIELDS:
+        for item in user.get(collection, []):
+            normalize_item_dates(collection, item)
+    return user
+
+
+def epoch_day_of(moment):
+    """Epoch day of a datetime or date"""
+    if isinstance(moment, datetime):
+        moment = moment.date()
+    return moment.toordinal() - _EPOCH_ORDINAL
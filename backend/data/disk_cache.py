@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(*parts):
+    """Build a content-addressed cache key from the given parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent key-value cache stored in a local SQLite file.
+    Hot entries are served from an in-memory LRU; the file is bounded by size and
+    evicts the least recently used entries first. Values must be JSON-serializable.
+    Hits served from memory are recorded in the file in batches, so eviction still sees
+    them as recently used.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, memory_items=1024, touch_batch=256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.touch_batch = touch_batch
+
+        self._memory = OrderedDict()
+        # key -> time of memory hits not yet written to the file
+        self._touched = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._db.commit()
+        self._total_bytes = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if it is not cached"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                if len(self._touched) >= self.touch_batch:
+                    self._flush_touched()
+                    self._db.commit()
+                self.hits += 1
+                return self._memory[key]
+
+            row = self._db.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+
+            self._touched[key] = time.time()
+            self._flush_touched()
+            self._db.commit()
+            value = json.loads(row[0])
+            self._remember(key, value)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries if the file is over size"""
+        encoded = json.dumps(value, separators=(',', ':'))
+        size = len(key) + len(encoded)
+
+        with self._lock:
+            self._touched.pop(key, None)
+            previous = self._db.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                (key, encoded, size, time.time())
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+            self._remember(key, value)
+
+    def delete(self, key):
+        """Remove a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+            row = self._db.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if row:
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._db.commit()
+                self._total_bytes -= row[0]
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self):
+        """Write pending access times; the caller commits"""
+        if self._touched:
+            self._db.executemany('UPDATE entries SET accessed = ? WHERE key = ?',
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self):
+        """Drop least recently used rows until the file is back under 90% of its budget"""
+        self._flush_touched()
+        target = self.max_bytes * 0.9
+        cursor = self._db.execute('SELECT key, size FROM entries ORDER BY accessed ASC')
+        evicted = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+            self._memory.pop(key, None)
+        self._db.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def stats(self):
+        """Return cache size and hit counters"""
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "maxBytes": self.max_bytes,
+                "memoryEntries": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._db.commit()
+            self._db.close()
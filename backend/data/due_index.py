@@ -0,0 +1,133 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import count, islice
+
+KINDS = ('task', 'finance')
+# Repository events that can change what is due, and the kind of item they carry
+EVENT_KINDS = {'task_added': 'task', 'task_completed': 'task', 'finance_added': 'finance'}
+
+
+def is_pending(kind, item):
+    """Whether a task or finance entry still needs attention"""
+    if item.get('dueDay') is None:
+        return False
+    if kind == 'task':
+        return item.get('status') != 'completed'
+    return item.get('type') == 'owed' and not item.get('settled', False)
+
+
+def _pending_items(user):
+    """(due day, kind, user, item) for each of a contact's pending tasks and payments"""
+    for kind, collection in (('task', 'tasks'), ('finance', 'finances')):
+        for item in user.get(collection, []):
+            if is_pending(kind, item):
+                yield item['dueDay'], kind, user, item
+
+
+class DueIndex:
+    """
+    Open tasks and owed payments ordered by due date, kept current by repository events.
+    Each kind is a sorted list of (due day, sequence) keys with the entries alongside,
+    so "everything due before X" is a bisect plus a slice: O(log n + k).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = count()
+        self._reset()
+
+    def _reset(self):
+        self.keys = {kind: [] for kind in KINDS}
+        self.entries = {kind: [] for kind in KINDS}
+        # (kind, person ID, item ID) -> key, for removal
+        self.positions = {}
+
+    def build(self, users):
+        with self._lock:
+            self._reset()
+            items = [entry for user in users for entry in _pending_items(user)]
+            items.sort(key=lambda entry: entry[0])
+            for _, kind, user, item in items:
+                self._add(kind, user, item)
+        return self
+
+    def _add(self, kind, user, item):
+        position_key = (kind, user['id'], item.get('id'))
+        if position_key in self.positions:
+            self._remove(kind, user['id'], item.get('id'))
+        key = (item['dueDay'], next(self._seq))
+        entry = (user['id'], user.get('name', ''), item)
+        keys = self.keys[kind]
+        if not keys or key > keys[-1]:
+            keys.append(key)
+            self.entries[kind].append(entry)
+        else:
+            position = bisect_left(keys, key)
+            keys.insert(position, key)
+            self.entries[kind].insert(position, entry)
+        self.positions[position_key] = key
+
+    def _remove(self, kind, person_id, item_id):
+        key = self.positions.pop((kind, person_id, item_id), None)
+        if key is None:
+            return
+        keys = self.keys[kind]
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+            del self.entries[kind][position]
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                for _, kind, user, item in _pending_items(user):
+                    self._add(kind, user, item)
+            return
+        kind = EVENT_KINDS.get(event)
+        if kind is None:
+            return
+        with self._lock:
+            if is_pending(kind, item):
+                self._add(kind, user, item)
+            else:
+                self._remove(kind, user['id'], item.get('id'))
+
+    @staticmethod
+    def _describe(kind, entry):
+        person_id, name, item = entry
+        described = {
+            "type": kind,
+            "personId": person_id,
+            "name": name,
+            "itemId": item.get('id'),
+            "dueDate": item.get('dueDate'),
+            "dueDay": item.get('dueDay')
+        }
+        if kind == 'task':
+            described.update(title=item.get('title'), priority=item.get('priority'), status=item.get('status'))
+        else:
+            described.update(title=item.get('description'), amount=item.get('amount'), currency=item.get('currency'))
+        return described
+
+    def _slice(self, kind, lo, hi):
+        keys, entries = self.keys[kind], self.entries[kind]
+        for position in range(lo, hi):
+            yield keys[position], kind, entries[position]
+
+    def due(self, before_day, after_day=None, kinds=None, limit=100):
+        """Pending items due on or before `before_day` (and on or after `after_day`), soonest first"""
+        with self._lock:
+            streams = []
+            for kind in (kinds or KINDS):
+                keys = self.keys[kind]
+                lo = bisect_left(keys, (after_day, -1)) if after_day is not None else 0
+                hi = bisect_right(keys, (before_day, float('inf')))
+                streams.append(self._slice(kind, lo, hi))
+            merged = heapq.merge(*streams, key=lambda item: item[0])
+            return [self._describe(kind, entry) for _, kind, entry in islice(merged, limit)]
+
+    def count_due(self, before_day):
+        with self._lock:
+            return {kind: bisect_right(self.keys[kind], (before_day, float('inf'))) for kind in KINDS}
@@ -0,0 +1,117 @@
+import threading
+import numpy as np
+from data.follow_up_planner import CONTACT_EVENTS
+
+HOURS_PER_WEEK = 24 * 7
+# Timeline entry types recorded without a meeting; meetings come from the meetings list,
+# which carries their start time
+TIMELINE_TYPES = ('contact', 'payment')
+
+
+def _weekday(day):
+    """Monday = 0 for an epoch day (1970-01-01 was a Thursday)"""
+    return (day + 3) % 7
+
+
+def interaction_hour(item):
+    """Hour of day of a meeting with a start time, or -1"""
+    try:
+        return int(item['start'].split(':')[0]) if item.get('start') else -1
+    except ValueError:
+        return -1
+
+
+def interactions(user):
+    """(epoch day, hour or -1) of every past interaction with a contact"""
+    for meeting in user.get('meetings', []):
+        if meeting.get('day') is not None:
+            yield meeting['day'], interaction_hour(meeting)
+    for entry in user.get('timeline', []):
+        if entry.get('type') in TIMELINE_TYPES and entry.get('day') is not None:
+            yield entry['day'], -1
+
+
+class EngagementHistograms:
+    """
+    When each contact engages, as fixed-size integer histograms: interactions per
+    hour-of-week bucket (168 per contact) and per day of the week (7 per contact, counting
+    interactions without a time too). Rows live in two int32 matrices grown by doubling,
+    with book-wide totals alongside for contacts with little history. An interaction is
+    two increments; a rebuild is one bincount over the whole dataset.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(1024)
+
+    def _reset(self, capacity):
+        self.rows = {}
+        self.hours = np.zeros((capacity, HOURS_PER_WEEK), dtype=np.int32)
+        self.days = np.zeros((capacity, 7), dtype=np.int32)
+        self.total_hours = np.zeros(HOURS_PER_WEEK, dtype=np.int64)
+        self.total_days = np.zeros(7, dtype=np.int64)
+
+    def build(self, users):
+        """Rebuild every histogram in one pass over the whole dataset"""
+        rows, days, hours = [], [], []
+        for row, user in enumerate(users):
+            for day, hour in interactions(user):
+                rows.append(row)
+                days.append(day)
+                hours.append(hour)
+        rows = np.asarray(rows, dtype=np.int64)
+        weekdays = _weekday(np.asarray(days, dtype=np.int64))
+        hours = np.asarray(hours, dtype=np.int64)
+        count = len(users)
+
+        with self._lock:
+            self._reset(max(1024, count))
+            self.rows = {user['id']: row for row, user in enumerate(users)}
+            self.days[:count] = np.bincount(rows * 7 + weekdays, minlength=count * 7).reshape(count, 7)
+            timed = hours >= 0
+            self.hours[:count] = np.bincount(
+                rows[timed] * HOURS_PER_WEEK + weekdays[timed] * 24 + hours[timed], minlength=count * HOURS_PER_WEEK
+            ).reshape(count, HOURS_PER_WEEK)
+            self.total_days[:] = self.days[:count].sum(axis=0)
+            self.total_hours[:] = self.hours[:count].sum(axis=0)
+        return self
+
+    def _row(self, person_id):
+        row = self.rows.get(person_id)
+        if row is None:
+            row = self.rows[person_id] = len(self.rows)
+            if row == len(self.hours):
+                self.hours = np.concatenate((self.hours, np.zeros_like(self.hours)))
+                self.days = np.concatenate((self.days, np.zeros_like(self.days)))
+        return row
+
+    def record(self, person_id, day, hour=-1):
+        """Count one interaction on an epoch day, at an hour of day if known"""
+        weekday = _weekday(day)
+        with self._lock:
+            row = self._row(person_id)
+            self.days[row, weekday] += 1
+            self.total_days[weekday] += 1
+            if 0 <= hour < 24:
+                self.hours[row, weekday * 24 + hour] += 1
+                self.total_hours[weekday * 24 + hour] += 1
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                self._row(user['id'])
+        elif event in CONTACT_EVENTS and item.get('day') is not None:
+            self.record(user['id'], item['day'], interaction_hour(item))
+
+    def histogram(self, person_id):
+        """A contact's (hour-of-week, day-of-week) counts, or None for unknown contacts"""
+        with self._lock:
+            row = self.rows.get(person_id)
+            if row is None:
+                return None
+            return self.hours[row].copy(), self.days[row].copy()
+
+    def totals(self):
+        with self._lock:
+            return self.total_hours.copy(), self.total_days.copy()
@@ -0,0 +1,194 @@
+import threading
+import numpy as np
+from data.dates import from_epoch_day
+
+# Ledger categories: what you owe a contact, what a contact owes you, and settled payments
+CATEGORIES = ('payable', 'receivable', 'paid', 'received')
+NO_DAY = np.iinfo(np.int32).min
+
+
+def category_of(finance):
+    """Ledger category of a finance entry ('owed' entries are payable unless the contact owes you)"""
+    if finance.get('type') == 'owed':
+        return 'receivable' if finance.get('direction') == 'from' else 'payable'
+    if finance.get('type') in ('paid', 'received'):
+        return finance['type']
+    return None
+
+
+def _ensure_rows(table, rows):
+    if rows <= len(table):
+        return table
+    grown = np.zeros((max(rows, 2 * len(table)), table.shape[1]))
+    grown[:len(table)] = table
+    return grown
+
+
+class FinanceLedger:
+    """
+    Every finance entry as a row of typed NumPy columns (amount, category, day, contact,
+    company), with running balances per contact and per company updated on each append.
+    Totals come from the running balances; date-range questions are a vectorized mask
+    and bincount over the columns, without touching the contact dicts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.amounts = np.zeros(1024, dtype=np.float64)
+        self.categories = np.zeros(1024, dtype=np.int8)
+        self.days = np.full(1024, NO_DAY, dtype=np.int32)
+        self.contacts = np.zeros(1024, dtype=np.int32)
+        self.companies = np.zeros(1024, dtype=np.int32)
+
+        self.contact_ids = []
+        self.contact_names = []
+        self.contact_index = {}
+        self.company_names = []
+        self.company_index = {}
+        # Balance tables, grown by doubling; rows past the known contacts/companies are zero
+        self._contact_balances = np.zeros((256, len(CATEGORIES)))
+        self._company_balances = np.zeros((64, len(CATEGORIES)))
+        self.totals = np.zeros(len(CATEGORIES))
+
+    def build(self, users):
+        with self._lock:
+            self._reset()
+            for user in users:
+                self._append_user(user)
+        return self
+
+    def _grow(self):
+        capacity = len(self.amounts) * 2
+        for name, fill in (('amounts', 0), ('categories', 0), ('days', NO_DAY), ('contacts', 0), ('companies', 0)):
+            column = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _contact(self, user):
+        index = self.contact_index.get(user['id'])
+        if index is None:
+            index = self.contact_index[user['id']] = len(self.contact_ids)
+            self.contact_ids.append(user['id'])
+            self.contact_names.append(user.get('name', ''))
+            self._contact_balances = _ensure_rows(self._contact_balances, index + 1)
+        return index
+
+    def _company(self, name):
+        name = name or 'Unknown'
+        index = self.company_index.get(name)
+        if index is None:
+            index = self.company_index[name] = len(self.company_names)
+            self.company_names.append(name)
+            self._company_balances = _ensure_rows(self._company_balances, index + 1)
+        return index
+
+    def _append(self, user, finance):
+        category = category_of(finance)
+        if category is None:
+            return
+        if self.count == len(self.amounts):
+            self._grow()
+
+        row = self.count
+        column = CATEGORIES.index(category)
+        amount = float(finance.get('amount') or 0)
+        contact = self._contact(user)
+        company = self._company(user.get('company'))
+
+        self.amounts[row] = amount
+        self.categories[row] = column
+        self.days[row] = finance['day'] if finance.get('day') is not None else NO_DAY
+        self.contacts[row] = contact
+        self.companies[row] = company
+        self.count += 1
+
+        self._contact_balances[contact, column] += amount
+        self._company_balances[company, column] += amount
+        self.totals[column] += amount
+
+    def _append_user(self, user):
+        for finance in user.get('finances', []):
+            self._append(user, finance)
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                self._append_user(user)
+        elif event == 'finance_added':
+            with self._lock:
+                self._append(user, item)
+
+    @staticmethod
+    def _balances(values):
+        balances = {category: round(float(value), 2) for category, value in zip(CATEGORIES, values)}
+        # Positive when contacts owe you more than you owe them
+        balances['outstanding'] = round(float(values[1] - values[0]), 2)
+        balances['net'] = round(float(values[3] - values[2]), 2)
+        return balances
+
+    def _top(self, balances, labels, limit, column):
+        values = balances[:, CATEGORIES.index(column)]
+        rows = np.flatnonzero(values > 0)
+        rows = rows[np.argsort(-values[rows], kind='stable')][:limit]
+        return [dict(labels(row), **{column: round(float(values[row]), 2)}) for row in rows]
+
+    def contact_balance(self, person_id):
+        with self._lock:
+            contact = self.contact_index.get(person_id)
+            values = self._contact_balances[contact] if contact is not None else np.zeros(len(CATEGORIES))
+            return self._balances(values)
+
+    def summary(self, start_day=None, end_day=None, limit=5):
+        """
+        Ledger totals, the contacts and companies with the largest open balances and, with a
+        date range, only the entries dated within it.
+        """
+        with self._lock:
+            if start_day is None and end_day is None:
+                totals = self.totals.copy()
+                contact_balances = self._contact_balances[:len(self.contact_ids)]
+                company_balances = self._company_balances[:len(self.company_names)]
+                rows = self.count
+            else:
+                days = self.days[:self.count]
+                mask = days != NO_DAY
+                if start_day is not None:
+                    mask &= days >= start_day
+                if end_day is not None:
+                    mask &= days <= end_day
+                amounts = self.amounts[:self.count][mask]
+                categories = self.categories[:self.count][mask].astype(np.int64)
+                width = len(CATEGORIES)
+                totals = np.bincount(categories, weights=amounts, minlength=width)
+                contact_balances = np.bincount(
+                    self.contacts[:self.count][mask] * width + categories, weights=amounts,
+                    minlength=len(self.contact_ids) * width
+                ).reshape(-1, width)
+                company_balances = np.bincount(
+                    self.companies[:self.count][mask] * width + categories, weights=amounts,
+                    minlength=len(self.company_names) * width
+                ).reshape(-1, width)
+                rows = int(mask.sum())
+
+            def contact_label(row):
+                return {"personId": self.contact_ids[row], "name": self.contact_names[row]}
+
+            def company_label(row):
+                return {"company": self.company_names[row]}
+
+            return {
+                "entries": rows,
+                "from": from_epoch_day(start_day).isoformat() if start_day is not None else None,
+                "to": from_epoch_day(end_day).isoformat() if end_day is not None else None,
+                "totals": self._balances(totals),
+                "topPayable": self._top(contact_balances, contact_label, limit, 'payable'),
+                "topReceivable": self._top(contact_balances, contact_label, limit, 'receivable'),
+                "companiesPayable": self._top(company_balances, company_label, limit, 'payable'),
+                "companiesReceivable": self._top(company_balances, company_label, limit, 'receivable')
+            }
@@ -0,0 +1,150 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
+from data.dates import from_epoch_day, today_epoch_day
+from data.timeline_store import parse_cursor
+
+# Days to wait after the last contact before following up, by relationship status
+FOLLOW_UP_DAYS = {'New': 3, 'Active': 7, 'Inactive': 5, 'Close': 10}
+DEFAULT_FOLLOW_UP_DAYS = 7
+STATUSES = tuple(FOLLOW_UP_DAYS)
+# Timeline entry types that count as being in touch (tasks are dated by their deadline)
+CONTACT_TYPES = ('meeting', 'contact', 'payment')
+# Repository events that record an interaction dated by the item's day
+CONTACT_EVENTS = ('meeting_added', 'finance_added')
+NO_DAY = np.iinfo(np.int32).min
+
+
+def last_contact_day(user, today=None):
+    """The most recent day you were in touch with a contact, not counting future entries"""
+    today = today if today is not None else today_epoch_day()
+    days = [user.get('lastContactedDay')]
+    days += [entry.get('day') for entry in user.get('timeline', []) if entry.get('type') in CONTACT_TYPES]
+    days = [day for day in days if day is not None and day <= today]
+    return max(days) if days else None
+
+
+class FollowUpPlanner:
+    """
+    Every contact's next follow-up, due a fixed number of days after the last contact
+    depending on the relationship. Contacts sit in a priority queue ordered by due day:
+    a sorted list of (due day, row) keys, so "who is due by today" is a bisect and pages
+    are slices. Interactions move a single contact; recomputing the whole book is one
+    vectorized pass over the last-contact and status columns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.ids = []
+        self.rows = {}
+        self.users = []
+        self.last_days = np.full(1024, NO_DAY, dtype=np.int32)
+        self.statuses = np.zeros(1024, dtype=np.int8)
+        self.keys = []
+        self.due_days = np.zeros(0, dtype=np.int64)
+
+    def build(self, users):
+        with self._lock:
+            self._reset()
+            today = today_epoch_day()
+            for user in users:
+                self._register(user, today)
+            self._recompute()
+        return self
+
+    def _register(self, user, today):
+        row = self.rows.get(user['id'])
+        if row is None:
+            row = self.rows[user['id']] = len(self.ids)
+            self.ids.append(user['id'])
+            self.users.append(user)
+            if row == len(self.last_days):
+                self.last_days = np.concatenate((self.last_days, np.full(row, NO_DAY, dtype=np.int32)))
+                self.statuses = np.concatenate((self.statuses, np.zeros(row, dtype=np.int8)))
+        day = last_contact_day(user, today)
+        self.last_days[row] = day if day is not None else NO_DAY
+        status = user.get('relationshipStatus')
+        self.statuses[row] = STATUSES.index(status) + 1 if status in FOLLOW_UP_DAYS else 0
+        return row
+
+    def _cadence(self):
+        return np.array([DEFAULT_FOLLOW_UP_DAYS] + [FOLLOW_UP_DAYS[status] for status in STATUSES], dtype=np.int64)
+
+    def _recompute(self):
+        count = len(self.ids)
+        last_days = self.last_days[:count].astype(np.int64)
+        # Contacts never contacted are due now
+        due = np.where(last_days == NO_DAY, today_epoch_day(), last_days + self._cadence()[self.statuses[:count]])
+        order = np.lexsort((np.arange(count), due))
+        self.due_days = due
+        self.keys = list(zip(due[order].tolist(), order.tolist()))
+
+    def recompute(self):
+        """Recompute every contact's due day, e.g. after the follow-up intervals change"""
+        with self._lock:
+            self._recompute()
+
+    def _move(self, row):
+        if row < len(self.due_days):
+            old_key = (int(self.due_days[row]), row)
+            position = bisect_left(self.keys, old_key)
+            if position < len(self.keys) and self.keys[position] == old_key:
+                del self.keys[position]
+        else:
+            self.due_days = np.concatenate((self.due_days, np.zeros(len(self.ids) - len(self.due_days), dtype=np.int64)))
+        last_day = int(self.last_days[row])
+        due = today_epoch_day() if last_day == NO_DAY else last_day + int(self._cadence()[self.statuses[row]])
+        self.due_days[row] = due
+        insort(self.keys, (due, row))
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                self._move(self._register(user, today_epoch_day()))
+        elif event in CONTACT_EVENTS:
+            day = item.get('day')
+            with self._lock:
+                row = self.rows.get(user['id'])
+                if row is None:
+                    self._move(self._register(user, today_epoch_day()))
+                elif day is not None and day <= today_epoch_day() and day > self.last_days[row]:
+                    self.last_days[row] = day
+                    self._move(row)
+
+    def next_follow_up(self, person_id):
+        """Due day of a contact's next follow-up, or None for unknown contacts"""
+        with self._lock:
+            row = self.rows.get(person_id)
+            return int(self.due_days[row]) if row is not None and row < len(self.due_days) else None
+
+    def _describe(self, due_day, row, today):
+        user = self.users[row]
+        last_day = int(self.last_days[row])
+        return {
+            "personId": user['id'],
+            "name": user.get('name', ''),
+            "company": user.get('company', ''),
+            "relationshipStatus": user.get('relationshipStatus'),
+            "lastContactDate": from_epoch_day(last_day).isoformat() if last_day != NO_DAY else None,
+            "dueDate": from_epoch_day(due_day).isoformat(),
+            "daysOverdue": today - due_day
+        }
+
+    def due(self, before_day=None, limit=20, cursor=None):
+        """Contacts whose follow-up is due by `before_day` (default today), most overdue first"""
+        today = today_epoch_day()
+        before_day = before_day if before_day is not None else today
+        with self._lock:
+            end = bisect_right(self.keys, (before_day, float('inf')))
+            start = bisect_right(self.keys, parse_cursor(cursor)) if cursor else 0
+            page = self.keys[start:min(start + limit, end)]
+            has_more = start + limit < end
+            return {
+                "followUps": [self._describe(due_day, row, today) for due_day, row in page],
+                "total": end,
+                "nextCursor": f"{page[-1][0]}.{page[-1][1]}" if has_more and page else None
+            }
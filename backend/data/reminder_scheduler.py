@@ -0,0 +1,151 @@
+import heapq
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, time as day_time, timedelta
+from itertools import count
+from data.dates import from_epoch_day
+from data.due_index import EVENT_KINDS, is_pending
+
+# Reminders relative to the due date: (days after the due date, kind of reminder)
+REMINDER_SCHEDULE = ((-1, 'upcoming'), (0, 'due'), (1, 'overdue'))
+REMINDER_HOUR = 9
+OUTBOX_SIZE = 1000
+
+
+def _message(reminder_kind, kind, name, item):
+    what = f"\"{item.get('title')}\"" if kind == 'task' else f"${item.get('amount')} owed ({item.get('description')})"
+    if reminder_kind == 'upcoming':
+        return f"Reminder: {what} for {name} is due tomorrow"
+    if reminder_kind == 'due':
+        return f"Reminder: {what} for {name} is due today"
+    return f"Overdue: {what} for {name} was due {item.get('dueDate')}"
+
+
+class ReminderScheduler:
+    """
+    Fires reminders for task and payment due dates into an outbox.
+    Pending reminders sit in a min-heap ordered by fire time; a background thread sleeps
+    until the earliest one and wakes early when a sooner one is scheduled. A reminder whose
+    item has been completed in the meantime is dropped when it comes up.
+    """
+
+    def __init__(self, outbox_size=OUTBOX_SIZE):
+        self._heap = []
+        self._seq = count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._outbox_size = outbox_size
+        self._outbox_ids = []
+        self._outbox = []
+        self._next_id = count(1)
+
+    def schedule_all(self, users):
+        """Schedule reminders for every pending task and payment"""
+        now = time.time()
+        with self._condition:
+            for user in users:
+                self._schedule_user(user, now)
+            self._condition.notify()
+        return self
+
+    def _schedule_user(self, user, now):
+        for kind, collection in (('task', 'tasks'), ('finance', 'finances')):
+            for item in user.get(collection, []):
+                self._schedule(kind, user, item, now)
+
+    def _schedule(self, kind, user, item, now):
+        if not is_pending(kind, item):
+            return
+        due = datetime.combine(from_epoch_day(item['dueDay']), day_time(REMINDER_HOUR))
+        for offset, reminder_kind in REMINDER_SCHEDULE:
+            fire_at = (due + timedelta(days=offset)).timestamp()
+            # Reminders whose time has passed are not replayed; /api/tasks/due lists what is overdue
+            if fire_at >= now:
+                heapq.heappush(self._heap, (fire_at, next(self._seq), reminder_kind, kind, user, item))
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._condition:
+                self._schedule_user(user, time.time())
+                self._condition.notify()
+            return
+        # Completed tasks are skipped when their reminders come up
+        kind = EVENT_KINDS.get(event)
+        if kind is not None and event != 'task_completed':
+            with self._condition:
+                self._schedule(kind, user, item, time.time())
+                self._condition.notify()
+
+    def fire_due(self, now=None):
+        """Move every reminder due by `now` into the outbox; returns how many fired"""
+        now = now if now is not None else time.time()
+        fired = 0
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, reminder_kind, kind, user, item = heapq.heappop(self._heap)
+                if not is_pending(kind, item):
+                    continue
+                self._deliver({
+                    "kind": reminder_kind,
+                    "type": kind,
+                    "personId": user['id'],
+                    "name": user.get('name', ''),
+                    "itemId": item.get('id'),
+                    "dueDate": item.get('dueDate'),
+                    "message": _message(reminder_kind, kind, user.get('name', ''), item),
+                    "scheduledFor": datetime.fromtimestamp(fire_at).isoformat(),
+                    "firedAt": datetime.fromtimestamp(max(now, fire_at)).isoformat()
+                })
+                fired += 1
+        return fired
+
+    def _deliver(self, reminder):
+        reminder_id = next(self._next_id)
+        reminder["id"] = reminder_id
+        self._outbox_ids.append(reminder_id)
+        self._outbox.append(reminder)
+        if len(self._outbox) > 2 * self._outbox_size:
+            del self._outbox_ids[:-self._outbox_size]
+            del self._outbox[:-self._outbox_size]
+
+    def reminders(self, since_id=0, limit=50, person_id=None):
+        """Reminders fired after `since_id`, oldest first"""
+        with self._condition:
+            start = bisect_right(self._outbox_ids, since_id)
+            reminders = self._outbox[start:]
+            if person_id is not None:
+                reminders = [reminder for reminder in reminders if reminder['personId'] == person_id]
+            reminders = reminders[:limit]
+            return {
+                "reminders": reminders,
+                "lastId": reminders[-1]["id"] if reminders else since_id,
+                "pending": len(self._heap)
+            }
+
+    def start(self):
+        """Fire reminders from a background thread"""
+        if self._thread is not None:
+            return self
+
+        def run():
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        return
+                    timeout = self._heap[0][0] - time.time() if self._heap else None
+                    if timeout is None or timeout > 0:
+                        self._condition.wait(timeout)
+                        continue
+                self.fire_due()
+
+        self._thread = threading.Thread(target=run, name='reminder-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
@@ -0,0 +1,374 @@
+import html
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Searchable text of each kind of item, and the boost applied to matches in each field
+DOCUMENT_FIELDS = {
+    'meeting': ('title', 'summary'),
+    'task': ('title',),
+    'timeline': ('title', 'description')
+}
+FIELDS = ('title', 'summary', 'description')
+FIELD_BOOSTS = {'title': 2.0, 'summary': 1.0, 'description': 0.5}
+KINDS = tuple(DOCUMENT_FIELDS)
+_BOOST_TABLE = np.array([FIELD_BOOSTS[field] for field in FIELDS] + [0.0], dtype=np.float32)
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our so that the their
+this to was we were will with you your
+""".split())
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+SNIPPET_CHARS = 160
+
+# Budget for decoded posting lists kept in memory between queries
+DECODED_CACHE_BYTES = 256 * 1024 * 1024
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def normalize_token(word):
+    """Lowercase and strip a plural 's' so 'mockups' matches 'mockup'"""
+    word = word.lower()
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+
+def analyze(text):
+    """Split text into index terms"""
+    terms = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word not in STOP_WORDS:
+            terms.append(normalize_token(word))
+    return terms
+
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def decode_varints(buffer):
+    """Decode a buffer of LEB128 varints into an int64 array, without a Python loop"""
+    data = np.frombuffer(bytes(buffer), dtype=np.uint8)
+    if len(data) == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = data < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    group = np.cumsum(np.concatenate(([0], ends[:-1].astype(np.int64))))
+    position = np.arange(len(data)) - starts[group]
+    values = (data & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(values, starts)
+
+
+class SearchIndex:
+    """
+    BM25 full-text index over meeting summaries, task titles and timeline descriptions.
+    Each posting list is a bytearray of varint pairs (doc ID gap, term frequency << 2 | field),
+    appended to as documents arrive and decoded with NumPy at query time. Field matches are
+    weighted by FIELD_BOOSTS before BM25 saturation (BM25F). Documents that change are
+    tombstoned and re-added under a new ID.
+    Decoded lists of frequently queried terms are kept in an LRU cache; when a list grows,
+    only the bytes appended since it was cached are decoded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.postings = {}
+        self.last_doc = {}
+        self.doc_freq = {}
+        self.doc_count = 0
+        self.live_count = 0
+        self.total_length = 0.0
+        self._decoded = OrderedDict()
+        self._decoded_bytes = 0
+        self._snapshot_count = None
+        self._snapshot_average = 1.0
+        self._snapshot_version = 0
+
+        # Per-document columns, grown by doubling
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._kinds = np.zeros(1024, dtype=np.int8)
+        self._persons = np.zeros(1024, dtype=np.int32)
+        self._deleted = np.zeros(1024, dtype=bool)
+        self._items = []
+        self._doc_ids = {}
+
+        self._person_index = {}
+        self._person_ids = []
+        self._person_names = []
+
+    def build(self, users):
+        """Index every meeting, task and timeline entry of every contact"""
+        with self._lock:
+            self._reset()
+            for user in users:
+                self._add_user(user)
+        return self
+
+    def _grow(self):
+        capacity = len(self._lengths) * 2
+        for name in ('_lengths', '_kinds', '_persons', '_deleted'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _person(self, user):
+        index = self._person_index.get(user['id'])
+        if index is None:
+            index = self._person_index[user['id']] = len(self._person_ids)
+            self._person_ids.append(user['id'])
+            self._person_names.append(user.get('name', ''))
+        return index
+
+    def _add_user(self, user):
+        for meeting in user.get('meetings', []):
+            self._add_document(user, 'meeting', meeting)
+        for task in user.get('tasks', []):
+            self._add_document(user, 'task', task)
+        for entry in user.get('timeline', []):
+            self._add_document(user, 'timeline', entry)
+
+    def _add_document(self, user, kind, item):
+        key = (user['id'], kind, item.get('id'))
+        previous = self._doc_ids.get(key)
+        if previous is not None:
+            self._remove_document(previous)
+
+        doc_id = self.doc_count
+        if doc_id == len(self._lengths):
+            self._grow()
+
+        length = 0.0
+        for field_id, field in enumerate(FIELDS):
+            if field not in DOCUMENT_FIELDS[kind]:
+                continue
+            terms = analyze(item.get(field) or '')
+            if not terms:
+                continue
+            boost = FIELD_BOOSTS[field]
+            length += boost * len(terms)
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = bytearray()
+                    self.last_doc[term] = 0
+                    self.doc_freq[term] = 0
+                gap = doc_id - self.last_doc[term]
+                if gap or not postings:
+                    self.doc_freq[term] += 1
+                _write_varint(postings, gap)
+                _write_varint(postings, (count << 2) | field_id)
+                self.last_doc[term] = doc_id
+
+        self._lengths[doc_id] = length
+        self._kinds[doc_id] = KINDS.index(kind)
+        self._persons[doc_id] = self._person(user)
+        self._items.append(item)
+        self._doc_ids[key] = doc_id
+        self.doc_count += 1
+        self.live_count += 1
+        self.total_length += length
+
+    def _remove_document(self, doc_id):
+        if not self._deleted[doc_id]:
+            self._deleted[doc_id] = True
+            self.live_count -= 1
+            self.total_length -= float(self._lengths[doc_id])
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        with self._lock:
+            if event == 'user_added':
+                self._add_user(user)
+            elif event == 'meeting_added':
+                self._add_document(user, 'meeting', item)
+                self._add_timeline_entry(user, f"tl_m{item['id'][1:]}")
+            elif event == 'task_added':
+                self._add_document(user, 'task', item)
+                self._add_timeline_entry(user, f"tl_t{item['id'][1:]}")
+            elif event == 'finance_added':
+                self._add_timeline_entry(user, f"tl_f{item['id'][1:]}")
+            elif event == 'task_completed':
+                # The timeline description changes from "assigned" to "completed"
+                self._add_timeline_entry(user, f"tl_t{item['id'][1:]}")
+
+    def _add_timeline_entry(self, user, entry_id):
+        for entry in user.get('timeline', []):
+            if entry.get('id') == entry_id:
+                self._add_document(user, 'timeline', entry)
+                return
+
+    def _average_length(self):
+        """
+        Average document length used for BM25 length normalization.
+        It is re-snapshotted only after the live document count drifts by 1%, so cached
+        per-term scores stay valid across small incremental updates.
+        """
+        if self._snapshot_count is None or abs(self.live_count - self._snapshot_count) > 0.01 * self._snapshot_count:
+            self._snapshot_count = self.live_count
+            self._snapshot_average = max(self.total_length / max(self.live_count, 1), 1e-6)
+            self._snapshot_version += 1
+        return self._snapshot_average
+
+    def _term_scores(self, term):
+        """
+        Return (doc IDs, BM25 contributions) for one term, one entry per document.
+        The saturated term frequencies are cached; bytes appended to the posting list since
+        it was cached are decoded and scored on their own.
+        """
+        postings = self.postings[term]
+        average_length = self._average_length()
+        cached = self._decoded.pop(term, None)
+        if cached is not None:
+            offset, docs, weighted, saturated, version = cached
+            self._decoded_bytes -= docs.nbytes + weighted.nbytes + saturated.nbytes
+            if version != self._snapshot_version:
+                saturated = self._saturate(docs, weighted, average_length)
+        else:
+            offset = 0
+            docs = np.zeros(0, dtype=np.int32)
+            weighted = saturated = np.zeros(0, dtype=np.float32)
+
+        if offset < len(postings):
+            values = decode_varints(postings[offset:])
+            new_docs = (int(docs[-1]) if len(docs) else 0) + np.cumsum(values[0::2])
+            codes = values[1::2]
+            new_weighted = ((codes >> 2) * _BOOST_TABLE[codes & 3]).astype(np.float32)
+
+            # A document matching in several fields has one posting per field
+            first = np.flatnonzero(np.concatenate(([True], np.diff(new_docs) != 0)))
+            new_docs = new_docs[first].astype(np.int32)
+            new_weighted = np.add.reduceat(new_weighted, first)
+            docs = np.concatenate((docs, new_docs))
+            weighted = np.concatenate((weighted, new_weighted))
+            saturated = np.concatenate((saturated, self._saturate(new_docs, new_weighted, average_length)))
+
+        self._decoded[term] = (len(postings), docs, weighted, saturated, self._snapshot_version)
+        self._decoded_bytes += docs.nbytes + weighted.nbytes + saturated.nbytes
+        while self._decoded_bytes > DECODED_CACHE_BYTES and len(self._decoded) > 1:
+            _, (_, old_docs, old_weighted, old_saturated, _) = self._decoded.popitem(last=False)
+            self._decoded_bytes -= old_docs.nbytes + old_weighted.nbytes + old_saturated.nbytes
+
+        df = self.doc_freq[term]
+        idf = np.log(1.0 + (self.live_count - df + 0.5) / (df + 0.5))
+        return docs, saturated * np.float32(idf)
+
+    def _saturate(self, docs, weighted, average_length):
+        """BM25 term-frequency saturation with document length normalization"""
+        norm = K1 * (1.0 - B + B * self._lengths[docs] / average_length)
+        return (weighted * (K1 + 1.0) / (weighted + norm)).astype(np.float32)
+
+    def search(self, query, limit=10, kind=None, person_id=None):
+        """Return the top BM25 hits for a query, with highlighted snippets"""
+        terms = list(dict.fromkeys(analyze(query)))
+        with self._lock:
+            terms = [term for term in terms if term in self.postings]
+            if not terms or self.live_count == 0:
+                return {"total": 0, "hits": []}
+
+            doc_parts, score_parts = zip(*(self._term_scores(term) for term in terms))
+            docs = np.concatenate(doc_parts)
+            scores = np.concatenate(score_parts)
+            if len(terms) > 1:
+                if len(docs) * 8 > self.doc_count:
+                    # Long lists: accumulate into a dense array instead of sorting
+                    dense = np.bincount(docs, weights=scores, minlength=self.doc_count)
+                    docs = np.flatnonzero(dense)
+                    scores = dense[docs]
+                else:
+                    docs, inverse = np.unique(docs, return_inverse=True)
+                    scores = np.bincount(inverse, weights=scores)
+
+            keep = ~self._deleted[docs] if self.live_count < self.doc_count else None
+            if kind is not None:
+                matches = self._kinds[docs] == KINDS.index(kind)
+                keep = matches if keep is None else keep & matches
+            if person_id is not None:
+                person = self._person_index.get(person_id, -1)
+                matches = self._persons[docs] == person
+                keep = matches if keep is None else keep & matches
+            if keep is not None:
+                docs, scores = docs[keep], scores[keep]
+
+            total = len(docs)
+            limit = min(limit, total)
+            if limit <= 0:
+                return {"total": total, "hits": []}
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind='stable')]
+
+            term_set = set(terms)
+            return {
+                "total": total,
+                "hits": [self._hit(int(docs[i]), float(scores[i]), term_set) for i in top]
+            }
+
+    def _hit(self, doc_id, score, terms):
+        item = self._items[doc_id]
+        kind = KINDS[self._kinds[doc_id]]
+        person = self._persons[doc_id]
+        field, highlight = self._highlight(item, kind, terms)
+        return {
+            "personId": self._person_ids[person],
+            "name": self._person_names[person],
+            "type": kind,
+            "itemId": item.get('id'),
+            "title": item.get('title'),
+            "date": item.get('date') or item.get('dueDate'),
+            "score": round(score, 4),
+            "field": field,
+            "highlight": highlight
+        }
+
+    @staticmethod
+    def _highlight(item, kind, terms):
+        """
+        Wrap matched words of the best field in <mark> tags, trimmed to a snippet around the
+        first match. The text itself is HTML-escaped, so the snippet is safe to render as markup.
+        """
+        best = None
+        for field in sorted(DOCUMENT_FIELDS[kind], key=lambda name: -FIELD_BOOSTS[name]):
+            text = item.get(field) or ''
+            matches = [m for m in re.finditer(r"[A-Za-z0-9]+", text) if normalize_token(m.group()) in terms]
+            if matches and (best is None or len(matches) > len(best[2])):
+                best = (field, text, matches)
+        if best is None:
+            return None, None
+
+        field, text, matches = best
+        start = max(0, matches[0].start() - SNIPPET_CHARS // 4)
+        end = min(len(text), start + SNIPPET_CHARS)
+        parts = ['...' if start > 0 else '']
+        cursor = start
+        for match in matches:
+            if match.end() > end:
+                break
+            parts.append(html.escape(text[cursor:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group())}</mark>")
+            cursor = match.end()
+        parts.append(html.escape(text[cursor:end]))
+        parts.append('...' if end < len(text) else '')
+        return field, ''.join(parts)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": self.live_count,
+                "terms": len(self.postings),
+                "postingBytes": sum(len(postings) for postings in self.postings.values())
+            }
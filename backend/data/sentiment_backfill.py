@@ -0,0 +1,95 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from data.user_repository import UserRepository, score_meeting_sentiment
+
+# Analyzer owned by each backfill worker process
+_worker_analyzer = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    from models.sentiment_analyzer import SentimentAnalyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+
+def _score_batch(texts):
+    return _worker_analyzer.analyze_batch(texts)
+
+
+def _print_progress(done, total, elapsed):
+    rate = done / elapsed if elapsed > 0 else 0
+    print(f"Scored {done}/{total} meetings ({done * 100 // max(total, 1)}%, {rate:.0f}/s)")
+
+
+def pending_meetings(users, force=False):
+    """
+    Meetings with a summary to score. Meetings already scored by a model, or labelled
+    when they were added (sentimentSource 'label'), are skipped unless force is set.
+    """
+    pending = []
+    for user in users:
+        for meeting in user['meetings']:
+            if not meeting.get('summary'):
+                continue
+            if not force and (meeting.get('sentimentModel') or meeting.get('sentimentSource') == 'label'):
+                continue
+            pending.append(meeting)
+    return pending
+
+
+def backfill_meeting_sentiment(user_repo, batch_size=64, workers=None, force=False, progress=_print_progress):
+    """
+    Score every stored meeting summary that needs it (see pending_meetings) and store
+    the result on the meeting. Batches are spread over a pool of processes, one analyzer
+    per core. Returns the number of meetings scored.
+    """
+    pending = pending_meetings(user_repo.get_all_users(), force)
+
+    total = len(pending)
+    if total == 0:
+        print("All meeting summaries are already scored")
+        return 0
+
+    batches = [pending[i:i + batch_size] for i in range(0, total, batch_size)]
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+    print(f"Backfilling sentiment for {total} meetings in {len(batches)} batches on {workers} processes")
+
+    started = time.time()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(_score_batch, [meeting['summary'] for meeting in batch]): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            for meeting, sentiment in zip(batch, future.result()):
+                score_meeting_sentiment(meeting, sentiment)
+            done += len(batch)
+            if progress:
+                progress(done, total, time.time() - started)
+
+    user_repo.save()
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill sentiment for stored meeting summaries")
+    parser.add_argument('--data-file', default='data/mock_users.json')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=None, help="Number of processes (default: all cores)")
+    parser.add_argument('--force', action='store_true', help="Re-score meetings that already have a model sentiment or a label")
+    args = parser.parse_args()
+
+    backfill_meeting_sentiment(
+        UserRepository(args.data_file),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        force=args.force
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+from data.dates import from_epoch_day, to_epoch_day
+
+# Numeric value of each sentiment class
+SENTIMENT_VALUES = {'positive': 1.0, 'neutral': 0.0, 'negative': -1.0}
+
+# How far the recent tone must move from the long-run average to count as a trend
+TREND_THRESHOLD = 0.15
+
+
+def _meeting_day(meeting):
+    """Return the meeting date as an epoch day, or None if it has no usable date"""
+    if 'day' in meeting:
+        return meeting['day']
+    return to_epoch_day(meeting.get('date'))
+
+
+def _label(value):
+    if value >= 0.33:
+        return 'positive'
+    if value <= -0.33:
+        return 'negative'
+    return 'neutral'
+
+
+class ContactSentimentTrend:
+    """
+    Rolling sentiment aggregates for one contact.
+    The EWMA decays with the time between meetings (not their insertion order), so
+    meetings may arrive in any order and still produce the same result.
+    """
+
+    __slots__ = ('half_life_days', 'count', 'total', 'class_counts', 'months',
+                 'decayed_sum', 'decayed_weight', 'reference_day')
+
+    def __init__(self, half_life_days):
+        self.half_life_days = half_life_days
+        self.count = 0
+        self.total = 0.0
+        self.class_counts = {sentiment: 0 for sentiment in SENTIMENT_VALUES}
+        # 'YYYY-MM' -> [positive, neutral, negative, sum of values]
+        self.months = {}
+        self.decayed_sum = 0.0
+        self.decayed_weight = 0.0
+        self.reference_day = None
+
+    def add(self, sentiment, day):
+        sentiment = sentiment if sentiment in SENTIMENT_VALUES else 'neutral'
+        value = SENTIMENT_VALUES[sentiment]
+
+        self.count += 1
+        self.total += value
+        self.class_counts[sentiment] += 1
+
+        if day is None:
+            # Undated meetings count as current
+            day = self.reference_day
+        else:
+            month = from_epoch_day(day).strftime('%Y-%m')
+            bucket = self.months.setdefault(month, [0, 0, 0, 0.0])
+            bucket[('positive', 'neutral', 'negative').index(sentiment)] += 1
+            bucket[3] += value
+
+        if day is None:
+            weight = 1.0
+        elif self.reference_day is None or day >= self.reference_day:
+            if self.reference_day is not None:
+                decay = 0.5 ** ((day - self.reference_day) / self.half_life_days)
+                self.decayed_sum *= decay
+                self.decayed_weight *= decay
+            self.reference_day = day
+            weight = 1.0
+        else:
+            weight = 0.5 ** ((self.reference_day - day) / self.half_life_days)
+
+        self.decayed_sum += value * weight
+        self.decayed_weight += weight
+
+    @property
+    def ewma(self):
+        if self.decayed_weight <= 0:
+            return self.average
+        return self.decayed_sum / self.decayed_weight
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def direction(self):
+        if self.count < 2:
+            return 'insufficient data'
+        delta = self.ewma - self.average
+        if delta > TREND_THRESHOLD:
+            return 'improving'
+        if delta < -TREND_THRESHOLD:
+            return 'declining'
+        return 'stable'
+
+    def to_dict(self, months=None):
+        buckets = sorted(self.months.items())
+        if months:
+            buckets = buckets[-months:]
+        return {
+            "meetingCount": self.count,
+            "counts": dict(self.class_counts),
+            "ewma": round(self.ewma, 3),
+            "average": round(self.average, 3),
+            "currentTone": _label(self.ewma),
+            "direction": self.direction,
+            "lastMeetingDate": from_epoch_day(self.reference_day).isoformat() if self.reference_day is not None else None,
+            "months": [
+                {
+                    "month": month,
+                    "positive": bucket[0],
+                    "neutral": bucket[1],
+                    "negative": bucket[2],
+                    "average": round(bucket[3] / (bucket[0] + bucket[1] + bucket[2]), 3)
+                }
+                for month, bucket in buckets
+            ]
+        }
+
+
+class SentimentTrendIndex:
+    """
+    Per-contact sentiment time series, built once from the repository and then
+    maintained incrementally as meetings are added.
+    """
+
+    def __init__(self, half_life_days=30):
+        self.half_life_days = half_life_days
+        self.trends = {}
+
+    def build(self, users):
+        """Rebuild every contact's series from stored meetings"""
+        self.trends = {}
+        for user in users:
+            self.add_user(user)
+        return self
+
+    def add_user(self, user):
+        for meeting in user.get('meetings', []):
+            self.add_meeting(user['id'], meeting)
+
+    def add_meeting(self, person_id, meeting):
+        trend = self.trends.get(person_id)
+        if trend is None:
+            trend = self.trends[person_id] = ContactSentimentTrend(self.half_life_days)
+        trend.add(meeting.get('sentiment', 'neutral'), _meeting_day(meeting))
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            self.add_user(user)
+        elif event == 'meeting_added':
+            self.add_meeting(user['id'], item)
+
+    def get_trend(self, person_id, months=None):
+        """Return the contact's trend summary, or None if no meetings are recorded"""
+        trend = self.trends.get(person_id)
+        if trend is None:
+            return None
+        summary = trend.to_dict(months)
+        summary["personId"] = person_id
+        return summary
@@ -0,0 +1,103 @@
+from bisect import bisect_left, insort
+from data.dates import from_epoch_day, today_epoch_day
+
+TASK_STATUSES = ('pending', 'in-progress', 'completed', 'overdue')
+PRIORITY_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+
+
+def is_overdue(task, today):
+    """An open task that is marked overdue or whose due day has passed"""
+    if task.get('status') == 'completed':
+        return False
+    return task.get('status') == 'overdue' or (task.get('dueDay') is not None and task['dueDay'] < today)
+
+
+class TaskStats:
+    """
+    Running task statistics for one contact: counts by status and priority, completion
+    weighted by priority, and the due days of open tasks in a sorted list, so overdue
+    counts (as defined by is_overdue) and the earliest outstanding deadline are a bisect away.
+    """
+
+    __slots__ = ('total', 'by_status', 'by_priority', 'total_weight', 'completed_weight', 'open_due_days',
+                 'marked_due_days')
+
+    def __init__(self, tasks=()):
+        self.total = 0
+        self.by_status = {}
+        self.by_priority = {}
+        self.total_weight = 0
+        self.completed_weight = 0
+        self.open_due_days = []
+        # Due days of tasks marked overdue, so they are not counted twice once their day passes
+        self.marked_due_days = []
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task):
+        status = task.get('status', 'pending')
+        priority = task.get('priority', 'medium')
+        weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS['medium'])
+        self.total += 1
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        self.by_priority[priority] = self.by_priority.get(priority, 0) + 1
+        self.total_weight += weight
+        if status == 'completed':
+            self.completed_weight += weight
+        elif task.get('dueDay') is not None:
+            insort(self.open_due_days, task['dueDay'])
+            if status == 'overdue':
+                insort(self.marked_due_days, task['dueDay'])
+
+    def complete(self, task, previous_status):
+        """Account for a task that moved from `previous_status` to completed"""
+        if previous_status == 'completed':
+            return
+        self.by_status[previous_status] -= 1
+        if not self.by_status[previous_status]:
+            del self.by_status[previous_status]
+        self.by_status['completed'] = self.by_status.get('completed', 0) + 1
+        self.completed_weight += PRIORITY_WEIGHTS.get(task.get('priority', 'medium'), PRIORITY_WEIGHTS['medium'])
+        if task.get('dueDay') is not None:
+            _discard(self.open_due_days, task['dueDay'])
+            if previous_status == 'overdue':
+                _discard(self.marked_due_days, task['dueDay'])
+
+    def overdue(self, today=None):
+        """Open tasks marked overdue or whose due date has passed"""
+        today = today if today is not None else today_epoch_day()
+        marked = self.by_status.get('overdue', 0)
+        return marked + bisect_left(self.open_due_days, today) - bisect_left(self.marked_due_days, today)
+
+    def to_dict(self, today=None):
+        return {
+            "total": self.total,
+            "open": self.total - self.by_status.get('completed', 0),
+            "byStatus": dict(self.by_status),
+            "byPriority": dict(self.by_priority),
+            "overdue": self.overdue(today),
+            "completion": round(100 * self.completed_weight / self.total_weight) if self.total_weight else 0,
+            "earliestDue": from_epoch_day(self.open_due_days[0]).isoformat() if self.open_due_days else None
+        }
+
+
+def _discard(days, day):
+    position = bisect_left(days, day)
+    if position < len(days) and days[position] == day:
+        del days[position]
+
+
+def check_task_stats(users, stats):
+    """
+    Recompute every contact's statistics from their tasks and compare them with the
+    running ones in `stats` (person ID -> TaskStats). Returns the contacts that drifted.
+    """
+    today = today_epoch_day()
+    drifted = []
+    for user in users:
+        expected = TaskStats(user.get('tasks', [])).to_dict(today)
+        running = stats.get(user['id'])
+        actual = running.to_dict(today) if running is not None else None
+        if actual != expected:
+            drifted.append({"personId": user['id'], "expected": expected, "actual": actual})
+    return {"checked": len(users), "drifted": drifted}
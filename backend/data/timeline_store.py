@@ -0,0 +1,205 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import count, islice
+
+
+class ContactTimeline:
+    """
+    One contact's timeline entries ordered by (epoch day, sequence number).
+    Entries almost always arrive in date order, so adding is an append; older entries
+    are placed with a binary search. Undated entries are kept separately.
+    """
+
+    __slots__ = ('keys', 'entries', 'undated')
+
+    def __init__(self):
+        self.keys = []
+        self.entries = []
+        self.undated = []
+
+    def add(self, key, entry):
+        if key[0] is None:
+            self.undated.append(entry)
+        elif not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.entries.append(entry)
+        else:
+            position = bisect_left(self.keys, key)
+            self.keys.insert(position, key)
+            self.entries.insert(position, entry)
+
+    def bounds(self, start_day=None, end_day=None, before=None):
+        """Index range of dated entries with start_day <= day <= end_day and key < before"""
+        lo = bisect_left(self.keys, (start_day, -1)) if start_day is not None else 0
+        hi = bisect_left(self.keys, (end_day + 1, -1)) if end_day is not None else len(self.keys)
+        if before is not None:
+            hi = min(hi, bisect_left(self.keys, before))
+        return lo, hi
+
+    def newest_first(self, lo, hi, person_id):
+        for position in range(hi - 1, lo - 1, -1):
+            yield self.keys[position], person_id, self.entries[position]
+
+
+def _format_cursor(key):
+    return f"{key[0]}.{key[1]}"
+
+
+def parse_cursor(cursor):
+    """Parse a feed cursor into the (day, seq) key it points at, or raise ValueError"""
+    day, seq = cursor.split('.')
+    return int(day), int(seq)
+
+
+class TimelineStore:
+    """
+    Date-ordered timelines for every contact, kept current by repository events.
+    The global feed lazily merges the per-contact streams newest first with a heap.
+    A day index (epoch day -> contacts with entries that day) finds the few contacts that
+    can appear on a page, so a page merges only their streams instead of every contact's.
+    Each contact also has one stream per entry type, so type-filtered feeds are pruned the
+    same way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = count()
+        self.timelines = {}
+        self.by_type = {}
+        self.names = {}
+        # Entry type (None for all) -> (sorted days, day -> person IDs, one per entry)
+        self.day_index = {}
+
+    def build(self, users):
+        """Load every contact's stored timeline"""
+        with self._lock:
+            self.timelines = {}
+            self.by_type = {}
+            self.names = {}
+            self.day_index = {}
+            for user in users:
+                self._add_user(user)
+        return self
+
+    def _add_user(self, user):
+        self.names[user['id']] = user.get('name', '')
+        self.timelines.setdefault(user['id'], ContactTimeline())
+        for entry in sorted(user.get('timeline', []), key=lambda item: (item.get('day') is None, item.get('day') or 0)):
+            self._add(user['id'], entry)
+
+    def _add(self, person_id, entry):
+        key = (entry.get('day'), next(self._seq))
+        self.timelines.setdefault(person_id, ContactTimeline()).add(key, entry)
+        typed = self.by_type.setdefault(entry.get('type'), {})
+        typed.setdefault(person_id, ContactTimeline()).add(key, entry)
+        if key[0] is not None:
+            for source in (None, entry.get('type')):
+                days, contacts = self.day_index.setdefault(source, ([], {}))
+                if key[0] not in contacts:
+                    insort(days, key[0])
+                    contacts[key[0]] = []
+                contacts[key[0]].append(person_id)
+
+    def add_entry(self, person_id, entry):
+        with self._lock:
+            self._add(person_id, entry)
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event == 'user_added':
+            with self._lock:
+                self._add_user(user)
+        elif event in ('meeting_added', 'task_added', 'finance_added'):
+            self.names[user['id']] = user.get('name', '')
+            entry_id = f"tl_{item['id']}"
+            # The repository appends the entry, so it is found at the end
+            for entry in reversed(user.get('timeline', [])):
+                if entry.get('id') == entry_id:
+                    self.add_entry(user['id'], entry)
+                    break
+
+    def _describe(self, person_id, entry):
+        described = dict(entry)
+        described['personId'] = person_id
+        described['name'] = self.names.get(person_id, '')
+        return described
+
+    def get_timeline(self, person_id, start_day=None, end_day=None, types=None, newest_first=True):
+        """Return a contact's entries in a date range (undated entries only when no range is given)"""
+        with self._lock:
+            timeline = self.timelines.get(person_id)
+            if timeline is None:
+                return []
+            lo, hi = timeline.bounds(start_day, end_day)
+            entries = timeline.entries[lo:hi]
+            if newest_first:
+                entries.reverse()
+            if start_day is None and end_day is None:
+                entries.extend(timeline.undated)
+        if types:
+            entries = [entry for entry in entries if entry.get('type') in types]
+        return entries
+
+    def _candidates(self, source, needed, start_day, end_day, before):
+        """
+        Contacts that may have one of the `needed` newest entries in range: walk the day
+        index newest first until at least that many older entries have been passed.
+        """
+        if source not in self.day_index:
+            return set()
+        days, contacts = self.day_index[source]
+        top_day = end_day
+        if before is not None:
+            top_day = before[0] if top_day is None else min(top_day, before[0])
+        position = bisect_right(days, top_day) - 1 if top_day is not None else len(days) - 1
+
+        candidates = set()
+        seen = 0
+        while position >= 0 and seen < needed:
+            day = days[position]
+            if start_day is not None and day < start_day:
+                break
+            candidates.update(contacts[day])
+            # Entries on the cursor's own day may already have been returned
+            if before is None or day < before[0]:
+                seen += len(contacts[day])
+            position -= 1
+        return candidates
+
+    def feed(self, limit=20, cursor=None, start_day=None, end_day=None, types=None):
+        """
+        Return one page of every contact's activity, newest first, and the cursor of the
+        next page (None on the last page).
+        """
+        before = parse_cursor(cursor) if cursor else None
+        with self._lock:
+            heads = []
+            for source in (types or [None]):
+                timelines = self.by_type.get(source, {}) if source is not None else self.timelines
+                for person_id in self._candidates(source, limit + 1, start_day, end_day, before):
+                    timeline = timelines[person_id]
+                    lo, hi = timeline.bounds(start_day, end_day, before)
+                    if lo < hi:
+                        heads.append((timeline.keys[hi - 1], lo, hi, person_id, timeline))
+
+            # A stream whose newest entry is not among the limit + 1 newest heads is
+            # preceded by at least limit + 1 newer events, so it cannot reach this page
+            heads = heapq.nlargest(limit + 1, heads, key=lambda head: head[0])
+            streams = [timeline.newest_first(lo, hi, person_id) for _, lo, hi, person_id, timeline in heads]
+            merged = heapq.merge(*streams, key=lambda event: event[0], reverse=True)
+            page = list(islice(merged, limit + 1))
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        return {
+            "events": [self._describe(person_id, entry) for _, person_id, entry in page],
+            "nextCursor": _format_cursor(page[-1][0]) if has_more else None
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "contacts": len(self.timelines),
+                "entries": sum(len(timeline.keys) + len(timeline.undated) for timeline in self.timelines.values())
+            }
@@ -1,12 +1,43 @@
 
 import json
 import os
+from datetime import date
 from data.data_generator import generate_mock_dataset
+from data.dates import normalize_item_dates, normalize_user_dates
+from data.task_stats import TaskStats, check_task_stats
+
+def score_meeting_sentiment(meeting, sentiment):
+    """Store an analyzer result on a meeting"""
+    meeting['sentiment'] = sentiment['overall']
+    meeting['sentimentConfidence'] = sentiment['confidenceScore']
+    meeting['sentimentModel'] = sentiment.get('model')
+    meeting['sentimentSource'] = 'model'
+
+def mark_sentiment_source(meeting):
+    """
+    Record where a meeting's sentiment came from, for meetings stored before this was kept:
+    'model' if it was scored, 'label' if it was given with the meeting (by a caller or the
+    mock data generator). Meetings without a summary were never scored and are left alone,
+    and so are unscored 'neutral' ones, which add_meeting used to store when no sentiment
+    was given; the backfill job scores them.
+    """
+    if 'sentimentSource' in meeting:
+        return
+    if meeting.get('sentimentConfidence') is not None:
+        meeting['sentimentSource'] = 'model'
+    elif meeting.get('summary') and meeting.get('sentiment') not in (None, 'neutral'):
+        meeting['sentimentSource'] = 'label'
 
 class UserRepository:
-    def __init__(self, data_file='data/mock_users.json'):
+    def __init__(self, data_file='data/mock_users.json', sentiment_analyzer=None):
         self.data_file = data_file
+        # Used to score meeting summaries when they are written, so reads are a field lookup
+        self.sentiment_analyzer = sentiment_analyzer
+        # Callables (event, user, item) notified after each mutation, used to keep indexes current
+        self._listeners = []
         self.users = self._load_users()
+        # Running task statistics per user, updated as tasks are added and completed
+        self.task_stats = {user['id']: TaskStats(user.get('tasks', [])) for user in self.users}
     
     def _load_users(self):
         """Load users from JSON file or generate if not exists"""
@@ -20,13 +51,48 @@ class UserRepository:
             with open(self.data_file, 'r') as f:
                 users = json.load(f)
                 print(f"Loaded {len(users)} users from {self.data_file}")
-                return users
+            
+            # Store epoch days next to date strings so nothing re-parses them later
+            for user in users:
+                normalize_user_dates(user)
+                for meeting in user.get('meetings', []):
+                    mark_sentiment_source(meeting)
+            return users
                 
         except Exception as e:
             print(f"Error loading users: {e}")
             print("Generating fallback mock data...")
             return generate_mock_dataset(100, self.data_file)
     
+    def add_listener(self, listener):
+        """Register a callable(event, user, item) to be notified after every mutation"""
+        self._listeners.append(listener)
+    
+    def _notify(self, event, user, item):
+        for listener in self._listeners:
+            try:
+                listener(event, user, item)
+            except Exception as e:
+                print(f"Error in repository listener for {event}: {e}")
+    
+    def get_task_stats(self, user_id):
+        """Running task statistics for a user, or None if the user doesn't exist"""
+        stats = self.task_stats.get(user_id)
+        if stats is None:
+            user = self.get_user_by_id(user_id)
+            if not user:
+                return None
+            stats = self.task_stats[user_id] = TaskStats(user.get('tasks', []))
+        return stats
+    
+    def check_task_stats(self, repair=False):
+        """Recompute task statistics from scratch and report users whose running ones drifted"""
+        report = check_task_stats(self.users, self.task_stats)
+        if repair:
+            for drift in report['drifted']:
+                self.task_stats[drift['personId']] = TaskStats(self.get_user_by_id(drift['personId']).get('tasks', []))
+        return report
+    
     def get_all_users(self):
         """Get all users"""
         return self.users
@@ -47,6 +113,22 @@ class UserRepository:
         ]
         return matching_users
     
+    def add_user(self, user):
+        """Add a new contact; returns it, or None if a contact with its ID exists"""
+        if self.get_user_by_id(user['id']):
+            return None
+        normalize_user_dates(user)
+        for meeting in user.get('meetings', []):
+            mark_sentiment_source(meeting)
+        self.users.append(user)
+        self.task_stats[user['id']] = TaskStats(user.get('tasks', []))
+        
+        # Save changes
+        self._save_users()
+        self._notify('user_added', user, user)
+        
+        return user
+    
     def add_task_to_user(self, user_id, task_data):
         """Add a new task to a user"""
         user = self.get_user_by_id(user_id)
@@ -64,9 +146,12 @@ class UserRepository:
             'status': task_data.get('status', 'pending'),
             'priority': task_data.get('priority', 'medium')
         }
+        normalize_item_dates('tasks', new_task)
         
         # Add task to user
+        stats = self.get_task_stats(user_id)
         user['tasks'].append(new_task)
+        stats.add(new_task)
         
         # Add to timeline
         timeline_entry = {
@@ -76,10 +161,12 @@ class UserRepository:
             'title': new_task['title'],
             'description': f"Task assigned: {new_task['title']}"
         }
-        user['timeline'].insert(0, timeline_entry)
+        normalize_item_dates('timeline', timeline_entry)
+        user['timeline'].append(timeline_entry)
         
         # Save changes
         self._save_users()
+        self._notify('task_added', user, new_task)
         
         return new_task
     
@@ -92,7 +179,10 @@ class UserRepository:
         # Find the task
         for task in user['tasks']:
             if task['id'] == task_id:
+                stats = self.get_task_stats(user_id)
+                previous_status = task['status']
                 task['status'] = 'completed'
+                stats.complete(task, previous_status)
                 
                 # Update timeline entry if it exists
                 timeline_id = f"tl_t{task_id[1:]}"
@@ -103,6 +193,7 @@ class UserRepository:
                 
                 # Save changes
                 self._save_users()
+                self._notify('task_completed', user, task)
                 return True
         
         return False
@@ -121,9 +212,25 @@ class UserRepository:
             'id': meeting_id,
             'date': meeting_data.get('date', ''),
             'title': meeting_data.get('title', 'Untitled Meeting'),
-            'summary': meeting_data.get('summary', ''),
-            'sentiment': meeting_data.get('sentiment', 'neutral')
+            'summary': meeting_data.get('summary', '')
         }
+        # IDs of other contacts who attended, if known
+        if meeting_data.get('attendees'):
+            new_meeting['attendees'] = list(meeting_data['attendees'])
+        # Optional time of day ("HH:MM") and length, used for availability
+        if meeting_data.get('start'):
+            new_meeting['start'] = meeting_data['start']
+        if meeting_data.get('durationMinutes'):
+            new_meeting['durationMinutes'] = int(meeting_data['durationMinutes'])
+        normalize_item_dates('meetings', new_meeting)
+        
+        # Score the summary now unless the caller already labelled the meeting; without an
+        # analyzer it is left unscored for the backfill job
+        if meeting_data.get('sentiment'):
+            new_meeting['sentiment'] = meeting_data['sentiment']
+            new_meeting['sentimentSource'] = 'label'
+        elif new_meeting['summary'] and self.sentiment_analyzer:
+            score_meeting_sentiment(new_meeting, self.sentiment_analyzer.analyze(new_meeting['summary']))
         
         # Add meeting to user
         user['meetings'].append(new_meeting)
@@ -136,13 +243,64 @@ class UserRepository:
             'title': new_meeting['title'],
             'description': f"Meeting: {new_meeting['title']}"
         }
-        user['timeline'].insert(0, timeline_entry)
+        normalize_item_dates('timeline', timeline_entry)
+        user['timeline'].append(timeline_entry)
         
         # Save changes
         self._save_users()
+        self._notify('meeting_added', user, new_meeting)
         
         return new_meeting
     
+    def add_finance(self, user_id, finance_data):
+        """Record a payment owed, paid or received"""
+        user = self.get_user_by_id(user_id)
+        if not user:
+            return None
+        
+        # Generate finance ID
+        finance_id = f"f{len(user['finances']) + 1}"
+        
+        # Create the new finance entry
+        new_finance = {
+            'id': finance_id,
+            'amount': finance_data.get('amount', 0),
+            'currency': finance_data.get('currency', 'USD'),
+            'date': finance_data.get('date') or date.today().isoformat(),
+            'description': finance_data.get('description', 'Payment'),
+            'type': finance_data.get('type', 'owed')
+        }
+        # 'to' when you owe the contact (the default), 'from' when the contact owes you
+        if finance_data.get('direction'):
+            new_finance['direction'] = finance_data['direction']
+        if finance_data.get('dueDate'):
+            new_finance['dueDate'] = finance_data['dueDate']
+        normalize_item_dates('finances', new_finance)
+        
+        # Add finance to user
+        user['finances'].append(new_finance)
+        
+        # Add to timeline
+        timeline_entry = {
+            'id': f"tl_f{finance_id[1:]}",
+            'date': new_finance['date'],
+            'type': 'payment',
+            'title': new_finance['description'],
+            'description': f"{new_finance['type'].capitalize()}: ${new_finance['amount']} - {new_finance['description']}"
+        }
+        normalize_item_dates('timeline', timeline_entry)
+        user['timeline'].append(timeline_entry)
+        
+        # Save changes
+        self._save_users()
+        self._notify('finance_added', user, new_finance)
+        
+        return new_finance
+    
+    def save(self):
+        """Persist all users"""
+        return self._save_users()
+    
     def _save_users(self):
         """Save users to JSON file"""
         try:
@@ -0,0 +1,113 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import threading
+import weakref
+import httpx
+
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# HTTP/2 is negotiated when the optional h2 package is installed (httpx[http2])
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+
+class AsyncHttpClient:
+    """
+    An asyncio HTTP client for scraping: a keep-alive connection pool (HTTP/2 where the
+    server and the h2 package allow), at most `per_host` requests in flight to any one host,
+    and up to `retries` retries of connection errors and retryable statuses with jittered
+    exponential backoff (or the server's Retry-After). The underlying httpx client belongs
+    to an event loop, so each loop that uses the client gets its own pool.
+    """
+
+    def __init__(self, headers=None, max_connections=100, per_host=8, retries=2,
+                 backoff=0.5, max_backoff=8.0, timeout=15.0):
+        self.headers = dict(headers or {})
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        # event loop -> (httpx client, host -> semaphore)
+        self._loops = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'inFlight': 0}
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.get(loop)
+            if state is None:
+                client = httpx.AsyncClient(
+                    headers=self.headers,
+                    http2=HTTP2,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections)
+                )
+                state = self._loops[loop] = (client, {})
+        return state
+
+    def _host_limit(self, host_limits, host):
+        limit = host_limits.get(host)
+        if limit is None:
+            limit = host_limits[host] = asyncio.Semaphore(self.per_host)
+        return limit
+
+    def _delay(self, attempt, response):
+        """Seconds to wait before retry `attempt` (0-based)"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        # Full jitter: spreads retries of many concurrent requests instead of bunching them
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def get(self, url, **kwargs):
+        """GET `url`; returns the last response, or raises the last connection error"""
+        client, host_limits = self._state()
+        limit = self._host_limit(host_limits, httpx.URL(url).host)
+        for attempt in range(self.retries + 1):
+            response = error = None
+            async with limit:
+                with self._lock:
+                    self._stats['requests'] += 1
+                    self._stats['inFlight'] += 1
+                try:
+                    response = await client.get(url, **kwargs)
+                except httpx.TransportError as e:
+                    error = e
+                finally:
+                    with self._lock:
+                        self._stats['inFlight'] -= 1
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.retries:
+                with self._lock:
+                    self._stats['failures'] += 1
+                if response is not None:
+                    return response
+                raise error
+            delay = self._delay(attempt, response)
+            logger.info(f"Retrying {url} in {delay:.2f}s ({error or response.status_code})")
+            with self._lock:
+                self._stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, http2=HTTP2, perHost=self.per_host, maxConnections=self.max_connections)
+
+    async def aclose(self):
+        """Close the connection pool of the running loop"""
+        with self._lock:
+            state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
@@ -5,10 +5,15 @@ from transformers import pipeline
 import os
 
 class EntityExtractor:
-    def __init__(self):
+    def __init__(self, model_pool=None):
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
+        # Shared worker pool that runs the NER model out of process (see model_worker_pool)
+        self.model_pool = model_pool
+        self.ner_pipeline = None
         
-        if self.use_pretrained_model:
+        if self.use_pretrained_model and self.model_pool is not None:
+            print("EntityExtractor will use the shared model worker pool")
+        elif self.use_pretrained_model:
             try:
                 # Initialize the NER pipeline
                 self.ner_pipeline = pipeline("ner")
@@ -24,7 +29,7 @@ class EntityExtractor:
         Extract named entities from the command text.
         Returns a list of entities found in the text.
         """
-        if self.use_pretrained_model and self.ner_pipeline:
+        if self.use_pretrained_model and (self.model_pool is not None or self.ner_pipeline):
             return self._extract_with_model(command, person)
         else:
             return self._simulate_entity_extraction(command, person)
@@ -33,7 +38,10 @@ class EntityExtractor:
         """Use the actual NER model to extract entities"""
         try:
             # Run NER pipeline
-            ner_results = self.ner_pipeline(command)
+            if self.model_pool is not None:
+                ner_results = self.model_pool.run('ner', command)
+            else:
+                ner_results = self.ner_pipeline(command)
             
             # Process and format results
             entities = []
@@ -2,9 +2,26 @@
 import datetime
 import random
 import os
+import numpy as np
+from data.dates import epoch_day_of, from_epoch_day, today_epoch_day
+from data.follow_up_planner import FOLLOW_UP_DAYS, DEFAULT_FOLLOW_UP_DAYS
+
+# Follow-ups are placed on the best weekday within this many days of the due date
+FOLLOW_UP_WINDOW_DAYS = 3
+WORK_HOURS = range(8, 19)
+DEFAULT_HOUR = 9
+# Weight of the book-wide histogram, in interactions, added to each contact's own
+PRIOR_WEIGHT = 2.0
+
+def _format_hour(hour):
+    return datetime.time(hour).strftime('%I:%M %p').lstrip('0')
 
 class FollowUpRecommender:
-    def __init__(self):
+    def __init__(self, planner=None, histograms=None):
+        # Whole-book follow-up queue; when given, its due dates are used for single contacts too
+        self.planner = planner
+        # Engagement histograms; when given, the day and hour are learned from past interactions
+        self.histograms = histograms
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
         
         if self.use_pretrained_model:
@@ -33,22 +50,22 @@ class FollowUpRecommender:
         """Simulate follow-up recommendation for development"""
         today = datetime.datetime.now()
         
-        # Different timing based on relationship status
-        days_to_add = 7  # Default
-        if person['relationshipStatus'] == 'New':
-            days_to_add = 3  # Follow up sooner for new relationships
-        elif person['relationshipStatus'] == 'Active':
-            days_to_add = 7  # Standard for active
-        elif person['relationshipStatus'] == 'Inactive':
-            days_to_add = 5  # Slightly sooner to reactivate
-        elif person['relationshipStatus'] == 'Close':
-            days_to_add = 10  # Can wait longer for close relationships
-        
-        # Add some randomness to make it more realistic
-        days_to_add += random.randint(-2, 2)
-        days_to_add = max(1, days_to_add)  # No less than 1 day
+        due_day = self.planner.next_follow_up(person['id']) if self.planner else None
+        if due_day is not None:
+            # Follow up when the planner has it due, but not before tomorrow
+            follow_up_date = from_epoch_day(max(due_day, today_epoch_day() + 1))
+        else:
+            # Different timing based on relationship status
+            days_to_add = FOLLOW_UP_DAYS.get(person['relationshipStatus'], DEFAULT_FOLLOW_UP_DAYS)
+            
+            # Add some randomness to make it more realistic
+            days_to_add += random.randint(-2, 2)
+            days_to_add = max(1, days_to_add)  # No less than 1 day
+            
+            follow_up_date = today + datetime.timedelta(days=days_to_add)
         
-        follow_up_date = today + datetime.timedelta(days=days_to_add)
+        if self.histograms is not None:
+            return self._learned_follow_up_time(person, follow_up_date)
         
         # Generate time options
         hours = ['9:00 AM', '11:30 AM', '2:00 PM', '4:30 PM']
@@ -77,3 +94,50 @@ class FollowUpRecommender:
             "alternativeTime": random_alt,
             "confidence": confidence
         }
+
+    def _learned_follow_up_time(self, person, follow_up_date):
+        """Pick the day and hour the contact has engaged most, smoothed by the whole book"""
+        histogram = self.histograms.histogram(person['id'])
+        total_hours, total_days = self.histograms.totals()
+        hours, days = histogram if histogram is not None else (np.zeros_like(total_hours), np.zeros_like(total_days))
+
+        def prior(counts):
+            return PRIOR_WEIGHT * counts / counts.sum() if counts.sum() else np.zeros(len(counts))
+
+        day_scores = days + prior(total_days)
+        hour_scores = (hours + prior(total_hours)).reshape(7, 24)[:, WORK_HOURS]
+
+        # Candidate (day, hour) pairs on weekdays in the window after the due date
+        first_day = epoch_day_of(follow_up_date)
+        candidates = []
+        for day in range(first_day, first_day + FOLLOW_UP_WINDOW_DAYS + 1):
+            weekday = (day + 3) % 7
+            if weekday >= 5:
+                continue
+            scores = hour_scores[weekday]
+            hour = WORK_HOURS[int(np.argmax(scores))] if scores.any() else DEFAULT_HOUR
+            # Prefer sooner days when the scores are equal
+            candidates.append((day_scores[weekday] + scores.max() / 24, -day, hour))
+        candidates.sort(reverse=True)
+        best_score, best_day, best_hour = candidates[0]
+        alternative = candidates[1] if len(candidates) > 1 else None
+
+        # Confidence grows with the contact's history and how concentrated it is on the pick
+        interactions = int(days.sum())
+        weekday = (-best_day + 3) % 7
+        timed = int(hours.reshape(7, 24)[weekday].sum())
+        hour_share = hours.reshape(7, 24)[weekday, best_hour] / timed if timed else 0
+        day_share = days[weekday] / interactions if interactions else 0
+        confidence = 60 + 15 * min(1, interactions / 10) + 10 * day_share + 10 * hour_share
+
+        best_date = from_epoch_day(-best_day)
+        return {
+            "date": best_date.strftime('%A, %b %d'),
+            "time": _format_hour(best_hour),
+            "alternativeTime": (
+                f"on {from_epoch_day(-alternative[1]).strftime('%A')} at {_format_hour(alternative[2])}"
+                if alternative else "next week"
+            ),
+            "confidence": int(min(95, round(confidence))),
+            "basedOnInteractions": interactions
+        }
@@ -0,0 +1,214 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from data.dates import today_epoch_day
+from data.finance_ledger import category_of
+from data.task_stats import is_overdue
+
+# Feature columns extracted for every contact
+FEATURES = ['recencyDays', 'recentEvents', 'eventTypes', 'meetingTone', 'overdueTasks', 'owedAmount', 'overdueOwedAmount']
+
+# Weights of each component of the health score (they sum to 1)
+SCORE_WEIGHTS = {
+    'recency': 0.30,
+    'frequency': 0.20,
+    'diversity': 0.15,
+    'tone': 0.15,
+    'tasks': 0.10,
+    'finances': 0.10
+}
+
+TIMELINE_TYPES = 4  # meeting, task, payment, contact
+FREQUENCY_WINDOW_DAYS = 90
+DIVERSITY_WINDOW_DAYS = 180
+RECENCY_SCALE_DAYS = 45.0
+NO_CONTACT_DAYS = 365
+# Money you owe a contact at which the finance component bottoms out; overdue debt counts twice
+DEBT_SCALE = 5000.0
+
+SENTIMENT_VALUES = {'positive': 1.0, 'neutral': 0.0, 'negative': -1.0}
+
+
+def _band(score):
+    if score >= 70:
+        return 'healthy'
+    if score >= 40:
+        return 'needs attention'
+    return 'at risk'
+
+
+class RelationshipHealthScorer:
+    """
+    Health score (0-100) for every contact in the book.
+    Features are pulled out of each contact's timeline, meetings, tasks and finances into
+    NumPy columns; scores for the whole book are then computed in one vectorized pass.
+    A mutated contact only has its own row re-extracted and re-scored.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.index = {}
+        self.features = np.zeros((0, len(FEATURES)))
+        self.scores = np.zeros(0)
+        self.computed_at = None
+        self._lock = threading.Lock()
+        self._nightly_thread = None
+
+    def _extract(self, user, today):
+        """Compute one contact's feature row"""
+        last_day = user.get('lastContactedDay')
+        recent_events = 0
+        recent_types = set()
+
+        for entry in user.get('timeline', []):
+            day = entry.get('day')
+            # Future entries (upcoming task deadlines) say nothing about past engagement
+            if day is None or day > today:
+                continue
+            if last_day is None or day > last_day:
+                last_day = day
+            age = today - day
+            if age <= FREQUENCY_WINDOW_DAYS:
+                recent_events += 1
+            if age <= DIVERSITY_WINDOW_DAYS:
+                recent_types.add(entry.get('type'))
+
+        tones = [SENTIMENT_VALUES.get(meeting.get('sentiment'), 0.0) for meeting in user.get('meetings', [])]
+        overdue = sum(1 for task in user.get('tasks', []) if is_overdue(task, today))
+        owed = overdue_owed = 0.0
+        for finance in user.get('finances', []):
+            if category_of(finance) != 'payable':
+                continue
+            owed += finance.get('amount', 0)
+            if finance.get('dueDay') is not None and finance['dueDay'] < today:
+                overdue_owed += finance.get('amount', 0)
+
+        recency = today - last_day if last_day is not None else NO_CONTACT_DAYS
+        return [
+            max(recency, 0),
+            recent_events,
+            len(recent_types),
+            sum(tones) / len(tones) if tones else 0.0,
+            overdue,
+            owed,
+            overdue_owed
+        ]
+
+    @staticmethod
+    def _score(features):
+        """Vectorized health score for a block of feature rows"""
+        recency = np.exp(-features[:, 0] / RECENCY_SCALE_DAYS)
+        frequency = 1.0 - np.exp(-features[:, 1] / 4.0)
+        diversity = np.minimum(features[:, 2] / TIMELINE_TYPES, 1.0)
+        tone = (features[:, 3] + 1.0) / 2.0
+        tasks = 1.0 - np.minimum(features[:, 4], 5) / 5.0
+        finances = 1.0 - np.minimum((features[:, 5] + features[:, 6]) / DEBT_SCALE, 1.0)
+
+        score = (
+            SCORE_WEIGHTS['recency'] * recency
+            + SCORE_WEIGHTS['frequency'] * frequency
+            + SCORE_WEIGHTS['diversity'] * diversity
+            + SCORE_WEIGHTS['tone'] * tone
+            + SCORE_WEIGHTS['tasks'] * tasks
+            + SCORE_WEIGHTS['finances'] * finances
+        )
+        return np.round(score * 100, 1)
+
+    def refresh(self, users):
+        """Re-extract features and re-score the whole book"""
+        today = today_epoch_day()
+        rows = [self._extract(user, today) for user in users]
+        features = np.array(rows, dtype=np.float64).reshape(len(rows), len(FEATURES))
+        scores = self._score(features)
+
+        with self._lock:
+            self.ids = [user['id'] for user in users]
+            self.names = [user.get('name', '') for user in users]
+            self.index = {person_id: row for row, person_id in enumerate(self.ids)}
+            self.features = features
+            self.scores = scores
+            self.computed_at = datetime.now()
+        return self
+
+    def update_user(self, user):
+        """Re-score a single contact after it changed"""
+        row_features = np.array([self._extract(user, today_epoch_day())], dtype=np.float64)
+        score = self._score(row_features)[0]
+
+        with self._lock:
+            row = self.index.get(user['id'])
+            if row is None:
+                row = len(self.ids)
+                self.ids.append(user['id'])
+                self.names.append(user.get('name', ''))
+                self.index[user['id']] = row
+                self.features = np.vstack([self.features, row_features])
+                self.scores = np.append(self.scores, score)
+            else:
+                self.features[row] = row_features[0]
+                self.scores[row] = score
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        self.update_user(user)
+
+    def _describe(self, row):
+        return {
+            "personId": self.ids[row],
+            "name": self.names[row],
+            "score": float(self.scores[row]),
+            "band": _band(self.scores[row]),
+            "features": {name: float(value) for name, value in zip(FEATURES, self.features[row])}
+        }
+
+    def get_score(self, person_id):
+        with self._lock:
+            row = self.index.get(person_id)
+            return self._describe(row) if row is not None else None
+
+    def top_k(self, k=10, at_risk=True):
+        """Return the k lowest-scoring (most at-risk) or highest-scoring contacts"""
+        with self._lock:
+            count = len(self.scores)
+            k = max(0, min(k, count))
+            if k == 0:
+                return []
+            keys = self.scores if at_risk else -self.scores
+            rows = np.argpartition(keys, k - 1)[:k] if k < count else np.arange(count)
+            rows = rows[np.argsort(keys[rows], kind='stable')]
+            return [self._describe(row) for row in rows]
+
+    def summary(self):
+        with self._lock:
+            bands = {'healthy': 0, 'needs attention': 0, 'at risk': 0}
+            for score in self.scores:
+                bands[_band(score)] += 1
+            return {
+                "contacts": len(self.scores),
+                "averageScore": round(float(self.scores.mean()), 1) if len(self.scores) else None,
+                "bands": bands,
+                "computedAt": self.computed_at.isoformat() if self.computed_at else None
+            }
+
+    def start_nightly_refresh(self, get_users, hour=2):
+        """Re-score the whole book every night at the given hour, in a background thread"""
+        if self._nightly_thread is not None:
+            return
+
+        def run():
+            while True:
+                now = datetime.now()
+                next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+                if next_run <= now:
+                    next_run += timedelta(days=1)
+                time.sleep((next_run - now).total_seconds())
+                try:
+                    self.refresh(get_users())
+                    print(f"Refreshed relationship health scores for {len(self.ids)} contacts")
+                except Exception as e:
+                    print(f"Error refreshing relationship health scores: {e}")
+
+        self._nightly_thread = threading.Thread(target=run, name='health-score-refresh', daemon=True)
+        self._nightly_thread.start()
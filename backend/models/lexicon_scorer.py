@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from itertools import repeat
+from types import MappingProxyType
+import numpy as np
+
+# Words, plus clause punctuation that ends a negation's scope, plus the batch document separator
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]|\x00")
+CLAUSE_BREAKS = frozenset('.,;:!?')
+DOCUMENT_SEPARATOR = '\x00'
+
+# Lookup values that mark non-lexicon tokens; lexicon weights are always finite
+_NEGATION = float('nan')
+_CLAUSE_BREAK = float('inf')
+_DOCUMENT_BREAK = float('-inf')
+
+DEFAULT_NEGATIONS = frozenset([
+    'not', 'no', 'never', 'none', 'nor', 'without', 'neither', 'hardly', 'barely',
+    "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't",
+    "can't", "cannot", "couldn't", "won't", "wouldn't", "shouldn't", "haven't", "hasn't"
+])
+
+# Words of the original keyword simulation, with the inflections its substring search used to catch
+DEFAULT_LEXICON = {
+    'good': 1.0, 'great': 1.0, 'excellent': 1.0, 'positive': 1.0, 'happy': 1.0,
+    'success': 1.0, 'successful': 1.0, 'successfully': 1.0, 'succeeded': 1.0, 'beneficial': 1.0,
+    'bad': -1.0, 'poor': -1.0, 'negative': -1.0, 'unhappy': -1.0,
+    'fail': -1.0, 'fails': -1.0, 'failed': -1.0, 'failing': -1.0, 'failure': -1.0,
+    'issue': -1.0, 'issues': -1.0, 'problem': -1.0, 'problems': -1.0,
+    'concern': -1.0, 'concerns': -1.0, 'concerned': -1.0
+}
+
+LexiconScore = namedtuple('LexiconScore', ['positive', 'negative', 'matches'])
+
+
+def tokenize(text):
+    """Lowercase and split text into word and punctuation tokens in a single pass"""
+    return TOKEN_PATTERN.findall(text.replace(DOCUMENT_SEPARATOR, ' ').lower())
+
+
+class LexiconScorer:
+    """
+    Scores text against a frozen word -> weight lexicon.
+    Each token is looked up once, so the cost grows with the text, not the lexicon size.
+    A negation word flips the polarity of lexicon words in the next negation_window tokens,
+    up to the end of the clause.
+    `identity` names the lexicon's source and a hash of its contents, so results scored
+    with different lexicons are never mistaken for each other.
+    """
+
+    def __init__(self, weights=None, negations=DEFAULT_NEGATIONS, negation_window=3, source='default'):
+        self.weights = MappingProxyType(dict(DEFAULT_LEXICON if weights is None else weights))
+        self.negations = frozenset(negations)
+        self.negation_window = negation_window
+        contents = json.dumps([sorted(self.weights.items()), sorted(self.negations), negation_window])
+        self.identity = f"{source}:{hashlib.sha256(contents.encode('utf-8')).hexdigest()[:16]}"
+
+        # One table answers every per-token question with a single dict lookup
+        table = dict(self.weights)
+        table.update((word, _NEGATION) for word in self.negations)
+        table.update((mark, _CLAUSE_BREAK) for mark in CLAUSE_BREAKS)
+        table[DOCUMENT_SEPARATOR] = _DOCUMENT_BREAK
+        self._table = MappingProxyType(table)
+
+    @classmethod
+    def from_vader_lexicon(cls, path=None, **kwargs):
+        """
+        Build a scorer from a VADER lexicon file (token<TAB>mean<TAB>...).
+        Weights are rescaled from VADER's -4..4 range to -1..1.
+        Uses the copy installed with the NLTK vader_lexicon data when no path is given.
+        """
+        if path is None:
+            import nltk
+            path = nltk.data.find('sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt')
+            lines = path.open().read().decode('utf-8').splitlines()
+        else:
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+        weights = {}
+        for line in lines:
+            parts = line.split('\t')
+            if len(parts) >= 2:
+                weights[parts[0]] = float(parts[1]) / 4.0
+        kwargs.setdefault('source', 'vader' if path is None else os.path.basename(path))
+        return cls(weights, **kwargs)
+
+    @classmethod
+    def from_environment(cls):
+        """Use the VADER lexicon when SENTIMENT_LEXICON=vader, otherwise the built-in word list"""
+        source = os.environ.get('SENTIMENT_LEXICON', 'default').lower()
+        if source == 'vader':
+            try:
+                return cls.from_vader_lexicon()
+            except Exception as e:
+                print(f"Warning: Failed to load VADER lexicon ({e}), using the default lexicon")
+        elif source != 'default':
+            return cls.from_vader_lexicon(source)
+        return cls()
+
+    def score(self, text):
+        """Return the summed positive and negative weights found in the text"""
+        get = self._table.get
+        positive = negative = 0.0
+        matches = 0
+        negated_until = -1
+
+        for i, token in enumerate(tokenize(text)):
+            value = get(token)
+            if value is None:
+                continue
+            if value != value:
+                negated_until = i + self.negation_window
+                continue
+            if value == _CLAUSE_BREAK:
+                negated_until = -1
+                continue
+            matches += 1
+            if i <= negated_until:
+                value = -value
+            if value > 0:
+                positive += value
+            else:
+                negative -= value
+
+        return LexiconScore(positive, negative, matches)
+
+    def score_batch(self, texts):
+        """
+        Score a list of texts together.
+        The batch is lowercased and tokenized in one pass, and negation scopes and
+        per-text sums are computed with array operations.
+        Returns (positive, negative, matches) as NumPy arrays with one entry per text.
+        """
+        count = len(texts)
+        if count == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64)
+
+        joined = DOCUMENT_SEPARATOR.join(text.replace(DOCUMENT_SEPARATOR, ' ') for text in texts)
+        tokens = TOKEN_PATTERN.findall(joined.lower())
+        values = np.fromiter(map(self._table.get, tokens, repeat(0.0)), dtype=np.float64, count=len(tokens))
+
+        is_negation = np.isnan(values)
+        is_document_break = values == _DOCUMENT_BREAK
+        is_break = is_document_break | (values == _CLAUSE_BREAK)
+        weight = np.where(np.isfinite(values), values, 0.0)
+
+        doc = np.cumsum(is_document_break)
+        position = np.arange(len(tokens))
+
+        # Most recent negation and clause break at or before each token
+        last_negation = np.maximum.accumulate(np.where(is_negation, position, -1))
+        last_break = np.maximum.accumulate(np.where(is_break, position, -1))
+        negated = (
+            (last_negation > last_break)
+            & (position - last_negation <= self.negation_window)
+        )
+        weight = np.where(negated, -weight, weight)
+
+        positive = np.bincount(doc, weights=np.clip(weight, 0, None), minlength=count)
+        negative = np.bincount(doc, weights=np.clip(-weight, 0, None), minlength=count)
+        matches = np.bincount(doc, weights=(weight != 0), minlength=count).astype(np.int64)
+        return positive, negative, matches
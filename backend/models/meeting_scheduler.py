@@ -1,10 +1,14 @@
 
-import random
-from datetime import datetime, timedelta
 import os
+import numpy as np
+from data.availability import AvailabilityIndex, SLOT_MINUTES, SLOTS_PER_DAY
+
+NOON_SLOT = 12 * 60 // SLOT_MINUTES
 
 class MeetingScheduler:
-    def __init__(self):
+    def __init__(self, availability=None):
+        # Busy times of you and your contacts; suggestions are slots free for everyone
+        self.availability = availability or AvailabilityIndex()
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
         
         if self.use_pretrained_model:
@@ -21,90 +25,99 @@ class MeetingScheduler:
         if self.use_pretrained_model:
             return self._suggest_with_model(command, person)
         else:
-            return self._simulate_meeting_suggestions(command, person)
+            return self._suggest_from_availability(command, person)
     
     def _suggest_with_model(self, command, person):
         """Suggest meeting times using a scheduling model"""
         # This would analyze calendar data and optimize for scheduling
-        # For now, just call the simulation
-        return self._simulate_meeting_suggestions(command, person)
+        # For now, use the availability intersection
+        return self._suggest_from_availability(command, person)
     
-    def _simulate_meeting_suggestions(self, command, person):
-        """Simulate meeting time suggestions for development"""
-        # Days of the week
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        
-        # Times during the day
-        morning_times = ['9:00 AM', '10:30 AM', '11:30 AM']
-        afternoon_times = ['1:00 PM', '2:30 PM', '4:00 PM', '5:00 PM']
-        
-        # Today's day
-        today = datetime.now()
-        today_weekday = today.weekday()  # 0 = Monday, 6 = Sunday
-        
-        # Generate dates for next 10 business days
-        future_dates = []
-        days_to_add = 0
-        while len(future_dates) < 10:
-            future_date = today + timedelta(days=days_to_add)
-            # Skip weekends
-            if future_date.weekday() < 5:  # 0-4 are weekdays
-                future_dates.append(future_date)
-            days_to_add += 1
-        
-        # Generate 3 options on different days
-        options = []
-        used_days = set()
-        
-        while len(options) < 3:
-            # Pick a random date from our future dates
-            date = random.choice(future_dates)
-            day_name = days[date.weekday()]
-            
-            # Don't use the same day twice
-            if day_name in used_days:
-                continue
-            
-            used_days.add(day_name)
-            
-            # Pick a time - prefer morning for some relationship statuses
-            if person['relationshipStatus'] in ['New', 'Inactive']:
-                # New and inactive relationships often work better with morning meetings
-                time = random.choice(morning_times)
-            else:
-                # Otherwise use all available times
-                time = random.choice(morning_times + afternoon_times)
-            
-            # Format the date
-            date_str = date.strftime("%b %d")
-            options.append(f"{day_name}, {date_str} at {time}")
-        
-        # Choose a recommended option (in a real system, this would be based on ML)
-        recommended = options[0]  # Default to first option
-        
-        # For close relationships, prefer afternoon meetings
+    def _meeting_duration(self, command):
+        """Meeting length asked for in the command, as (label, minutes)"""
+        if 'brief' in command.lower() or 'quick' in command.lower():
+            return "30 minutes", 30
+        elif 'long' in command.lower() or 'extended' in command.lower() or 'detailed' in command.lower():
+            return "1.5 hours", 90
+        return "1 hour", 60  # Default
+
+    def _suggest_from_availability(self, command, person, now=None):
+        """Suggest the earliest times on separate days when you and the person are both free"""
+        duration, minutes = self._meeting_duration(command)
+
+        # New and inactive relationships often work better with morning meetings
+        prefer_morning = person['relationshipStatus'] in ['New', 'Inactive']
+        slots = self.availability.free_slots(
+            [person['id']], duration_minutes=minutes, limit=3, start=now, prefer_morning=prefer_morning
+        )
+        options = [self._format_slot(start) for start, _ in slots]
+
+        # Choose a recommended option: the soonest, except close relationships prefer afternoons
+        recommended = options[0] if options else None
         if person['relationshipStatus'] == 'Close':
-            for option in options:
-                if any(time in option for time in afternoon_times):
+            for option, (start, _) in zip(options, slots):
+                if start.hour >= 12:
                     recommended = option
                     break
-        
-        # For inactive relationships, prioritize sooner dates
-        elif person['relationshipStatus'] == 'Inactive':
-            recommended = options[0]  # First option is usually sooner
-        
-        # Determine meeting duration
-        if 'brief' in command.lower() or 'quick' in command.lower():
-            duration = "30 minutes"
-        elif 'long' in command.lower() or 'extended' in command.lower() or 'detailed' in command.lower():
-            duration = "1.5 hours"
-        else:
-            duration = "1 hour"  # Default
-        
+
         return {
-            "option1": options[0],
-            "option2": options[1],
-            "option3": options[2],
+            "options": options,
+            "option1": options[0] if len(options) > 0 else None,
+            "option2": options[1] if len(options) > 1 else None,
+            "option3": options[2] if len(options) > 2 else None,
             "recommended": recommended,
+            "duration": duration,
+            "slots": [{"start": start.isoformat(), "end": end.isoformat()} for start, end in slots]
+        }
+
+    def suggest_group_meeting_times(self, command, people, duration_minutes=None, min_attendees=None, limit=3, now=None):
+        """
+        Suggest meeting times with several people. Options everyone can make come first;
+        when there are none, options that at least `min_attendees` (default: a majority) can
+        make are returned instead, with who would miss them.
+        """
+        duration, minutes = self._meeting_duration(command or '')
+        if duration_minutes:
+            minutes = int(duration_minutes)
+            duration = f"{minutes} minutes" if minutes % 60 else f"{minutes // 60} hour{'s' if minutes > 60 else ''}"
+
+        ids = [person['id'] for person in people]
+        names = {person['id']: person['name'] for person in people}
+        # Same preferences as one-to-one meetings: mornings for new and inactive relationships,
+        # afternoons for close ones
+        preferences = np.zeros((len(people), SLOTS_PER_DAY))
+        for row, person in enumerate(people):
+            if person['relationshipStatus'] in ['New', 'Inactive']:
+                preferences[row, :NOON_SLOT] = 1
+            elif person['relationshipStatus'] == 'Close':
+                preferences[row, NOON_SLOT:] = 1
+
+        slots = self.availability.group_slots(
+            ids, duration_minutes=minutes, limit=limit, preferences=preferences, start=now
+        )
+        everyone = bool(slots)
+        if not slots:
+            quorum = min_attendees if min_attendees is not None else len(ids) // 2 + 1
+            slots = self.availability.group_slots(
+                ids, duration_minutes=minutes, limit=limit, min_attendees=quorum, preferences=preferences, start=now
+            )
+
+        options = [{
+            "option": self._format_slot(slot["start"]),
+            "start": slot["start"].isoformat(),
+            "end": slot["end"].isoformat(),
+            "attendees": slot["attendees"],
+            "missing": [{"personId": person_id, "name": names[person_id]} for person_id in slot["missing"]]
+        } for slot in slots]
+
+        return {
+            "participants": len(ids),
+            "everyoneAvailable": everyone,
+            "options": options,
+            "recommended": options[0]["option"] if options else None,
             "duration": duration
         }
+
+    @staticmethod
+    def _format_slot(start):
+        return f"{start.strftime('%A, %b %d')} at {start.strftime('%I:%M %p').lstrip('0')}"
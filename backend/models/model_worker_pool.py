@@ -0,0 +1,412 @@
+import argparse
+import atexit
+import itertools
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection, Listener, Client
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hugging Face pipeline task for each operation a worker can serve
+PIPELINE_TASKS = {
+    'sentiment': 'sentiment-analysis',
+    'ner': 'ner'
+}
+# Model and revision for each operation (None: the pipeline's default). Pinned, because
+# cached results are keyed by the model that produced them.
+PIPELINE_MODELS = {
+    'sentiment': (
+        os.environ.get('SENTIMENT_MODEL', 'distilbert/distilbert-base-uncased-finetuned-sst-2-english'),
+        os.environ.get('SENTIMENT_MODEL_REVISION', '714eb0f')
+    ),
+    'ner': (None, None)
+}
+
+
+class ModelWorkerError(Exception):
+    """Raised when a model worker fails, times out or returns an error"""
+
+
+class ModelWorkerTimeout(ModelWorkerError):
+    """Raised when a model worker does not answer in time"""
+
+
+def _to_builtin(value):
+    """Convert pipeline output (which may hold NumPy scalars) to plain Python types"""
+    if isinstance(value, dict):
+        return {key: _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(item) for item in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _worker_main(read_fd, write_fd, ops):
+    """
+    Entry point of a worker process.
+    Loads one pipeline per operation and answers (request_id, op, payload) messages
+    with (request_id, ok, result) until the pool closes the pipe.
+    """
+    from transformers import pipeline
+
+    requests_in = Connection(read_fd, writable=False)
+    responses_out = Connection(write_fd, readable=False)
+
+    pipelines = {}
+    for op in ops:
+        try:
+            model, revision = PIPELINE_MODELS[op]
+            pipelines[op] = pipeline(PIPELINE_TASKS[op], model=model, revision=revision)
+        except Exception as e:
+            print(f"Model worker {os.getpid()} failed to load {op} pipeline: {e}", file=sys.stderr)
+
+    while True:
+        try:
+            request_id, op, payload = requests_in.recv()
+        except (EOFError, OSError):
+            break
+
+        if op == 'ping':
+            responses_out.send((request_id, True, sorted(pipelines)))
+            continue
+
+        model = pipelines.get(op)
+        if model is None:
+            responses_out.send((request_id, False, f"Operation '{op}' is not available in this worker"))
+            continue
+
+        try:
+            responses_out.send((request_id, True, _to_builtin(model(payload))))
+        except Exception as e:
+            responses_out.send((request_id, False, str(e)))
+
+
+class _Worker:
+    """Handle on one worker subprocess and its request/response pipes"""
+
+    def __init__(self, index, ops):
+        self.index = index
+        request_read, request_write = os.pipe()
+        response_read, response_write = os.pipe()
+
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'models.model_worker_pool', 'worker',
+             '--read-fd', str(request_read),
+             '--write-fd', str(response_write),
+             '--ops', ','.join(ops)],
+            cwd=BACKEND_DIR,
+            pass_fds=(request_read, response_write)
+        )
+        os.close(request_read)
+        os.close(response_write)
+
+        self.requests = Connection(request_write, readable=False)
+        self.responses = Connection(response_read, writable=False)
+        self.started_at = time.time()
+        self.served = 0
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def call(self, request_id, op, payload, timeout):
+        """Send one request and wait for the matching response"""
+        self.requests.send((request_id, op, payload))
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.responses.poll(remaining):
+                raise ModelWorkerTimeout(f"Worker {self.index} timed out after {timeout}s on '{op}'")
+            response_id, ok, result = self.responses.recv()
+            # Drop late answers to requests that already timed out
+            if response_id == request_id:
+                break
+        self.served += 1
+        if not ok:
+            raise ModelWorkerError(result)
+        return result
+
+    def stop(self):
+        for conn in (self.requests, self.responses):
+            try:
+                conn.close()
+            except OSError:
+                pass
+        if self.is_alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+class ModelWorkerPool:
+    """
+    Pool of local worker processes that each hold the transformer pipelines.
+    Inference runs outside the web process, so it does not compete with request
+    handling for the GIL. Dead or unresponsive workers are restarted automatically.
+    """
+
+    def __init__(self, num_workers=None, ops=('sentiment', 'ner'), request_timeout=30,
+                 load_timeout=300, health_check_interval=15):
+        self.num_workers = num_workers or int(os.environ.get('MODEL_POOL_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+        self.ops = tuple(ops)
+        self.request_timeout = request_timeout
+        self.load_timeout = load_timeout
+        self.health_check_interval = health_check_interval
+
+        self._workers = [None] * self.num_workers
+        self._idle = queue.Queue()
+        self._request_ids = itertools.count(1)
+        self._restarts = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stop_event = threading.Event()
+
+        for index in range(self.num_workers):
+            self._start_worker(index)
+
+        self._monitor = threading.Thread(target=self._monitor_loop, name='model-pool-monitor', daemon=True)
+        self._monitor.start()
+        atexit.register(self.shutdown)
+        print(f"Started model worker pool with {self.num_workers} workers")
+
+    def _start_worker(self, index):
+        self._workers[index] = _Worker(index, self.ops)
+        self._idle.put(index)
+
+    def _restart_worker(self, index, reason):
+        logger.warning(f"Restarting model worker {index}: {reason}")
+        old = self._workers[index]
+        if old is not None:
+            old.stop()
+        with self._lock:
+            self._restarts += 1
+        if not self._closed:
+            self._start_worker(index)
+
+    def run(self, op, payload, timeout=None):
+        """
+        Run an operation ('sentiment' or 'ner') on the next idle worker.
+        The payload is a string or a list of strings, as accepted by the pipeline.
+        """
+        if self._closed:
+            raise ModelWorkerError("Model worker pool is shut down")
+
+        try:
+            index = self._idle.get(timeout=timeout or self.request_timeout)
+        except queue.Empty:
+            raise ModelWorkerError("No model worker became available in time")
+
+        worker = self._workers[index]
+        # The first request on a fresh worker also waits for the models to load
+        call_timeout = timeout or self.request_timeout
+        if worker.served == 0:
+            call_timeout = max(call_timeout, self.load_timeout)
+
+        try:
+            result = worker.call(next(self._request_ids), op, payload, call_timeout)
+        except (ModelWorkerTimeout, EOFError, OSError) as e:
+            reason = str(e) or f"Worker {index} died"
+            self._restart_worker(index, reason)
+            raise ModelWorkerError(reason)
+        except ModelWorkerError:
+            # The worker answered with an error but is still healthy
+            self._idle.put(index)
+            raise
+
+        self._idle.put(index)
+        return result
+
+    def health_check(self):
+        """Ping idle workers one at a time and restart the ones that are dead or unresponsive"""
+        for _ in range(self.num_workers):
+            try:
+                index = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            worker = self._workers[index]
+            if not worker.is_alive():
+                self._restart_worker(index, f"exited with code {worker.process.returncode}")
+                continue
+            try:
+                worker.call(next(self._request_ids), 'ping', None,
+                            self.load_timeout if worker.served == 0 else self.request_timeout)
+            except (ModelWorkerError, EOFError, OSError) as e:
+                self._restart_worker(index, e)
+                continue
+            self._idle.put(index)
+
+        return self.stats()
+
+    def stats(self):
+        """Return a snapshot of pool health"""
+        return {
+            "workers": self.num_workers,
+            "alive": sum(1 for worker in self._workers if worker is not None and worker.is_alive()),
+            "idle": self._idle.qsize(),
+            "restarts": self._restarts,
+            "served": sum(worker.served for worker in self._workers if worker is not None)
+        }
+
+    def _monitor_loop(self):
+        while not self._stop_event.wait(self.health_check_interval):
+            try:
+                self.health_check()
+            except Exception as e:
+                logger.error(f"Model pool health check failed: {e}")
+
+    def shutdown(self):
+        """Stop the monitor and every worker process"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        for worker in self._workers:
+            if worker is not None:
+                worker.stop()
+
+
+class ModelPoolServer:
+    """
+    Exposes a ModelWorkerPool on a local address, so every web worker process
+    shares one set of model workers instead of loading its own copy.
+    """
+
+    def __init__(self, pool, address, authkey):
+        self.pool = pool
+        self.listener = Listener(address, authkey=authkey)
+
+    def serve_forever(self):
+        print(f"Model pool listening on {self.listener.address}")
+        while True:
+            conn = self.listener.accept()
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _serve_client(self, conn):
+        with conn:
+            while True:
+                try:
+                    op, payload, timeout = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    if op == 'stats':
+                        conn.send((True, self.pool.stats()))
+                    else:
+                        conn.send((True, self.pool.run(op, payload, timeout)))
+                except Exception as e:
+                    conn.send((False, str(e)))
+
+
+class ModelPoolClient:
+    """Client for a shared pool served by ModelPoolServer; same interface as ModelWorkerPool.run"""
+
+    def __init__(self, address, authkey, request_timeout=30):
+        self.address = address
+        self.authkey = authkey
+        self.request_timeout = request_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, op, payload, timeout):
+        timeout = timeout or self.request_timeout
+        try:
+            conn = self._connection()
+            conn.send((op, payload, timeout))
+            if not conn.poll(timeout + 5):
+                raise ModelWorkerError(f"Shared model pool did not answer '{op}' in time")
+            ok, result = conn.recv()
+        except (EOFError, OSError) as e:
+            # Reconnect on the next call
+            self._local.conn = None
+            raise ModelWorkerError(f"Lost connection to shared model pool: {e}")
+        if not ok:
+            raise ModelWorkerError(result)
+        return result
+
+    def run(self, op, payload, timeout=None):
+        return self._request(op, payload, timeout)
+
+    def stats(self):
+        return self._request('stats', None, None)
+
+    def shutdown(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+
+
+def _parse_address(address):
+    """'host:port' becomes a TCP address; anything else is a Unix socket path"""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return (host, int(port))
+    return address
+
+
+def _authkey():
+    """
+    The shared secret for the pool server. The server unpickles what clients send, so
+    there is no default: a known key would let anyone who reaches the port run code.
+    """
+    authkey = os.environ.get('MODEL_POOL_AUTHKEY')
+    if not authkey:
+        raise ModelWorkerError("MODEL_POOL_AUTHKEY must be set to share a model pool (e.g. the output of `python -c 'import secrets; print(secrets.token_hex(32))'`)")
+    return authkey.encode()
+
+
+def create_model_pool():
+    """
+    Return the model pool for this process.
+    Connects to the shared pool at MODEL_POOL_ADDRESS when set, otherwise starts a local pool.
+    """
+    address = os.environ.get('MODEL_POOL_ADDRESS')
+    if address:
+        authkey = _authkey()
+        print(f"Using shared model pool at {address}")
+        return ModelPoolClient(_parse_address(address), authkey)
+    return ModelWorkerPool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model worker pool")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    worker_parser = subparsers.add_parser('worker', help="Run a single worker (started by the pool)")
+    worker_parser.add_argument('--read-fd', type=int, required=True)
+    worker_parser.add_argument('--write-fd', type=int, required=True)
+    worker_parser.add_argument('--ops', default='sentiment,ner')
+
+    serve_parser = subparsers.add_parser('serve', help="Serve a shared pool to web workers")
+    serve_parser.add_argument('--address', default=os.environ.get('MODEL_POOL_ADDRESS', '127.0.0.1:6010'))
+    serve_parser.add_argument('--workers', type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        _worker_main(args.read_fd, args.write_fd, [op for op in args.ops.split(',') if op])
+    else:
+        logging.basicConfig(level=logging.INFO)
+        authkey = _authkey()
+        pool = ModelWorkerPool(num_workers=args.workers)
+        ModelPoolServer(pool, _parse_address(args.address), authkey).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 
+import asyncio
 import random
 import requests
 from bs4 import BeautifulSoup
@@ -8,6 +9,9 @@ from typing import List, Dict, Any, Optional
 import json
 import os
 import re
+import threading
+import atexit
+from urllib.parse import quote_plus
 from fake_useragent import UserAgent
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -16,6 +20,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+from models.async_http import AsyncHttpClient
+from models.response_cache import PageResponse, normalize_url
+from models.search_orchestrator import SearchOrchestrator
+from models.single_flight import SingleFlight
+from models.webdriver_pool import WebDriverPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,8 +36,24 @@ class ProfileScraper:
     Uses a combination of techniques to get publicly available information.
     """
     
-    def __init__(self):
+    # Search endpoints, overridable per instance (e.g. to point at a local stand-in server)
+    google_search_url = 'https://www.google.com/search'
+    bing_search_url = 'https://www.bing.com/search'
+    linkedin_directory_url = 'https://www.linkedin.com/pub/dir'
+    
+    def __init__(self, use_selenium=True, orchestrator=None, response_cache=None):
         """Initialize the profile scraper with necessary configurations"""
+        # Optional cache of fetched pages (models.response_cache.ResponseCache)
+        self.response_cache = response_cache
+        # Concurrent identical searches and profile lookups wait on the one in flight
+        self.search_flights = SingleFlight()
+        self.detail_flights = SingleFlight()
+        # Search methods run concurrently; the first good enough result set is returned
+        self.orchestrator = orchestrator or SearchOrchestrator(
+            deadline=float(os.environ.get('PROFILE_SEARCH_DEADLINE', 8)),
+            quality_threshold=float(os.environ.get('PROFILE_SEARCH_QUALITY', 0.5)),
+            merge=os.environ.get('PROFILE_SEARCH_MERGE', 'false').lower() == 'true'
+        )
         try:
             self.user_agent = UserAgent().random
         except:
@@ -43,46 +68,39 @@ class ProfileScraper:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Async client for the *_async search methods: keep-alive pool with per-host caps
+        self.async_http = AsyncHttpClient(
+            headers=self.headers,
+            max_connections=int(os.environ.get('ASYNC_HTTP_MAX_CONNECTIONS', 100)),
+            per_host=int(os.environ.get('ASYNC_HTTP_PER_HOST', 8)),
+            retries=int(os.environ.get('ASYNC_HTTP_RETRIES', 2))
+        )
         
         # Initialize Selenium for pages that need JavaScript
+        self.driver_pool = None
         try:
             self.selenium_initialized = False
-            self.setup_selenium()
+            if use_selenium:
+                self.setup_selenium()
         except Exception as e:
             logger.error(f"Failed to initialize Selenium: {e}")
             logger.info("Will use fallback mock data instead")
             self.selenium_initialized = False
     
     def setup_selenium(self):
-        """Set up Selenium WebDriver for JavaScript-heavy sites"""
+        """Set up a pool of Selenium WebDrivers for JavaScript-heavy sites"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument(f"user-agent={self.headers['User-Agent']}")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option("useAutomationExtension", False)
-            
-            # Try using ChromeDriverManager, but with fallback
-            try:
-                self.driver = webdriver.Chrome(
-                    service=Service(ChromeDriverManager().install()),
-                    options=chrome_options
-                )
-            except Exception as e:
-                logger.error(f"Error with ChromeDriverManager: {e}")
-                # Fallback to not using Service
-                try:
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                except Exception as e:
-                    logger.error(f"Could not initialize Chrome: {e}")
-                    raise e
-                    
-            # Execute CDP Command to mask automation
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": self.headers['User-Agent']})
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver_pool = WebDriverPool(
+                self._create_driver,
+                size=int(os.environ.get('SELENIUM_POOL_SIZE', 2)),
+                max_pages=int(os.environ.get('SELENIUM_MAX_PAGES', 50)),
+                lease_timeout=float(os.environ.get('SELENIUM_LEASE_TIMEOUT', 30))
+            )
+            # Start one browser now so a missing Chrome is found at startup; the rest start on demand.
+            # The pool is only kept once that works.
+            driver_pool.warm(1)
+            self.driver_pool = driver_pool
+            atexit.register(self.close)
             
             self.selenium_initialized = True
             logger.info("Selenium WebDriver initialized successfully")
@@ -91,6 +109,37 @@ class ProfileScraper:
             self.selenium_initialized = False
             raise e
     
+    def _create_driver(self):
+        """Start a headless Chrome for the pool"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument(f"user-agent={self.headers['User-Agent']}")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option("useAutomationExtension", False)
+        
+        # Try using ChromeDriverManager, but with fallback
+        try:
+            driver = webdriver.Chrome(
+                service=Service(ChromeDriverManager().install()),
+                options=chrome_options
+            )
+        except Exception as e:
+            logger.error(f"Error with ChromeDriverManager: {e}")
+            # Fallback to not using Service
+            try:
+                driver = webdriver.Chrome(options=chrome_options)
+            except Exception as e:
+                logger.error(f"Could not initialize Chrome: {e}")
+                raise e
+                
+        # Execute CDP Command to mask automation
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": self.headers['User-Agent']})
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
+    
     def search_profiles(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Search for profiles matching the query
@@ -102,6 +151,13 @@ class ProfileScraper:
         Returns:
             List of profile search results
         """
+        # Identical searches running at the same time share one cascade
+        return self.search_flights.do(self._search_key(query, limit), lambda: self._search_profiles(query, limit))
+    
+    def _search_key(self, query: str, limit: int):
+        return (' '.join((query or '').lower().split()), limit)
+    
+    def _search_profiles(self, query: str, limit: int) -> List[Dict[str, Any]]:
         logger.info(f"Searching profiles for: {query}")
         
         # IMPORTANT: When all else fails, return mock data to ensure the UI always has results
@@ -120,42 +176,20 @@ class ProfileScraper:
                 if results:
                     return results[:limit]
             
-            # Method 2: Google People search
-            try:
-                results = self._search_google_people(query, limit)
-                if results:
-                    logger.info(f"Found {len(results)} results from Google People search")
-                    return results[:limit]
-            except Exception as e:
-                logger.error(f"Google People search failed: {e}")
-                
-            # Method 3: LinkedIn search via Google
-            try:
-                results = self._search_google_linkedin(query, limit)
-                if results:
-                    logger.info(f"Found {len(results)} results from Google LinkedIn search")
-                    return results[:limit]
-            except Exception as e:
-                logger.error(f"Google LinkedIn search failed: {e}")
-                
-            # Method 4: Direct LinkedIn search
+            # Methods 2-5: Google People, LinkedIn via Google, direct LinkedIn and generic
+            # search, run concurrently in that order of preference
+            methods = [
+                ("Google People", lambda cancel: self._search_google_people(query, limit, cancel)),
+                ("Google LinkedIn", lambda cancel: self._search_google_linkedin(query, limit, cancel)),
+            ]
             if self.selenium_initialized:
-                try:
-                    results = self._search_linkedin_direct(query, limit)
-                    if results:
-                        logger.info(f"Found {len(results)} results from direct LinkedIn search")
-                        return results[:limit]
-                except Exception as e:
-                    logger.error(f"Direct LinkedIn search failed: {e}")
+                methods.append(("Direct LinkedIn", lambda cancel: self._search_linkedin_direct(query, limit, cancel)))
+            methods.append(("Generic", lambda cancel: self._search_generic(query, limit, cancel)))
             
-            # Method 5: General web search for people
-            try:
-                results = self._search_generic(query, limit)
-                if results:
-                    logger.info(f"Found {len(results)} results from generic search")
-                    return results[:limit]
-            except Exception as e:
-                logger.error(f"Generic search failed: {e}")
+            results, source = self.orchestrator.run(methods, limit)
+            if results:
+                logger.info(f"Found {len(results)} results from {source} search")
+                return results[:limit]
             
             logger.warning(f"No results found for query: {query}, returning mock data")
             return self._generate_mock_profiles(query, limit)
@@ -165,6 +199,82 @@ class ProfileScraper:
             # Return mock data as a fallback
             return self._generate_mock_profiles(query, limit)
     
+    async def search_profiles_async(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        search_profiles for asyncio callers: the HTTP searches run on the async client, so
+        many searches can be in flight on one loop; direct LinkedIn search still runs in
+        a thread when Selenium is available. Shares in-flight searches with search_profiles.
+        """
+        return await self.search_flights.do_async(self._search_key(query, limit), lambda: self._search_profiles_async(query, limit))
+    
+    async def _search_profiles_async(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        if not query:
+            return self._generate_mock_profiles(query or "Unknown", limit)
+        if self._is_well_known_person(query):
+            results = self._get_well_known_person_data(query)
+            if results:
+                return results[:limit]
+        
+        try:
+            methods = [
+                ("Google People", lambda cancel: self._search_google_people_async(query, limit)),
+                ("Google LinkedIn", lambda cancel: self._search_google_linkedin_async(query, limit)),
+            ]
+            if self.selenium_initialized:
+                methods.append(("Direct LinkedIn", lambda cancel: asyncio.to_thread(self._search_linkedin_direct, query, limit, cancel)))
+            methods.append(("Generic", lambda cancel: self._search_generic_async(query, limit)))
+            
+            results, source = await self.orchestrator.run_async(methods, limit)
+            if results:
+                logger.info(f"Found {len(results)} results from {source} search")
+                return results[:limit]
+            
+            logger.warning(f"No results found for query: {query}, returning mock data")
+            return self._generate_mock_profiles(query, limit)
+        except Exception as e:
+            logger.error(f"Error searching profiles: {e}")
+            return self._generate_mock_profiles(query, limit)
+    
+    async def search_many_async(self, queries: List[str], limit: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once; requests to each host stay under the per-host cap"""
+        return list(await asyncio.gather(*(self.search_profiles_async(query, limit) for query in queries)))
+    
+    def _pause(self, seconds: float, cancel: Optional[threading.Event]) -> bool:
+        """Wait for a page to load; returns False if the search was cancelled meanwhile"""
+        if cancel is None:
+            time.sleep(seconds)
+            return True
+        return not cancel.wait(seconds)
+    
+    def _get_page(self, url: str, source: str, load, revalidate=None):
+        """
+        Fetch a page through the response cache when there is one. `load(validators)`
+        fetches it, sending the conditional request headers it is given where it can.
+        """
+        if self.response_cache is None:
+            return load({})
+        return self.response_cache.fetch(url, source, load, revalidate)
+    
+    def _browser_page(self, url: str, wait: float, cancel: Optional[threading.Event] = None) -> Optional[PageResponse]:
+        """Load a page in a pooled browser; None if the search was cancelled meanwhile"""
+        with self.driver_pool.lease() as driver:
+            if cancel is not None and cancel.is_set():
+                return None
+            driver.get(url)
+            if not self._pause(wait, cancel):  # Wait for page to load
+                return None
+            return PageResponse(200, driver.page_source, {})
+    
+    def _google_people_url(self, query: str) -> str:
+        return f"{self.google_search_url}?q={quote_plus(query + ' person')}&hl=en"
+    
+    def _google_linkedin_url(self, query: str) -> str:
+        # A Google search that targets LinkedIn profiles
+        return f"{self.google_search_url}?q={quote_plus(query + ' site:linkedin.com/in/')}"
+    
+    def _generic_search_url(self, query: str) -> str:
+        return f"{self.bing_search_url}?q={quote_plus(query + ' professional profile')}"
+    
     def _is_well_known_person(self, query: str) -> bool:
         """Check if the query is for a well-known person"""
         well_known_people = [
@@ -283,242 +393,258 @@ class ProfileScraper:
         return []
     
     # The rest of the methods remain the same
-    def _search_google_people(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _search_google_people(self, query: str, limit: int, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
         """Search for people using Google's Knowledge Graph"""
         try:
             # This search specifically targets Google's knowledge panel for people
-            search_term = f"{query} person"
-            url = f"https://www.google.com/search?q={search_term}&hl=en"
+            url = self._google_people_url(query)
             
             if self.selenium_initialized:
-                self.driver.get(url)
-                time.sleep(2)  # Wait for page to load
-                html = self.driver.page_source
-            else:
-                response = self.session.get(url, timeout=15)
-                if response.status_code != 200:
-                    logger.warning(f"Google people search failed with status: {response.status_code}")
+                response = self._get_page(url, 'google', lambda validators: self._browser_page(url, 2, cancel),
+                                          revalidate=lambda validators: self._browser_page(url, 2))
+                if response is None:
                     return []
-                html = response.text
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            results = []
-            
-            # Look for knowledge panel
-            knowledge_panel = soup.select('.kp-header')
-            if knowledge_panel:
-                logger.info("Found knowledge panel for person")
-                
-                # Extract name
-                name_element = soup.select_one('.qrShPb')
-                name = name_element.text.strip() if name_element else None
-                
-                if not name:
-                    name_element = soup.select_one('h2.qrShPb')
-                    name = name_element.text.strip() if name_element else None
-                
-                # Extract image
-                img_element = soup.select_one('.kp-header img')
-                profile_image = img_element.get('src') if img_element else None
-                
-                # Extract description/role
-                desc_element = soup.select_one('.wwUB2c')
-                role = desc_element.text.strip() if desc_element else None
-                
-                # Extract additional info
-                info_elements = soup.select('.Z1hOCe')
-                company = None
-                location = None
-                
-                for element in info_elements:
-                    text = element.text.strip()
-                    if 'Born:' in text or 'Age:' in text:
-                        continue  # Skip personal info
-                    if not company and ('at' in text.lower() or 'with' in text.lower()):
-                        company = text.split('at')[-1].strip() if 'at' in text.lower() else text.split('with')[-1].strip()
-                    if not location and any(loc in text.lower() for loc in ['lives in', 'based in', 'located in']):
-                        location = text.split('in')[-1].strip()
-                
-                # Get social links
-                social_links = {}
-                social_elements = soup.select('.YhemCb a')
-                for element in social_elements:
-                    href = element.get('href', '')
-                    if 'linkedin.com' in href:
-                        social_links['linkedin'] = href
-                    elif 'twitter.com' in href or 'x.com' in href:
-                        social_links['twitter'] = href
-                    elif 'facebook.com' in href:
-                        social_links['facebook'] = href
-                    elif 'instagram.com' in href:
-                        social_links['instagram'] = href
-                
-                if name:
-                    bio = f"{name} is a {role if role else 'professional'}"
-                    if company:
-                        bio += f" at {company}"
-                    if location:
-                        bio += f", based in {location}"
-                    
-                    results.append({
-                        "name": name,
-                        "company": company or "Unknown",
-                        "role": role or "Professional",
-                        "profileUrl": social_links.get('linkedin', f"https://www.google.com/search?q={name.replace(' ', '+')}"),
-                        "profileImage": profile_image or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
-                        "location": location or "Unknown Location",
-                        "bio": bio,
-                        "socialLinks": social_links
-                    })
-            
-            # If no knowledge panel, look for people profiles in search results
-            if not results:
-                logger.info("No knowledge panel found, checking search results")
-                people_cards = soup.select('.d0fCJc')
-                for card in people_cards[:limit]:
-                    try:
-                        name_element = card.select_one('h3')
-                        if not name_element:
-                            continue
-                            
-                        name = name_element.text.strip()
-                        
-                        # Extract description if available
-                        desc_element = card.select_one('.HiHjCd')
-                        description = desc_element.text.strip() if desc_element else ""
-                        
-                        # Extract image
-                        img_element = card.select_one('img')
-                        profile_image = img_element.get('src') if img_element else None
-                        
-                        # Parse role and company from description
-                        role = "Professional"
-                        company = "Unknown"
-                        
-                        if "at" in description:
-                            parts = description.split("at")
-                            if len(parts) >= 2:
-                                role = parts[0].strip()
-                                company = parts[1].strip()
-                        
-                        # Extract any URLs
-                        link_element = card.select_one('a')
-                        profile_url = link_element.get('href') if link_element else f"https://www.google.com/search?q={name.replace(' ', '+')}"
-                        
-                        results.append({
-                            "name": name,
-                            "company": company,
-                            "role": role,
-                            "profileUrl": profile_url,
-                            "profileImage": profile_image or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
-                            "bio": description or f"{name} is a {role} at {company}",
-                            "location": self._extract_location(description) or "Unknown Location"
-                        })
-                    except Exception as e:
-                        logger.error(f"Error parsing people card: {e}")
-                        continue
+            else:
+                response = self._get_page(url, 'google', lambda validators: self.session.get(url, headers=validators, timeout=15))
+            if response.status_code != 200:
+                logger.warning(f"Google people search failed with status: {response.status_code}")
+                return []
             
-            return results
+            return self._parse_google_people(response.text, limit)
         except Exception as e:
             logger.error(f"Error in Google people search: {e}")
             return []
     
-    def _search_google_linkedin(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Search for LinkedIn profiles using Google"""
-        try:
-            # Craft a Google search that targets LinkedIn profiles
-            search_term = f"{query} site:linkedin.com/in/"
-            url = f"https://www.google.com/search?q={search_term}"
+    def _parse_google_people(self, html: str, limit: int) -> List[Dict[str, Any]]:
+        """Read a knowledge panel or people cards from a Google results page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Look for knowledge panel
+        knowledge_panel = soup.select('.kp-header')
+        if knowledge_panel:
+            logger.info("Found knowledge panel for person")
             
-            response = self.session.get(url, timeout=15)
-            if response.status_code != 200:
-                logger.warning(f"Google search failed with status: {response.status_code}")
-                return []
+            # Extract name
+            name_element = soup.select_one('.qrShPb')
+            name = name_element.text.strip() if name_element else None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
+            if not name:
+                name_element = soup.select_one('h2.qrShPb')
+                name = name_element.text.strip() if name_element else None
+            
+            # Extract image
+            img_element = soup.select_one('.kp-header img')
+            profile_image = img_element.get('src') if img_element else None
+            
+            # Extract description/role
+            desc_element = soup.select_one('.wwUB2c')
+            role = desc_element.text.strip() if desc_element else None
             
-            # Extract search results (specific to Google's HTML structure)
-            result_divs = soup.select('div.g')
+            # Extract additional info
+            info_elements = soup.select('.Z1hOCe')
+            company = None
+            location = None
             
-            for div in result_divs[:limit]:
+            for element in info_elements:
+                text = element.text.strip()
+                if 'Born:' in text or 'Age:' in text:
+                    continue  # Skip personal info
+                if not company and ('at' in text.lower() or 'with' in text.lower()):
+                    company = text.split('at')[-1].strip() if 'at' in text.lower() else text.split('with')[-1].strip()
+                if not location and any(loc in text.lower() for loc in ['lives in', 'based in', 'located in']):
+                    location = text.split('in')[-1].strip()
+            
+            # Get social links
+            social_links = {}
+            social_elements = soup.select('.YhemCb a')
+            for element in social_elements:
+                href = element.get('href', '')
+                if 'linkedin.com' in href:
+                    social_links['linkedin'] = href
+                elif 'twitter.com' in href or 'x.com' in href:
+                    social_links['twitter'] = href
+                elif 'facebook.com' in href:
+                    social_links['facebook'] = href
+                elif 'instagram.com' in href:
+                    social_links['instagram'] = href
+            
+            if name:
+                bio = f"{name} is a {role if role else 'professional'}"
+                if company:
+                    bio += f" at {company}"
+                if location:
+                    bio += f", based in {location}"
+                
+                results.append({
+                    "name": name,
+                    "company": company or "Unknown",
+                    "role": role or "Professional",
+                    "profileUrl": social_links.get('linkedin', f"https://www.google.com/search?q={name.replace(' ', '+')}"),
+                    "profileImage": profile_image or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
+                    "location": location or "Unknown Location",
+                    "bio": bio,
+                    "socialLinks": social_links
+                })
+        
+        # If no knowledge panel, look for people profiles in search results
+        if not results:
+            logger.info("No knowledge panel found, checking search results")
+            people_cards = soup.select('.d0fCJc')
+            for card in people_cards[:limit]:
                 try:
-                    # Extract the link and title
-                    link_element = div.select_one('a')
-                    title_element = div.select_one('h3')
-                    
-                    if not link_element or not title_element:
-                        continue
-                    
-                    link = link_element.get('href', '')
-                    title = title_element.text.strip()
-                    
-                    # Extract LinkedIn URL
-                    linkedin_url = None
-                    if link.startswith('/url?q='):
-                        linkedin_url = link.split('/url?q=')[1].split('&')[0]
-                    else:
-                        linkedin_url = link
-                    
-                    # Skip if not a LinkedIn profile
-                    if 'linkedin.com/in/' not in linkedin_url:
+                    name_element = card.select_one('h3')
+                    if not name_element:
                         continue
+                        
+                    name = name_element.text.strip()
                     
-                    # Extract name from title - typically it's in the format "Name - Title - LinkedIn"
-                    name = title.split(' - ')[0] if ' - ' in title else title.split(' | ')[0]
+                    # Extract description if available
+                    desc_element = card.select_one('.HiHjCd')
+                    description = desc_element.text.strip() if desc_element else ""
                     
-                    # Try to extract role and company from description
-                    description_element = div.select_one('div.VwiC3b')
-                    description = description_element.text.strip() if description_element else ""
+                    # Extract image
+                    img_element = card.select_one('img')
+                    profile_image = img_element.get('src') if img_element else None
                     
-                    role = None
-                    company = None
+                    # Parse role and company from description
+                    role = "Professional"
+                    company = "Unknown"
                     
-                    # Look for patterns like "Role at Company" in the description
-                    if ' at ' in description:
-                        role_parts = description.split(' at ')
-                        if len(role_parts) >= 2:
-                            role = role_parts[0].strip()
-                            company = role_parts[1].split(' · ')[0].strip()
+                    if "at" in description:
+                        parts = description.split("at")
+                        if len(parts) >= 2:
+                            role = parts[0].strip()
+                            company = parts[1].strip()
                     
-                    # If role/company wasn't found, look for other patterns
-                    if not role or not company:
-                        if ' - ' in title:
-                            title_parts = title.split(' - ')
-                            if len(title_parts) >= 3:
-                                role = title_parts[1].strip()
-                                company = title_parts[2].replace('LinkedIn', '').strip()
+                    # Extract any URLs
+                    link_element = card.select_one('a')
+                    profile_url = link_element.get('href') if link_element else f"https://www.google.com/search?q={name.replace(' ', '+')}"
                     
                     results.append({
                         "name": name,
-                        "company": company or "Unknown",
-                        "role": role or "Unknown",
-                        "profileUrl": linkedin_url,
-                        "profileImage": f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
-                        "location": self._extract_location(description) or "Unknown Location",
-                        "bio": description or f"{name} is a {role or 'professional'} at {company or 'a company'}."
+                        "company": company,
+                        "role": role,
+                        "profileUrl": profile_url,
+                        "profileImage": profile_image or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
+                        "bio": description or f"{name} is a {role} at {company}",
+                        "location": self._extract_location(description) or "Unknown Location"
                     })
                 except Exception as e:
-                    logger.error(f"Error parsing Google search result: {e}")
+                    logger.error(f"Error parsing people card: {e}")
                     continue
+        
+        return results
+    
+    def _search_google_linkedin(self, query: str, limit: int, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """Search for LinkedIn profiles using Google"""
+        try:
+            url = self._google_linkedin_url(query)
+            response = self._get_page(url, 'google', lambda validators: self.session.get(url, headers=validators, timeout=15))
+            if response.status_code != 200:
+                logger.warning(f"Google search failed with status: {response.status_code}")
+                return []
             
-            return results
+            return self._parse_google_linkedin(response.text, limit)
         except Exception as e:
             logger.error(f"Error in Google LinkedIn search: {e}")
             return []
     
-    def _search_linkedin_direct(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _parse_google_linkedin(self, html: str, limit: int) -> List[Dict[str, Any]]:
+        """Read LinkedIn profile results from a Google results page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Extract search results (specific to Google's HTML structure)
+        result_divs = soup.select('div.g')
+        
+        for div in result_divs[:limit]:
+            try:
+                # Extract the link and title
+                link_element = div.select_one('a')
+                title_element = div.select_one('h3')
+                
+                if not link_element or not title_element:
+                    continue
+                
+                link = link_element.get('href', '')
+                title = title_element.text.strip()
+                
+                # Extract LinkedIn URL
+                linkedin_url = None
+                if link.startswith('/url?q='):
+                    linkedin_url = link.split('/url?q=')[1].split('&')[0]
+                else:
+                    linkedin_url = link
+                
+                # Skip if not a LinkedIn profile
+                if 'linkedin.com/in/' not in linkedin_url:
+                    continue
+                
+                # Extract name from title - typically it's in the format "Name - Title - LinkedIn"
+                name = title.split(' - ')[0] if ' - ' in title else title.split(' | ')[0]
+                
+                # Try to extract role and company from description
+                description_element = div.select_one('div.VwiC3b')
+                description = description_element.text.strip() if description_element else ""
+                
+                role = None
+                company = None
+                
+                # Look for patterns like "Role at Company" in the description
+                if ' at ' in description:
+                    role_parts = description.split(' at ')
+                    if len(role_parts) >= 2:
+                        role = role_parts[0].strip()
+                        company = role_parts[1].split(' · ')[0].strip()
+                
+                # If role/company wasn't found, look for other patterns
+                if not role or not company:
+                    if ' - ' in title:
+                        title_parts = title.split(' - ')
+                        if len(title_parts) >= 3:
+                            role = title_parts[1].strip()
+                            company = title_parts[2].replace('LinkedIn', '').strip()
+                
+                results.append({
+                    "name": name,
+                    "company": company or "Unknown",
+                    "role": role or "Unknown",
+                    "profileUrl": linkedin_url,
+                    "profileImage": f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
+                    "location": self._extract_location(description) or "Unknown Location",
+                    "bio": description or f"{name} is a {role or 'professional'} at {company or 'a company'}."
+                })
+            except Exception as e:
+                logger.error(f"Error parsing Google search result: {e}")
+                continue
+        
+        return results
+    
+    def _search_linkedin_direct(self, query: str, limit: int, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
         """Directly search LinkedIn using Selenium"""
         try:
             if not self.selenium_initialized:
                 return []
             
-            # Use LinkedIn's public search
-            self.driver.get(f"https://www.linkedin.com/pub/dir?firstName={query.split()[0] if ' ' in query else query}&lastName={query.split()[1] if ' ' in query else ''}&trk=people-guest_people-search-bar_search-submit")
-            time.sleep(3)  # Wait for page to load
-            
+            with self.driver_pool.lease() as driver:
+                if cancel is not None and cancel.is_set():
+                    return []
+                # Use LinkedIn's public search
+                driver.get(f"{self.linkedin_directory_url}?firstName={query.split()[0] if ' ' in query else query}&lastName={query.split()[1] if ' ' in query else ''}&trk=people-guest_people-search-bar_search-submit")
+                if not self._pause(3, cancel):  # Wait for page to load
+                    return []
+                
+                return self._parse_linkedin_directory(driver, limit)
+        except Exception as e:
+            logger.error(f"Error in direct LinkedIn search: {e}")
+            return []
+    
+    def _parse_linkedin_directory(self, driver, limit: int) -> List[Dict[str, Any]]:
+        """Read the result cards of a LinkedIn public directory page"""
+        try:
             results = []
-            profiles = self.driver.find_elements(By.CSS_SELECTOR, '.result-card')
+            profiles = driver.find_elements(By.CSS_SELECTOR, '.result-card')
             
             for profile in profiles[:limit]:
                 try:
@@ -566,86 +692,130 @@ class ProfileScraper:
             
             return results
         except Exception as e:
-            logger.error(f"Error in direct LinkedIn search: {e}")
+            logger.error(f"Error parsing LinkedIn directory: {e}")
             return []
     
-    def _search_generic(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _search_generic(self, query: str, limit: int, cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
         """Generic web search for people"""
         try:
-            url = f"https://www.bing.com/search?q={query}+professional+profile"
-            
-            response = self.session.get(url, timeout=15)
+            url = self._generic_search_url(query)
+            response = self._get_page(url, 'bing', lambda validators: self.session.get(url, headers=validators, timeout=15))
             if response.status_code != 200:
                 logger.warning(f"Generic search failed with status: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Extract search results
-            result_elements = soup.select('li.b_algo')
-            
-            for element in result_elements[:limit]:
-                try:
-                    # Extract title and link
-                    title_element = element.select_one('h2 a')
-                    snippet_element = element.select_one('div.b_caption p')
-                    
-                    if not title_element or not snippet_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    link = title_element.get('href', '')
-                    snippet = snippet_element.text.strip()
-                    
-                    # Skip if it doesn't look like a person profile
-                    name_patterns = [
-                        r'^([A-Z][a-z]+ [A-Z][a-z]+)', 
-                        r'([A-Z][a-z]+ [A-Z][a-z]+) - ',
-                        r'([A-Z][a-z]+ [A-Z][a-z]+) \|'
-                    ]
-                    
-                    name = None
-                    for pattern in name_patterns:
-                        match = re.search(pattern, title)
-                        if match:
-                            name = match.group(1)
-                            break
-                    
-                    if not name:
-                        continue
-                    
-                    # Extract company and role
-                    company = "Unknown"
-                    role = "Unknown"
-                    
-                    role_company_patterns = [
-                        r'([^|]+) at ([^|]+)',
-                        r'([^|]+) of ([^|]+)',
-                        r'([A-Za-z ]+), ([A-Za-z ]+)'
-                    ]
-                    
-                    for pattern in role_company_patterns:
-                        match = re.search(pattern, snippet, re.IGNORECASE)
-                        if match:
-                            role = match.group(1).strip()
-                            company = match.group(2).strip()
-                            break
-                    
-                    results.append({
-                        "name": name,
-                        "company": company,
-                        "role": role,
-                        "profileUrl": link,
-                        "profileImage": f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
-                        "bio": snippet,
-                        "location": self._extract_location(snippet) or "Unknown Location"
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing generic search result: {e}")
+            return self._parse_generic(response.text, limit)
+        except Exception as e:
+            logger.error(f"Error in generic search: {e}")
+            return []
+    
+    def _parse_generic(self, html: str, limit: int) -> List[Dict[str, Any]]:
+        """Read people from a Bing results page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Extract search results
+        result_elements = soup.select('li.b_algo')
+        
+        for element in result_elements[:limit]:
+            try:
+                # Extract title and link
+                title_element = element.select_one('h2 a')
+                snippet_element = element.select_one('div.b_caption p')
+                
+                if not title_element or not snippet_element:
                     continue
-            
-            return results
+                
+                title = title_element.text.strip()
+                link = title_element.get('href', '')
+                snippet = snippet_element.text.strip()
+                
+                # Skip if it doesn't look like a person profile
+                name_patterns = [
+                    r'^([A-Z][a-z]+ [A-Z][a-z]+)', 
+                    r'([A-Z][a-z]+ [A-Z][a-z]+) - ',
+                    r'([A-Z][a-z]+ [A-Z][a-z]+) \|'
+                ]
+                
+                name = None
+                for pattern in name_patterns:
+                    match = re.search(pattern, title)
+                    if match:
+                        name = match.group(1)
+                        break
+                
+                if not name:
+                    continue
+                
+                # Extract company and role
+                company = "Unknown"
+                role = "Unknown"
+                
+                role_company_patterns = [
+                    r'([^|]+) at ([^|]+)',
+                    r'([^|]+) of ([^|]+)',
+                    r'([A-Za-z ]+), ([A-Za-z ]+)'
+                ]
+                
+                for pattern in role_company_patterns:
+                    match = re.search(pattern, snippet, re.IGNORECASE)
+                    if match:
+                        role = match.group(1).strip()
+                        company = match.group(2).strip()
+                        break
+                
+                results.append({
+                    "name": name,
+                    "company": company,
+                    "role": role,
+                    "profileUrl": link,
+                    "profileImage": f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
+                    "bio": snippet,
+                    "location": self._extract_location(snippet) or "Unknown Location"
+                })
+            except Exception as e:
+                logger.error(f"Error parsing generic search result: {e}")
+                continue
+        
+        return results
+    
+    async def _fetch_async(self, url: str, source: str, label: str) -> Optional[str]:
+        """GET a page with the async client (or the cache); None (logged) unless it returns 200"""
+        load = lambda validators: self.async_http.get(url, headers=validators)
+        if self.response_cache is not None:
+            revalidate = lambda validators: self.session.get(url, headers=validators, timeout=15)
+            response = await self.response_cache.fetch_async(url, source, load, revalidate)
+        else:
+            response = await load({})
+        if response.status_code != 200:
+            logger.warning(f"{label} failed with status: {response.status_code}")
+            return None
+        return response.text
+    
+    async def _search_google_people_async(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Async variant of _search_google_people; always fetches over HTTP, without a browser"""
+        try:
+            html = await self._fetch_async(self._google_people_url(query), 'google', "Google people search")
+            # Parsing is CPU-bound, so it runs in a thread to keep the loop serving other fetches
+            return await asyncio.to_thread(self._parse_google_people, html, limit) if html is not None else []
+        except Exception as e:
+            logger.error(f"Error in Google people search: {e}")
+            return []
+    
+    async def _search_google_linkedin_async(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Async variant of _search_google_linkedin"""
+        try:
+            html = await self._fetch_async(self._google_linkedin_url(query), 'google', "Google search")
+            return await asyncio.to_thread(self._parse_google_linkedin, html, limit) if html is not None else []
+        except Exception as e:
+            logger.error(f"Error in Google LinkedIn search: {e}")
+            return []
+    
+    async def _search_generic_async(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Async variant of _search_generic"""
+        try:
+            html = await self._fetch_async(self._generic_search_url(query), 'bing', "Generic search")
+            return await asyncio.to_thread(self._parse_generic, html, limit) if html is not None else []
         except Exception as e:
             logger.error(f"Error in generic search: {e}")
             return []
@@ -676,6 +846,9 @@ class ProfileScraper:
         Returns:
             Dictionary of profile details
         """
+        return self.detail_flights.do(normalize_url(profile_url), lambda: self._get_profile_details(profile_url))
+    
+    def _get_profile_details(self, profile_url: str) -> Dict[str, Any]:
         logger.info(f"Fetching profile details for: {profile_url}")
         
         try:
@@ -723,10 +896,10 @@ class ProfileScraper:
             
             # LinkedIn requires JS and login, so we'll extract what we can from Google
             name = self._extract_name_from_url(profile_url)
-            google_url = f"https://www.google.com/search?q={name} linkedin"
+            google_url = f"{self.google_search_url}?q={quote_plus(name + ' linkedin')}"
             
-            self.driver.get(google_url)
-            time.sleep(2)
+            response = self._get_page(google_url, 'linkedin', lambda validators: self._browser_page(google_url, 2))
+            soup = BeautifulSoup(response.text, 'html.parser')
             
             # Extract what we can from Google snippet about the person
             person_data = {
@@ -739,20 +912,20 @@ class ProfileScraper:
             }
             
             # Look for knowledge panel
-            knowledge_panel = self.driver.find_elements(By.CSS_SELECTOR, 'div.kp-header')
+            knowledge_panel = soup.select('div.kp-header')
             if knowledge_panel:
                 # Extract image if available
-                img_elements = knowledge_panel[0].find_elements(By.TAG_NAME, 'img')
-                if img_elements:
-                    person_data["profileImage"] = img_elements[0].get_attribute('src')
+                img_elements = knowledge_panel[0].select('img')
+                if img_elements and img_elements[0].get('src'):
+                    person_data["profileImage"] = img_elements[0].get('src')
                 
                 # Extract title/role
-                title_elements = knowledge_panel[0].find_elements(By.CSS_SELECTOR, 'div.wwUB2c')
+                title_elements = knowledge_panel[0].select('div.wwUB2c')
                 if title_elements:
                     person_data["role"] = title_elements[0].text.strip()
             
             # Look for description in search results
-            description_elements = self.driver.find_elements(By.CSS_SELECTOR, 'div.VwiC3b')
+            description_elements = soup.select('div.VwiC3b')
             for element in description_elements:
                 text = element.text
                 
@@ -986,11 +1159,19 @@ class ProfileScraper:
             })
         
         return results
-
+    
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """How many searches and profile lookups were shared with one already running"""
+        return {"search": self.search_flights.stats(), "details": self.detail_flights.stats()}
+    
+    def close(self):
+        """Quit the pooled browsers"""
+        if getattr(self, 'driver_pool', None) is not None:
+            self.driver_pool.close()
+    
     def __del__(self):
         """Clean up resources"""
-        if hasattr(self, 'driver') and self.selenium_initialized:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        try:
+            self.close()
+        except:
+            pass
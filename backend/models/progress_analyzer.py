@@ -1,10 +1,14 @@
 
-import random
-from datetime import datetime, timedelta
 import os
+from data.dates import from_epoch_day, today_epoch_day
+from data.task_stats import TaskStats, TASK_STATUSES
+
+STATUS_LABELS = {'pending': 'pending', 'in-progress': 'in progress', 'completed': 'completed', 'overdue': 'marked overdue'}
 
 class ProgressAnalyzer:
-    def __init__(self):
+    def __init__(self, task_stats=None):
+        # Callable(person ID) -> running TaskStats; without it statistics are computed per report
+        self.task_stats = task_stats
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
         
         if self.use_pretrained_model:
@@ -30,44 +34,46 @@ class ProgressAnalyzer:
         return self._simulate_progress_report(person)
     
     def _simulate_progress_report(self, person):
-        """Simulate progress report generation for development"""
-        # Generate overall completion percentage
-        completion = random.randint(0, 100)
+        """Build a progress report from the person's running task statistics"""
+        stats = self.task_stats(person['id']) if self.task_stats else None
+        if stats is None:
+            stats = TaskStats(person.get('tasks', []))
+        today = today_epoch_day()
+        counts = stats.to_dict(today)
         
-        # Determine if project is on track (with bias toward being on track)
-        on_track = random.random() > 0.3  # 70% chance of being on track
+        completion = counts['completion']
+        overdue = counts['overdue']
+        # On track while no open task is overdue
+        on_track = overdue == 0
         
-        # Generate estimated completion date
-        today = datetime.now()
-        days_to_add = random.randint(7, 67)  # 7-67 days
-        eta = today + timedelta(days=days_to_add)
+        # Estimated completion: the last open deadline, or today if everything is done
+        latest_due = stats.open_due_days[-1] if stats.open_due_days else None
+        eta = from_epoch_day(max(latest_due, today)) if latest_due is not None else from_epoch_day(today)
         
-        # Generate summary based on person's tasks
-        summary = ""
-        if person['tasks'] and len(person['tasks']) > 0:
-            summary = f"Tasks assigned to {person['name']}:\n"
-            for task in person['tasks']:
-                status_icon = "✅" if task['status'] == 'completed' else "⏳" 
-                summary += f"- {task['title']}: {task['status'] == 'completed' ? 'Completed ' + status_icon : 'In progress ' + status_icon}\n"
+        # Summarize the task counts
+        if counts['total']:
+            status_parts = [
+                f"{counts['byStatus'][status]} {STATUS_LABELS.get(status, status)}"
+                for status in TASK_STATUSES if counts['byStatus'].get(status)
+            ]
+            summary = f"{counts['total']} task{'s' if counts['total'] != 1 else ''} with {person['name']}: {', '.join(status_parts)}."
+            if overdue:
+                summary += f"\n⚠️ {overdue} open task{'s are' if overdue != 1 else ' is'} overdue."
+            if counts['earliestDue']:
+                summary += f"\nNext deadline: {from_epoch_day(stats.open_due_days[0]).strftime('%b %d, %Y')}."
         else:
             summary = f"No specific tasks assigned to {person['name']} yet."
         
         # Generate recommendation based on progress
-        recommendation = ""
-        if on_track:
-            recommendations = [
-                f"Recommendation: Continue current pace. Project is on track for successful completion.",
-                f"Recommendation: Schedule a mid-point review on {(today + timedelta(days=days_to_add//2)).strftime('%b %d')} to ensure continued progress.",
-                f"Recommendation: Consider allocating additional resources to expedite completion ahead of schedule."
-            ]
-            recommendation = random.choice(recommendations)
+        if not counts['open']:
+            recommendation = "Recommendation: All tasks are complete. Agree on next steps to keep momentum."
+        elif not on_track:
+            recommendation = f"Recommendation: Schedule a realignment meeting to address the {overdue} overdue task{'s' if overdue != 1 else ''} and recalibrate expectations."
+        elif completion >= 50:
+            recommendation = "Recommendation: Continue current pace. Project is on track for successful completion."
         else:
-            recommendations = [
-                f"Recommendation: Consider adjusting timeline or resources. Current progress is behind optimal schedule.",
-                f"Recommendation: Schedule a realignment meeting to address current bottlenecks and recalibrate expectations.",
-                f"Recommendation: Break down remaining work into smaller deliverables to increase momentum."
-            ]
-            recommendation = random.choice(recommendations)
+            midpoint = from_epoch_day(today + max(1, (eta.toordinal() - from_epoch_day(today).toordinal()) // 2))
+            recommendation = f"Recommendation: Schedule a mid-point review on {midpoint.strftime('%b %d')} to ensure continued progress."
         
         return {
             "summary": summary,
@@ -75,5 +81,6 @@ class ProgressAnalyzer:
             "onTrack": on_track,
             "eta": eta.strftime('%b %d, %Y'),
             "recommendation": recommendation,
-            "sentiment": "positive" if on_track else "negative"
+            "sentiment": "positive" if on_track else "negative",
+            "tasks": counts
         }
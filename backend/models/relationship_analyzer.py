@@ -1,13 +1,16 @@
 
-import datetime
 import random
 import math
-from dateutil.parser import parse as parse_date
 import os
+from data.dates import to_epoch_day, today_epoch_day
 
 class RelationshipAnalyzer:
-    def __init__(self):
+    def __init__(self, sentiment_trends=None, contact_graph=None):
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
+        # Optional data.sentiment_trend.SentimentTrendIndex used to describe meeting tone over time
+        self.sentiment_trends = sentiment_trends
+        # Optional data.contact_graph.ContactGraph used to pick real contacts for introductions
+        self.contact_graph = contact_graph
         
         if self.use_pretrained_model:
             # Load trained model if available
@@ -34,8 +37,11 @@ class RelationshipAnalyzer:
     
     def _simulate_relationship_insights(self, person):
         """Simulate relationship insights for development"""
-        # Calculate relationship length from lastContactedDate
-        relationship_length = self._calculate_relationship_length(person['lastContactedDate'])
+        # Calculate relationship length from the pre-parsed lastContactedDate
+        last_contacted_day = person.get('lastContactedDay')
+        if last_contacted_day is None:
+            last_contacted_day = to_epoch_day(person.get('lastContactedDate'))
+        relationship_length = self._calculate_relationship_length(last_contacted_day)
         
         # Default values
         message = ""
@@ -92,7 +98,12 @@ class RelationshipAnalyzer:
             sentiment = 'neutral'
             confidence = 78
         
-        return {
+        # Replace the generic contact suggestion with a real one from the contact graph
+        recommended_contact_details = self._recommend_contact(person)
+        if recommended_contact_details:
+            recommended_contact = recommended_contact_details['name']
+        
+        insights = {
             "message": message,
             "recommendedMeetingType": recommended_meeting_type,
             "recommendedContent": recommended_content,
@@ -101,16 +112,40 @@ class RelationshipAnalyzer:
             "sentiment": sentiment,
             "confidence": confidence
         }
+        
+        if recommended_contact_details:
+            insights["recommendedContactDetails"] = recommended_contact_details
+        
+        # Describe how the tone of meetings has evolved, if we track it
+        trend = self.sentiment_trends.get_trend(person['id'], months=6) if self.sentiment_trends else None
+        if trend and trend['meetingCount'] > 0:
+            insights["message"] += f"\n\nMeeting tone: {trend['currentTone']} recently, {trend['direction']} across {trend['meetingCount']} meeting{'s' if trend['meetingCount'] != 1 else ''}."
+            insights["sentimentTrend"] = trend
+        
+        return insights
+    
+    def _recommend_contact(self, person):
+        """
+        Pick a real contact to involve: for inactive relationships, the strongest mutual
+        connection to reconnect through; otherwise the best bridge to new contacts.
+        """
+        if not self.contact_graph:
+            return None
+        
+        if person['relationshipStatus'] == 'Inactive':
+            candidates = self.contact_graph.find_introducers(person['id'], max_depth=2, limit=1)
+        else:
+            candidates = self.contact_graph.best_bridges(person['id'], limit=1)
+        return candidates[0] if candidates else None
     
-    def _calculate_relationship_length(self, last_contacted_date):
-        """Calculate the length of a relationship based on the last contacted date"""
+    def _calculate_relationship_length(self, last_contacted_day):
+        """Calculate the length of a relationship based on the last contacted date (as an epoch day)"""
+        if last_contacted_day is None:
+            return "unknown duration"
+        
         try:
-            # Parse the date string to a datetime object
-            last_contact = parse_date(last_contacted_date)
-            today = datetime.datetime.now()
-            
             # Calculate difference in days
-            diff_days = (today - last_contact).days
+            diff_days = today_epoch_day() - last_contacted_day
             
             if diff_days < 30:
                 return f"{diff_days} days"
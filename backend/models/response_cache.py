@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from data.disk_cache import content_key
+
+logger = logging.getLogger(__name__)
+
+# Seconds a page stays fresh, by source
+SOURCE_TTLS = {'google': 6 * 3600, 'bing': 6 * 3600, 'linkedin': 24 * 3600}
+DEFAULT_TTL = 3600
+# After its TTL a page is still served for this long while it is refetched in the background
+STALE_TTL = 7 * 24 * 3600
+# Query parameters that don't change the page, and search parameters compared case-insensitively
+TRACKING_PARAMS = ('utm_', 'trk', 'fbclid', 'gclid')
+TEXT_PARAMS = ('q', 'firstname', 'lastname')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+PageResponse = namedtuple('PageResponse', ('status_code', 'text', 'headers'))
+
+
+def normalize_url(url):
+    """
+    Canonical form of a URL for cache keys: lowercase scheme and host without `www.` or a
+    default port, no trailing slash or fragment, tracking parameters dropped, the rest
+    sorted, and search terms lowercased with single spaces.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+    host = (parts.hostname or '').lower()
+    host = host[4:] if host.startswith('www.') else host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if name.lower().startswith(TRACKING_PARAMS):
+            continue
+        if name.lower() in TEXT_PARAMS:
+            value = ' '.join(value.lower().split())
+        query.append((name, value))
+    return urlunsplit((scheme, host, parts.path.rstrip('/') or '/', urlencode(sorted(query)), ''))
+
+
+class ResponseCache:
+    """
+    HTTP response cache for scraped pages on top of a DiskCache (SQLite with an in-memory
+    LRU front), keyed by normalized URL. A page is fresh for its source's TTL; after that
+    it is served stale for up to `stale_ttl` while one background request revalidates it
+    (conditionally, with If-None-Match / If-Modified-Since when the page had an ETag or
+    Last-Modified), and older pages are fetched before answering. Only 200 responses are
+    stored.
+
+    Callers pass a `load(validators)` function that fetches the URL with the given extra
+    headers and returns a response with status_code, text and headers (or None if it was
+    cancelled); pages loaded in a browser can ignore the validators.
+    """
+
+    def __init__(self, cache, ttls=None, stale_ttl=STALE_TTL, revalidate_workers=2):
+        self.cache = cache
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self.stale_ttl = stale_ttl
+        self._executor = ThreadPoolExecutor(max_workers=revalidate_workers, thread_name_prefix='http-revalidate')
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self._stats = {'fresh': 0, 'stale': 0, 'misses': 0, 'notModified': 0, 'refreshed': 0, 'errors': 0}
+
+    def _count(self, outcome):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def _lookup(self, url, source):
+        """(key, entry, state) where state is 'fresh', 'stale' or 'miss'"""
+        key = content_key('http', normalize_url(url))
+        entry = self.cache.get(key)
+        if entry is None:
+            return key, None, 'miss'
+        age = time.time() - entry['fetched']
+        ttl = self.ttls.get(source, DEFAULT_TTL)
+        if age < ttl:
+            return key, entry, 'fresh'
+        return key, entry, 'stale' if age < ttl + self.stale_ttl else 'miss'
+
+    @staticmethod
+    def _validators(entry):
+        validators = {}
+        if entry is not None and entry.get('etag'):
+            validators['If-None-Match'] = entry['etag']
+        if entry is not None and entry.get('lastModified'):
+            validators['If-Modified-Since'] = entry['lastModified']
+        return validators
+
+    @staticmethod
+    def _response(entry):
+        return PageResponse(200, entry['text'], {})
+
+    def _store(self, key, entry, response):
+        """Record a fetched response; returns what the caller should see"""
+        if response is None:
+            return None
+        if response.status_code == 304 and entry is not None:
+            entry = dict(entry, fetched=time.time())
+            self.cache.set(key, entry)
+            self._count('notModified')
+            return self._response(entry)
+        if response.status_code != 200:
+            self._count('errors')
+            return response
+        if 'no-store' not in (response.headers.get('Cache-Control') or ''):
+            self.cache.set(key, {
+                'text': response.text,
+                'etag': response.headers.get('ETag'),
+                'lastModified': response.headers.get('Last-Modified'),
+                'fetched': time.time()
+            })
+        self._count('refreshed')
+        return response
+
+    def _claim(self, key):
+        """True if no revalidation of `key` is running yet (and one now is)"""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def _revalidate(self, key, entry, load):
+        try:
+            self._store(key, entry, load(self._validators(entry)))
+        except Exception as e:
+            logger.warning(f"Revalidating a cached page failed: {e}")
+        finally:
+            with self._lock:
+                self._revalidating.discard(key)
+
+    def fetch(self, url, source, load, revalidate=None):
+        """
+        The page at `url`, from the cache when fresh or stale enough, else from `load`.
+        `revalidate` replaces `load` for background refreshes (e.g. one not tied to a
+        request's cancellation).
+        """
+        key, entry, state = self._lookup(url, source)
+        if state == 'fresh':
+            self._count('fresh')
+            return self._response(entry)
+        if state == 'stale':
+            self._count('stale')
+            if self._claim(key):
+                self._executor.submit(self._revalidate, key, entry, revalidate or load)
+            return self._response(entry)
+        self._count('misses')
+        return self._store(key, entry, load(self._validators(entry)))
+
+    async def fetch_async(self, url, source, load, revalidate):
+        """
+        `fetch` for an async `load`. Background refreshes use the blocking `revalidate` on
+        the revalidation threads: the calling loop may close (and its client with it) as
+        soon as the request is answered, which would cancel a refresh running on it.
+        """
+        key, entry, state = self._lookup(url, source)
+        if state == 'fresh':
+            self._count('fresh')
+            return self._response(entry)
+        if state == 'stale':
+            self._count('stale')
+            if self._claim(key):
+                self._executor.submit(self._revalidate, key, entry, revalidate)
+            return self._response(entry)
+        self._count('misses')
+        return self._store(key, entry, await load(self._validators(entry)))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        return dict(stats, revalidating=len(self._revalidating), storage=self.cache.stats())
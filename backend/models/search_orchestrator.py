@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Placeholder values the scrapers use when a field could not be found
+UNKNOWN_VALUES = {'', 'unknown', 'unknown location', 'unknown company', 'unknown role', 'professional'}
+QUALITY_FIELDS = ('company', 'role', 'location', 'bio')
+
+
+def profile_quality(profile: Dict[str, Any]) -> float:
+    """Share of the descriptive fields of a search result that hold real values (0-1)"""
+    known = sum(1 for field in QUALITY_FIELDS if str(profile.get(field) or '').strip().lower() not in UNKNOWN_VALUES)
+    return known / len(QUALITY_FIELDS)
+
+
+def results_quality(results: List[Dict[str, Any]]) -> float:
+    """Quality of a result set: the quality of its best result"""
+    return max((profile_quality(profile) for profile in results), default=0.0)
+
+
+def _dedupe_key(profile: Dict[str, Any]) -> str:
+    url = (profile.get('profileUrl') or '').lower().rstrip('/').split('?')[0]
+    for prefix in ('https://', 'http://', 'www.'):
+        url = url[len(prefix):] if url.startswith(prefix) else url
+    return url if '/in/' in url else (profile.get('name') or '').strip().lower()
+
+
+def merge_results(result_sets: Sequence[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """Merge result sets (in priority order), keeping the best version of each profile"""
+    merged = {}
+    order = []
+    for results in result_sets:
+        for profile in results:
+            key = _dedupe_key(profile)
+            if key not in merged:
+                order.append(key)
+                merged[key] = profile
+            elif profile_quality(profile) > profile_quality(merged[key]):
+                merged[key] = profile
+    ranked = sorted(order, key=lambda key: (-profile_quality(merged[key]), order.index(key)))
+    return [merged[key] for key in ranked[:limit]]
+
+
+class SearchOrchestrator:
+    """
+    Runs several search methods concurrently under one deadline. The first result set
+    whose quality reaches the threshold wins (the earlier method when several finish at
+    once); the others are told to stop through a cancellation event and their pending
+    work is dropped. If no method reaches the threshold by the deadline or once all have
+    finished, the best partial results are returned, or all of them merged and deduplicated.
+    """
+
+    def __init__(self, max_workers: int = 8, deadline: float = 8.0, quality_threshold: float = 0.5, merge: bool = False):
+        self.deadline = deadline
+        self.quality_threshold = quality_threshold
+        self.merge = merge
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='profile-search')
+        self._lock = threading.Lock()
+        self._stats = {'searches': 0, 'earlyReturns': 0, 'deadlines': 0, 'cancelled': 0}
+
+    def run(self, methods: Sequence[Tuple[str, Callable[[threading.Event], List[Dict[str, Any]]]]],
+            limit: int, deadline: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Run `methods` ((name, callable(cancel_event)) in priority order) concurrently.
+        Returns the chosen results and the name of the method that produced them
+        ('merged' when merged, None when nothing was found).
+        """
+        cancel = threading.Event()
+        started = time.monotonic()
+        ends_at = started + (deadline if deadline is not None else self.deadline)
+        futures = {self._executor.submit(method, cancel): (priority, name) for priority, (name, method) in enumerate(methods)}
+        finished = {}
+        winner = None
+
+        pending = set(futures)
+        while pending:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._collect(finished, futures[future], future, started)
+            winner = self._winner(finished)
+            if winner is not None:
+                break
+
+        cancel.set()
+        for future in pending:
+            future.cancel()
+        self._record(pending, winner)
+        return self._choose(finished, winner, limit)
+
+    async def run_async(self, methods: Sequence[Tuple[str, Callable[[threading.Event], Awaitable[List[Dict[str, Any]]]]]],
+                        limit: int, deadline: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        `run` for coroutines: `methods` are (name, callable(cancel_event) returning an awaitable),
+        run as tasks on the running loop. Losing tasks are cancelled and the event is set
+        for methods that run in a thread.
+        """
+        cancel = threading.Event()
+        started = time.monotonic()
+        ends_at = started + (deadline if deadline is not None else self.deadline)
+        tasks = {asyncio.ensure_future(method(cancel)): (priority, name) for priority, (name, method) in enumerate(methods)}
+        finished = {}
+        winner = None
+
+        pending = set(tasks)
+        while pending:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                self._collect(finished, tasks[task], task, started)
+            winner = self._winner(finished)
+            if winner is not None:
+                break
+
+        cancel.set()
+        for task in pending:
+            task.cancel()
+        self._record(pending, winner)
+        return self._choose(finished, winner, limit)
+
+    def _collect(self, finished, method, future, started):
+        """Store the results of a finished future or task under its priority"""
+        priority, name = method
+        try:
+            results = future.result() or []
+        except Exception as e:
+            logger.error(f"{name} search failed: {e}")
+            results = []
+        finished[priority] = (name, results)
+        logger.info(f"{name} search returned {len(results)} results in {time.monotonic() - started:.2f}s")
+
+    def _record(self, pending, winner):
+        with self._lock:
+            self._stats['searches'] += 1
+            self._stats['cancelled'] += len(pending)
+            if winner is not None and pending:
+                self._stats['earlyReturns'] += 1
+            elif pending:
+                self._stats['deadlines'] += 1
+
+    def _choose(self, finished, winner, limit):
+        if winner is not None:
+            name, results = finished[winner]
+            return results[:limit], name
+        if not any(results for _, results in finished.values()):
+            return [], None
+        if self.merge:
+            return merge_results([finished[priority][1] for priority in sorted(finished)], limit), 'merged'
+        # Best partial result set, earlier methods first among equals
+        priority = max(sorted(finished), key=lambda priority: (results_quality(finished[priority][1]), -priority))
+        name, results = finished[priority]
+        return results[:limit], name
+
+    def _winner(self, finished):
+        """The earliest finished method whose results reach the quality threshold"""
+        for priority in sorted(finished):
+            _, results = finished[priority]
+            if results and results_quality(results) >= self.quality_threshold:
+                return priority
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,29 @@
 
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
-import random
 import os
 import numpy as np
 from transformers import pipeline
+from data.disk_cache import content_key
+from models.lexicon_scorer import LexiconScorer
+from models.model_worker_pool import PIPELINE_MODELS
+
+# Identifiers of the scoring paths, used to key cached results
+TRANSFORMER_MODEL_ID = 'transformers:{}@{}'.format(*PIPELINE_MODELS['sentiment'])
+VADER_MODEL_ID = 'vader'
+SIMULATION_MODEL_ID = 'simulation:lexicon'
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, model_pool=None, cache=None):
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
+        # Shared worker pool that runs the transformer out of process (see model_worker_pool)
+        self.model_pool = model_pool
+        self.transformer_model = None
+        # Optional persistent cache (data.disk_cache.DiskCache) keyed by hash of (model id, text)
+        self.cache = cache
+        # Default scoring path when models are disabled
+        self.lexicon = LexiconScorer.from_environment()
+        self.simulation_model_id = f"{SIMULATION_MODEL_ID}:{self.lexicon.identity}"
         
         if self.use_pretrained_model:
             # Download NLTK data if we're using the real model
@@ -19,51 +34,130 @@ class SentimentAnalyzer:
             
             self.sia = SentimentIntensityAnalyzer()
             
-            # Alternatively use Hugging Face transformers
-            try:
-                self.transformer_model = pipeline("sentiment-analysis")
-            except:
-                print("Warning: Failed to load transformer model, falling back to VADER")
-                self.transformer_model = None
+            # Alternatively use Hugging Face transformers, loaded in-process only without a pool
+            if self.model_pool is None:
+                try:
+                    model, revision = PIPELINE_MODELS['sentiment']
+                    self.transformer_model = pipeline("sentiment-analysis", model=model, revision=revision)
+                except:
+                    print("Warning: Failed to load transformer model, falling back to VADER")
+                    self.transformer_model = None
         else:
             # In simulation mode, we don't need to load the model
             print("Running SentimentAnalyzer in simulation mode")
     
+    @property
+    def model_id(self):
+        """Identifier of the scoring path analyze() will use"""
+        if not self.use_pretrained_model:
+            return self.simulation_model_id
+        if self.model_pool is not None or self.transformer_model:
+            return TRANSFORMER_MODEL_ID
+        return VADER_MODEL_ID
+    
     def analyze(self, text):
         """
         Analyze the sentiment of the provided text.
         Returns a dictionary with the sentiment classification and confidence score.
         """
+        if self.cache is None:
+            return self._analyze_uncached(text)
+        
+        model_id = self.model_id
+        key = content_key(model_id, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._analyze_uncached(text)
+        # Don't cache a fallback result under the primary model's key
+        if result.get("model") == model_id:
+            self.cache.set(key, result)
+        return result
+    
+    def analyze_batch(self, texts):
+        """
+        Analyze a list of texts in one pass.
+        Cached texts are served from the cache; the rest are sent to the model together.
+        """
+        results = [None] * len(texts)
+        model_id = self.model_id
+        pending = []
+        
+        for i, text in enumerate(texts):
+            cached = self.cache.get(content_key(model_id, text)) if self.cache is not None else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        if pending:
+            computed = self._analyze_batch_uncached([texts[i] for i in pending])
+            for i, result in zip(pending, computed):
+                results[i] = result
+                if self.cache is not None and result.get("model") == model_id:
+                    self.cache.set(content_key(model_id, texts[i]), result)
+        
+        return results
+    
+    def _analyze_uncached(self, text):
         if self.use_pretrained_model:
             return self._analyze_with_model(text)
         else:
             return self._simulate_sentiment_analysis(text)
     
+    def _analyze_batch_uncached(self, texts):
+        if not self.use_pretrained_model:
+            return self._simulate_sentiment_batch(texts)
+        
+        # The transformer pipeline batches a list of texts in one call
+        if self.model_pool is not None or self.transformer_model:
+            try:
+                if self.model_pool is not None:
+                    outputs = self.model_pool.run('sentiment', list(texts))
+                else:
+                    outputs = self.transformer_model(list(texts))
+                return [self._from_transformer_output(output) for output in outputs]
+            except Exception as e:
+                print(f"Error using transformer model on batch: {e}, falling back to VADER")
+        
+        return [self._analyze_with_vader(text) for text in texts]
+    
+    def _from_transformer_output(self, output):
+        """Map one transformer prediction to our simplified sentiment categories"""
+        label = output['label'].lower()
+        score = output['score'] * 100
+        
+        if 'positive' in label:
+            sentiment = 'positive'
+        elif 'negative' in label:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        
+        return {
+            "overall": sentiment,
+            "confidenceScore": int(score),
+            "model": TRANSFORMER_MODEL_ID
+        }
+    
     def _analyze_with_model(self, text):
         """Use the actual sentiment analysis model"""
         # Try transformer model first if available
-        if hasattr(self, 'transformer_model') and self.transformer_model:
+        if self.model_pool is not None or self.transformer_model:
             try:
-                result = self.transformer_model(text)
-                label = result[0]['label'].lower()
-                score = result[0]['score'] * 100
-                
-                # Map to our simplified sentiment categories
-                if 'positive' in label:
-                    sentiment = 'positive'
-                elif 'negative' in label:
-                    sentiment = 'negative'
+                if self.model_pool is not None:
+                    result = self.model_pool.run('sentiment', text)
                 else:
-                    sentiment = 'neutral'
-                    
-                return {
-                    "overall": sentiment,
-                    "confidenceScore": int(score)
-                }
+                    result = self.transformer_model(text)
+                return self._from_transformer_output(result[0])
             except Exception as e:
                 print(f"Error using transformer model: {e}, falling back to VADER")
         
-        # Fall back to VADER
+        return self._analyze_with_vader(text)
+    
+    def _analyze_with_vader(self, text):
+        """Score text with the VADER lexicon"""
         scores = self.sia.polarity_scores(text)
         
         # Determine overall sentiment
@@ -81,42 +175,37 @@ class SentimentAnalyzer:
         
         return {
             "overall": sentiment,
-            "confidenceScore": confidence
+            "confidenceScore": confidence,
+            "model": VADER_MODEL_ID
         }
     
     def _simulate_sentiment_analysis(self, text):
-        """Simulate sentiment analysis for development without models"""
-        # Simple keyword-based simulation
-        positive_words = ['good', 'great', 'excellent', 'positive', 'happy', 'success', 'beneficial']
-        negative_words = ['bad', 'poor', 'negative', 'unhappy', 'fail', 'issue', 'problem', 'concern']
-        
-        text_lower = text.lower()
-        
-        # Count positive and negative words
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        # Determine sentiment based on counts
-        if positive_count > negative_count:
+        """Score text with the lexicon for development without models"""
+        score = self.lexicon.score(text)
+        return self._classify_lexicon_score(score.positive, score.negative)
+    
+    def _simulate_sentiment_batch(self, texts):
+        """Score a list of texts with the lexicon in one vectorized pass"""
+        positive, negative, _ = self.lexicon.score_batch(texts)
+        return [self._classify_lexicon_score(p, n) for p, n in zip(positive.tolist(), negative.tolist())]
+    
+    def _classify_lexicon_score(self, positive, negative):
+        """Turn summed lexicon weights into a sentiment and confidence"""
+        if positive > negative:
             sentiment = 'positive'
-            base_confidence = 75 + (positive_count - negative_count) * 5
-        elif negative_count > positive_count:
+            base_confidence = 75 + (positive - negative) * 5
+        elif negative > positive:
             sentiment = 'negative'
-            base_confidence = 75 + (negative_count - positive_count) * 5
+            base_confidence = 75 + (negative - positive) * 5
         else:
-            # If equal or no matches, simulate based on text length
-            if len(text) % 3 == 0:
-                sentiment = 'positive'
-            elif len(text) % 3 == 1:
-                sentiment = 'negative'
-            else:
-                sentiment = 'neutral'
+            # No lexicon words, or they cancel out
+            sentiment = 'neutral'
             base_confidence = 70
         
-        # Add some randomness to make it more realistic
-        confidence = min(95, max(60, base_confidence + random.randint(-5, 5)))
+        confidence = int(round(min(95, max(60, base_confidence))))
         
         return {
             "overall": sentiment,
-            "confidenceScore": confidence
+            "confidenceScore": confidence,
+            "model": self.simulation_model_id
         }
@@ -0,0 +1,366 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+import numpy as np
+from models.lexicon_scorer import tokenize
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+HASHING_DIM = 384
+# Contacts scoring at or below this cosine similarity are left out of results
+MIN_SIMILARITY = 0.0
+
+
+class HashingEmbedder:
+    """
+    Embeds text by hashing its tokens into a fixed number of signed buckets.
+    Used in simulation mode so the similarity index works without downloading a model.
+    """
+
+    model_name = 'hashing'
+
+    def __init__(self, dim=HASHING_DIM):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=64):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                if len(token) < 3:
+                    continue
+                h = zlib.crc32(token.encode('utf-8'))
+                vectors[row, h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """Embeds text with a sentence-transformers model, in batches"""
+
+    def __init__(self, model_name=DEFAULT_MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=64):
+        vectors = self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+        return vectors.astype(np.float32)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def contact_document(user):
+    """Text that describes a contact for embedding: role, company, bio and meeting summaries"""
+    parts = [f"{user.get('role', '')} at {user.get('company', '')}", user.get('bio', '')]
+    for meeting in user.get('meetings', []):
+        parts.append(f"{meeting.get('title', '')}: {meeting.get('summary', '')}")
+    return '\n'.join(part for part in parts if part)
+
+
+class ContactSimilarityIndex:
+    """
+    Embedding index over contacts.
+    Vectors live in a memory-mapped float32 matrix on disk, with a JSON sidecar of
+    contact IDs and content hashes, so only contacts whose text changed are re-embedded.
+    Changed rows are appended to a log next to the sidecar rather than rewriting it, and
+    the log is folded back into the sidecar once it grows as long as the index.
+    Queries go through an IVF index (k-means lists, probing the nearest few) once the
+    book is large enough, and through an exact brute-force scan otherwise.
+    """
+
+    def __init__(self, embedder=None, path='data/contact_embeddings', ivf_threshold=5000, nprobe=8,
+                 batch_size=64):
+        if embedder is None:
+            use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
+            embedder = SentenceTransformerEmbedder() if use_pretrained_model else HashingEmbedder()
+        self.embedder = embedder
+        self.vectors_path = f"{path}.f32"
+        self.meta_path = f"{path}.json"
+        self.log_path = f"{path}.log"
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.batch_size = batch_size
+
+        self.dim = embedder.dim
+        self.ids = []
+        self.names = []
+        self.hashes = []
+        self.index = {}
+        self.count = 0
+        self.vectors = None
+        self._logged = 0
+        self._lock = threading.Lock()
+
+        # IVF state
+        self.centroids = None
+        self.assignments = None
+        self._lists = []
+        self._trained_count = 0
+
+        self._load()
+
+    # ---- storage ----
+
+    def _open(self, capacity, copy_from=None):
+        directory = os.path.dirname(self.vectors_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.vectors_path + '.tmp'
+        vectors = np.memmap(tmp_path, dtype=np.float32, mode='w+', shape=(max(capacity, 1), self.dim))
+        if copy_from is not None and self.count:
+            vectors[:self.count] = copy_from[:self.count]
+            vectors.flush()
+        del copy_from
+        os.replace(tmp_path, self.vectors_path)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode='r+', shape=(max(capacity, 1), self.dim))
+
+    def _load(self):
+        """Reuse stored vectors if they were produced by the same model"""
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta['model'] != self.embedder.model_name or meta['dim'] != self.dim:
+                raise ValueError("embedding model changed")
+            self.ids = meta['ids']
+            self.names = meta['names']
+            self.hashes = meta['hashes']
+            self._replay_log(meta['capacity'])
+            self.count = len(self.ids)
+            self.index = {person_id: row for row, person_id in enumerate(self.ids)}
+            self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                     shape=(meta['capacity'], self.dim))
+            print(f"Loaded {self.count} contact embeddings from {self.vectors_path}")
+        except (OSError, ValueError, KeyError):
+            self.ids, self.names, self.hashes, self.index, self.count = [], [], [], {}, 0
+            self.vectors = self._open(1024)
+            self._save_meta()
+
+    def _replay_log(self, capacity):
+        """Apply the rows appended since the sidecar was last written"""
+        self._logged = 0
+        try:
+            f = open(self.log_path)
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A write cut short by a crash; the vector is re-embedded on the next sync
+                    break
+                row = entry['row']
+                if row == len(self.ids) and row < capacity:
+                    self.ids.append(entry['id'])
+                    self.names.append(entry['name'])
+                    self.hashes.append(entry['hash'])
+                elif row < len(self.ids) and self.ids[row] == entry['id']:
+                    self.names[row] = entry['name']
+                    self.hashes[row] = entry['hash']
+                else:
+                    raise ValueError("sidecar log does not match the sidecar")
+                self._logged += 1
+
+    def _save_meta(self):
+        """Rewrite the sidecar and start an empty log"""
+        self.vectors.flush()
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'model': self.embedder.model_name,
+                'dim': self.dim,
+                'capacity': self.vectors.shape[0],
+                'ids': self.ids,
+                'names': self.names,
+                'hashes': self.hashes
+            }, f)
+        os.replace(tmp_path, self.meta_path)
+        with open(self.log_path, 'w'):
+            pass
+        self._logged = 0
+
+    def _append_meta(self, rows):
+        """Record changed rows in the log, once their vectors are on disk"""
+        self.vectors.flush()
+        with open(self.log_path, 'a') as f:
+            for row in rows:
+                f.write(json.dumps({'row': row, 'id': self.ids[row], 'name': self.names[row],
+                                    'hash': self.hashes[row]}) + '\n')
+        self._logged += len(rows)
+
+    def _ensure_capacity(self, count):
+        if count > self.vectors.shape[0]:
+            capacity = self.vectors.shape[0]
+            while capacity < count:
+                capacity *= 2
+            self.vectors = self._open(capacity, copy_from=self.vectors)
+
+    # ---- updates ----
+
+    def sync(self, users):
+        """Embed every contact whose text changed since it was last embedded, in batches"""
+        with self._lock:
+            changed = []
+            for user in users:
+                document = contact_document(user)
+                digest = hashlib.sha1(document.encode('utf-8')).hexdigest()
+                row = self.index.get(user['id'])
+                if row is not None and self.hashes[row] == digest:
+                    continue
+                changed.append((user, document, digest))
+
+            if changed:
+                capacity = self.vectors.shape[0]
+                rows = self._embed(changed)
+                # A grown matrix changes the capacity the sidecar records; a long log is
+                # folded back in so replaying it on load stays cheap
+                if self.vectors.shape[0] != capacity or self._logged + len(rows) > max(self.count, 1024):
+                    self._save_meta()
+                else:
+                    self._append_meta(rows)
+                print(f"Embedded {len(changed)} contacts")
+
+            if self._needs_training():
+                self._train()
+        return self
+
+    def update_user(self, user):
+        """Re-embed one contact if its text changed"""
+        self.sync([user])
+
+    def on_repository_event(self, event, user, item):
+        """UserRepository listener"""
+        if event in ('meeting_added', 'user_added'):
+            self.update_user(user)
+
+    def _embed(self, changed):
+        new_rows = sum(1 for user, _, _ in changed if user['id'] not in self.index)
+        self._ensure_capacity(self.count + new_rows)
+        rows = []
+
+        for start in range(0, len(changed), self.batch_size):
+            batch = changed[start:start + self.batch_size]
+            vectors = self.embedder.encode([document for _, document, _ in batch], batch_size=self.batch_size)
+            for (user, _, digest), vector in zip(batch, vectors):
+                row = self.index.get(user['id'])
+                if row is None:
+                    row = self.count
+                    self.index[user['id']] = row
+                    self.ids.append(user['id'])
+                    self.names.append(user.get('name', ''))
+                    self.hashes.append(digest)
+                    self.count += 1
+                else:
+                    self.names[row] = user.get('name', '')
+                    self.hashes[row] = digest
+                self.vectors[row] = vector
+                self._assign(row)
+                rows.append(row)
+        return rows
+
+    # ---- IVF ----
+
+    def _needs_training(self):
+        if self.count < self.ivf_threshold:
+            return False
+        return self.centroids is None or self.count >= 2 * self._trained_count
+
+    def _train(self, iterations=10):
+        """Cluster the vectors with k-means and build one inverted list per cluster"""
+        data = np.asarray(self.vectors[:self.count])
+        nlist = max(1, int(np.sqrt(self.count)))
+        rng = np.random.default_rng(0)
+        sample = data[rng.choice(self.count, size=min(self.count, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        assignments = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, 65536):
+            block = data[start:start + 65536]
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.searchsorted(assignments[order], np.arange(nlist + 1))
+        self._lists = [list(order[bounds[i]:bounds[i + 1]]) for i in range(nlist)]
+        self.centroids = centroids
+        self.assignments = assignments
+        self._trained_count = self.count
+
+    def _assign(self, row):
+        """Put a new or re-embedded vector in the list of its nearest centroid"""
+        if self.centroids is None:
+            return
+        cluster = int(np.argmax(self.centroids @ self.vectors[row]))
+        if row < len(self.assignments):
+            previous = self.assignments[row]
+            if previous == cluster:
+                return
+            self._lists[previous].remove(row)
+            self.assignments[row] = cluster
+        else:
+            self.assignments = np.append(self.assignments, np.int32(cluster))
+        self._lists[cluster].append(row)
+
+    # ---- queries ----
+
+    def _search(self, query, k, exclude=None):
+        if self.count == 0:
+            return []
+        if self.centroids is not None and self.count >= self.ivf_threshold:
+            probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            candidates = np.array([row for cluster in probes for row in self._lists[cluster]], dtype=np.int64)
+            scores = np.asarray(self.vectors[candidates]) @ query
+        else:
+            candidates = np.arange(self.count)
+            scores = np.asarray(self.vectors[:self.count]) @ query
+
+        # Contacts that share nothing with the query are not similar, however few match
+        keep = scores > MIN_SIMILARITY
+        if exclude is not None:
+            keep &= candidates != exclude
+        candidates, scores = candidates[keep], scores[keep]
+        if len(candidates) == 0:
+            return []
+
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"personId": self.ids[candidates[i]], "name": self.names[candidates[i]], "similarity": round(float(scores[i]), 4)}
+            for i in top
+        ]
+
+    def similar_to(self, person_id, k=5):
+        """Contacts most similar to the given contact"""
+        with self._lock:
+            row = self.index.get(person_id)
+            if row is None:
+                return None
+            return self._search(np.array(self.vectors[row]), k, exclude=row)
+
+    def search(self, text, k=5):
+        """Contacts most similar to a free-text description"""
+        query = self.embedder.encode([text])[0]
+        with self._lock:
+            return self._search(query, k)
+
+    def stats(self):
+        return {
+            "contacts": self.count,
+            "dim": self.dim,
+            "model": self.embedder.model_name,
+            "ivfLists": len(self._lists) if self.centroids is not None else 0
+        }
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class _Flight:
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Request coalescing: while a call for a key is running, further calls for the same key
+    wait for it and share its result (or its exception) instead of running again. Once it
+    finishes the key is free, so later calls start a fresh computation. Threads and asyncio
+    tasks can wait on the same flight; results are shared, so callers must not modify them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0, 'maxWaiters': 0}
+
+    def _join(self, key):
+        """The flight's future, and whether this caller has to run it"""
+        with self._lock:
+            self._stats['calls'] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._stats['coalesced'] += 1
+                self._stats['maxWaiters'] = max(self._stats['maxWaiters'], flight.waiters)
+                return flight.future, False
+            flight = self._flights[key] = _Flight()
+            self._stats['executions'] += 1
+            return flight.future, True
+
+    def _land(self, key, future, result=None, error=None):
+        with self._lock:
+            del self._flights[key]
+            if error is not None:
+                self._stats['errors'] += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """Return fn(), or the result of the call for `key` already in flight"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._land(key, future, error=e)
+            raise
+        self._land(key, future, result)
+        return result
+
+    async def do_async(self, key, fn):
+        """`do` for a coroutine function; shares flights with `do`"""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._land(key, future, error=e)
+            raise
+        self._land(key, future, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, inFlight=len(self._flights))
@@ -1,10 +1,313 @@
-
 import re
-import random
 import datetime
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
 import os
 
+# Task title patterns, compiled once
+TASK_COLON_PATTERN = re.compile(r'\btask:\s*(.*?)(?:$|\.|\;)', re.IGNORECASE)
+ASSIGN_PATTERN = re.compile(r'(?:assign|create|add|set).*?(?:to|for|about) (.*?)(?:$|\.|\;|\,)', re.IGNORECASE)
+TASK_PATTERN = re.compile(r'task (?:to |for |about )?(.*?)(?:$|\.|\;|\,)', re.IGNORECASE)
+
+# Priority cues, checked high first
+PRIORITY_PATTERNS = (
+    ('high', re.compile(r'\b(?:urgent(?:ly)?|asap|a\.s\.a\.p|immediately|right away|critical|top priority|high[- ]priority|important)\b', re.IGNORECASE)),
+    ('low', re.compile(r'\b(?:no rush|whenever|low[- ]priority|eventually|someday|when you can|not urgent)\b', re.IGNORECASE)),
+    ('medium', re.compile(r'\b(?:medium[- ]priority|normal priority|soon)\b', re.IGNORECASE)),
+)
+
+# Days until the deadline when the command does not give one
+DEFAULT_DEADLINE_DAYS = {'high': 2, 'medium': 7, 'low': 14}
+
+# Hours to complete, by the first matching kind of work
+EFFORT_PATTERNS = (
+    (1, re.compile(r'\b(?:call|email|e-mail|text|ping|remind|reply|send|book|schedule)\b', re.IGNORECASE)),
+    (8, re.compile(r'\b(?:build|implement|develop|design|migrate|launch|project|plan)\b', re.IGNORECASE)),
+    (4, re.compile(r'\b(?:report|review|proposal|presentation|draft|write|prepare|analy[sz]e|research|deck)\b', re.IGNORECASE)),
+)
+DEFAULT_EFFORT_HOURS = {'high': 3, 'medium': 3, 'low': 2}
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+          'september', 'october', 'november', 'december')
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'couple of': 2, 'few': 3
+}
+
+_WEEKDAY = '(' + '|'.join(WEEKDAYS) + ')'
+_MONTH = '(' + '|'.join(month[:3] + f'(?:{month[3:]})?' if len(month) > 3 else month for month in MONTHS) + r')\.?'
+_NUMBER = r'(\d+|' + '|'.join(NUMBER_WORDS) + ')'
+
+# Deadline phrases, each optionally introduced by "by", "on", "before", "due" or "until".
+# They are compiled into one alternation so a command is scanned once; the leftmost phrase wins.
+DATE_PHRASES = (
+    ('iso', r'(\d{4})-(\d{2})-(\d{2})\b'),
+    ('month_day', _MONTH + r'\s+(\d{1,2})(?:st|nd|rd|th)?\b'),
+    ('day_month', r'(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?' + _MONTH + r'\b'),
+    ('relative', r'in\s+(?:a\s+)?' + _NUMBER + r'\s+(day|week|month)s?\b'),
+    ('day_after_tomorrow', r'(?:the\s+)?day after tomorrow\b'),
+    ('today', r'(?:today|tonight|end of (?:the )?day|eod)\b'),
+    ('tomorrow', r'tomorrow\b'),
+    ('next_weekday', r'next\s+' + _WEEKDAY + r'\b'),
+    ('weekday', r'(?:this\s+|coming\s+)?' + _WEEKDAY + r'\b'),
+    ('end_of_week', r'(?:the\s+)?end of (?:the |this )?week\b|eow\b'),
+    ('end_of_month', r'(?:the\s+)?end of (?:the |this )?month\b|eom\b'),
+    ('next_week', r'next week\b'),
+    ('next_month', r'next month\b'),
+)
+DATE_PATTERN = re.compile(
+    r'(?:\b(?:by|on|before|due|until|for)\s+)?\b(?:'
+    + '|'.join(f'(?P<{kind}>{phrase})' for kind, phrase in DATE_PHRASES)
+    + ')',
+    re.IGNORECASE
+)
+# Index of the first capture group inside each phrase
+_PHRASE_GROUPS = {kind: DATE_PATTERN.groupindex[kind] + 1 for kind, _ in DATE_PHRASES}
+
+
+def _month_number(name):
+    return [month[:3] for month in MONTHS].index(name[:3].lower()) + 1
+
+
+def _upcoming(today, day_name, weeks_ahead=0):
+    """The next given weekday strictly after today, optionally some weeks later"""
+    days = (WEEKDAYS.index(day_name.lower()) - today.weekday() - 1) % 7 + 1
+    return today + datetime.timedelta(days=days + 7 * weeks_ahead)
+
+
+def _calendar_date(today, month, day):
+    """A month and day without a year: this year, or next year if it has already passed"""
+    try:
+        candidate = datetime.date(today.year, month, day)
+        if candidate < today:
+            candidate = datetime.date(today.year + 1, month, day)
+        return candidate
+    except ValueError:
+        return None
+
+
+def parse_deadline(text, today):
+    """
+    Find a deadline phrase in text. Returns (date, (start, end) of the phrase), or
+    (None, None) if there is none. Relative phrases are resolved against `today`.
+    """
+    match = DATE_PATTERN.search(text)
+    while match:
+        kind = match.lastgroup
+        first = _PHRASE_GROUPS[kind]
+        groups = match.groups()[first - 1:]
+        deadline = _resolve_deadline(kind, groups, today)
+        if deadline is not None:
+            return deadline, match.span()
+        # An impossible date such as 2024-02-31; keep looking
+        match = DATE_PATTERN.search(text, match.end())
+    return None, None
+
+
+def _resolve_deadline(kind, groups, today):
+    """Turn one matched deadline phrase into a date, or None if it is not a valid date"""
+    if kind == 'iso':
+        try:
+            return datetime.date(int(groups[0]), int(groups[1]), int(groups[2]))
+        except ValueError:
+            return None
+    if kind == 'month_day':
+        return _calendar_date(today, _month_number(groups[0]), int(groups[1]))
+    if kind == 'day_month':
+        return _calendar_date(today, _month_number(groups[1]), int(groups[0]))
+    if kind == 'relative':
+        number = groups[0].lower()
+        amount = int(number) if number.isdigit() else NUMBER_WORDS[number]
+        unit = groups[1].lower()
+        if unit == 'day':
+            return today + datetime.timedelta(days=amount)
+        if unit == 'week':
+            return today + datetime.timedelta(weeks=amount)
+        return today + relativedelta(months=amount)
+    if kind == 'today':
+        return today
+    if kind == 'tomorrow':
+        return today + datetime.timedelta(days=1)
+    if kind == 'day_after_tomorrow':
+        return today + datetime.timedelta(days=2)
+    if kind == 'next_weekday':
+        # "next Friday" is the Friday of next week
+        monday_next_week = today + datetime.timedelta(days=7 - today.weekday())
+        return monday_next_week + datetime.timedelta(days=WEEKDAYS.index(groups[0].lower()))
+    if kind == 'weekday':
+        return _upcoming(today, groups[0])
+    if kind == 'end_of_week':
+        return _upcoming(today, 'friday') if today.weekday() != 4 else today
+    if kind == 'end_of_month':
+        return today + relativedelta(day=31)
+    if kind == 'next_week':
+        return today + datetime.timedelta(days=7 - today.weekday())
+    if kind == 'next_month':
+        return (today + relativedelta(months=1)).replace(day=1)
+    return None
+
+
+def detect_priority(text):
+    """Priority from cue words, 'medium' if there are none"""
+    for priority, pattern in PRIORITY_PATTERNS:
+        if pattern.search(text):
+            return priority
+    return 'medium'
+
+
+def _estimate_hours(text, priority):
+    for hours, pattern in EFFORT_PATTERNS:
+        if pattern.search(text):
+            return hours
+    return DEFAULT_EFFORT_HOURS[priority]
+
+
+def _format_hours(hours):
+    return f"{hours} hour" if hours == 1 else f"{hours} hours"
+
+
+def _clean_title(title):
+    """Drop priority cues from an extracted title"""
+    for _, pattern in PRIORITY_PATTERNS:
+        title = pattern.sub('', title)
+    title = re.sub(r'\s{2,}', ' ', title).strip(' ,;:-')
+    return title
+
+
+@lru_cache(maxsize=4096)
+def _extract_task(command, today):
+    """Rule-based task extraction; deterministic for a given command and date, so results are cached"""
+    priority = detect_priority(command)
+    deadline, deadline_span = parse_deadline(command, today)
+    # The title is looked for with the deadline phrase cut out, so "for Monday" is never one
+    text = command[:deadline_span[0]] + command[deadline_span[1]:] if deadline_span else command
+
+    # Try to extract a meaningful title from the command
+    title = text
+    # "create task: do Z", then "assign X to do Y" or "create task to do Z"
+    to_match = TASK_COLON_PATTERN.search(text) or ASSIGN_PATTERN.search(text)
+    if to_match:
+        title = to_match.group(1)
+    else:
+        # Look for direct mentions of task
+        task_match = TASK_PATTERN.search(text)
+        if task_match:
+            title = task_match.group(1)
+    title = _clean_title(title) or command.strip()
+    # If still nothing meaningful, just use a generic task title
+    if not to_match and not task_match and len(title) > 50:
+        title = f"Task related to {title[:30]}..."
+
+    if deadline is None:
+        deadline = today + datetime.timedelta(days=DEFAULT_DEADLINE_DAYS[priority])
+    alt_deadline = deadline + datetime.timedelta(days=7)
+
+    return (
+        ("title", title),
+        ("priority", priority),
+        # Format the dates nicely
+        ("deadline", deadline.strftime('%A, %b %d')),
+        ("deadlineDate", deadline.isoformat()),
+        ("alternativeDeadline", alt_deadline.strftime('%A, %b %d')),
+        ("estimatedTime", _format_hours(_estimate_hours(command, priority)))
+    )
+
+
+# Financial extraction patterns, compiled once
+AMOUNT_PATTERN = re.compile(
+    r'\$\s?(\d[\d,]*(?:\.\d+)?)\s?(k)?\b|\b(\d[\d,]*(?:\.\d+)?)\s?(k)?\s*(?:dollars?|usd|bucks)\b',
+    re.IGNORECASE
+)
+TRANSACTION_TYPES = (
+    ('invoice', re.compile(r'\b(?:invoice[sd]?|bill(?:ed)?|charged?)\b', re.IGNORECASE)),
+    ('reimbursement', re.compile(r'\breimburs', re.IGNORECASE)),
+    ('payment', re.compile(r'\b(?:pay|paid|payment|transfer(?:red)?|sent)\b', re.IGNORECASE)),
+)
+# Money already moved, and in which direction. Receiving counts only when money was
+# received ("received $300", "received payment"), not an invoice or a bill.
+SETTLED_PATTERNS = (
+    ('received', re.compile(
+        r'\b(?:paid me|sent me|transferred me|got paid'
+        r'|received\s+(?:(?:a|the|their|his|her|full|my|our)\s+)?'
+        r'(?:\$|\d|payments?\b|money\b|funds\b|transfer\b|reimbursement\b|cash\b|che(?:ck|que)\b|deposit\b))',
+        re.IGNORECASE
+    )),
+    ('paid', re.compile(
+        r'\b(?:i|we) (?:have |already )?(?:paid|sent|transferred)\b'
+        r'(?!\s+(?:(?:them|him|her)\s+)?(?:an?|the|my|our)\s+(?:invoice|bill))',
+        re.IGNORECASE
+    )),
+)
+# Who pays an open amount: 'from' is money the contact owes you, 'to' is money you owe
+# them. Words like "invoice", "bill" or "from" say what kind of entry it is, not who pays,
+# so the direction comes from the payer. Checked in order; the first cue wins.
+_FIRST_PERSON = r'\b(?:i|we)\b(?:(?!\b(?:they|he|she)\b)[^.;,!?])*?'
+DIRECTION_PATTERNS = (
+    ('to', re.compile(r'\b(?:charged|billed|invoiced)\s+(?:me|us)\b', re.IGNORECASE)),
+    ('to', re.compile(r'\b(?:received|got)\s+(?:an?|the|their|his|her|its)\s+(?:invoice|bill)', re.IGNORECASE)),
+    ('from', re.compile(r'\bowes\b|\b(?:owe|pays?|reimburses?)\s+(?:me|us)\b', re.IGNORECASE)),
+    ('to', re.compile(_FIRST_PERSON + r'\b(?:owe|pay|reimburse)\b', re.IGNORECASE)),
+    ('from', re.compile(_FIRST_PERSON + r'\b(?:invoice|bill|charge)d?\b', re.IGNORECASE)),
+    ('from', re.compile(r'\b(?:they|he|she)\b[^.;,!?]*?\b(?:owes?|pay|reimburse)\b', re.IGNORECASE)),
+    ('to', re.compile(r'\b(?:need|have|got) to pay\b|\bowe\b', re.IGNORECASE)),
+)
+FINANCE_CATEGORIES = (
+    ('consultation', re.compile(r'\bconsult', re.IGNORECASE)),
+    ('subscription', re.compile(r'\b(?:subscription|monthly|annual|renewal)\b', re.IGNORECASE)),
+    ('project fee', re.compile(r'\b(?:project|milestone|retainer|fee|deposit)\b', re.IGNORECASE)),
+)
+DEFAULT_PAYMENT_DAYS = 14
+
+
+def parse_amount(command):
+    """Amount of money mentioned in a command, or None"""
+    match = AMOUNT_PATTERN.search(command)
+    if not match:
+        return None
+    number, thousands = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+    amount = float(number.replace(',', ''))
+    return amount * 1000 if thousands else amount
+
+
+def format_amount(amount):
+    return f"${amount:,.0f}" if amount == int(amount) else f"${amount:,.2f}"
+
+
+def _first_match(patterns, text, default):
+    for label, pattern in patterns:
+        if pattern.search(text):
+            return label
+    return default
+
+
+@lru_cache(maxsize=4096)
+def _extract_financial(command, today):
+    """Rule-based financial extraction; deterministic for a given command and date, so results are cached"""
+    amount = parse_amount(command)
+    status = _first_match(SETTLED_PATTERNS, command, 'owed')
+    if status == 'owed':
+        direction = _first_match(DIRECTION_PATTERNS, command, 'to')
+    else:
+        direction = 'from' if status == 'received' else 'to'
+
+    deadline, _ = parse_deadline(command, today)
+    if deadline is None:
+        deadline = today + datetime.timedelta(days=DEFAULT_PAYMENT_DAYS)
+
+    return (
+        ("type", _first_match(TRANSACTION_TYPES, command, 'transaction')),
+        ("status", status),
+        ("direction", direction),
+        ("amount", format_amount(amount) if amount is not None else None),
+        ("amountValue", amount),
+        ("dueDate", deadline.strftime('%A, %b %d')),
+        ("dueDateIso", deadline.isoformat()),
+        ("category", _first_match(FINANCE_CATEGORIES, command, 'business expense')),
+        ("daysUntilDue", (deadline - today).days)
+    )
+
+
 class TaskManager:
     def __init__(self):
         self.use_pretrained_model = os.environ.get('USE_PRETRAINED_MODEL', 'false').lower() == 'true'
@@ -15,118 +318,52 @@ class TaskManager:
         else:
             print("Running TaskManager in simulation mode")
     
-    def extract_task_info(self, command):
+    def extract_task_info(self, command, today=None):
         """
         Extract task information from the command.
         Returns a dictionary with task details.
+        Relative deadlines ("next Friday", "in 3 days") are resolved against `today`.
         """
+        today = today or datetime.date.today()
         if self.use_pretrained_model:
-            return self._extract_with_model(command)
+            return self._extract_with_model(command, today)
         else:
-            return self._simulate_task_extraction(command)
+            return self._extract_with_rules(command, today)
+    
+    def extract_task_info_batch(self, commands, today=None):
+        """Extract task information from many commands at once"""
+        today = today or datetime.date.today()
+        if self.use_pretrained_model:
+            return [self._extract_with_model(command, today) for command in commands]
+        return [self._extract_with_rules(command, today) for command in commands]
     
-    def extract_financial_info(self, command, person):
+    def extract_financial_info(self, command, person, today=None):
         """
         Extract financial information from the command.
         Returns a dictionary with financial details.
         """
+        today = today or datetime.date.today()
         if self.use_pretrained_model:
-            return self._extract_financial_with_model(command, person)
+            return self._extract_financial_with_model(command, person, today)
         else:
-            return self._simulate_financial_extraction(command, person)
+            return self._extract_financial_with_rules(command, person, today)
     
-    def _extract_with_model(self, command):
+    def _extract_with_model(self, command, today):
         """Extract task information using an ML model"""
         # This would use a named entity recognition or task-specific model
-        # For now, just call the simulation
-        return self._simulate_task_extraction(command)
+        # For now, just use the rules
+        return self._extract_with_rules(command, today)
     
-    def _simulate_task_extraction(self, command):
-        """Simulate task information extraction for development"""
-        # Determine priority
-        priorities = ['high', 'medium', 'low']
-        priority = random.choice(priorities)
-        
-        # Try to extract a meaningful title from the command
-        title = command
-        # Look for patterns like "assign X to do Y" or "create task to do Z"
-        to_match = re.search(r'(?:assign|create|add|set).*(?:to|for|about) (.*?)(?:$|\.|\;|\,)', command, re.IGNORECASE)
-        if to_match:
-            title = to_match.group(1).strip()
-        else:
-            # Look for direct mentions of task
-            task_match = re.search(r'task (?:to |for |about )?(.*?)(?:$|\.|\;|\,)', command, re.IGNORECASE)
-            if task_match:
-                title = task_match.group(1).strip()
-            # If still nothing meaningful, just use a generic task title
-            elif len(title) > 50:
-                title = f"Task related to {title[:30]}..."
-        
-        # Generate deadline dates
-        today = datetime.datetime.now()
-        deadline_days = random.randint(3, 17)  # 3-17 days from now
-        deadline = today + datetime.timedelta(days=deadline_days)
-        
-        alt_deadline_days = random.randint(7, 14)  # 7-14 days from now
-        alt_deadline = today + datetime.timedelta(days=alt_deadline_days)
-        
-        # Format the dates nicely
-        deadline_str = deadline.strftime('%A, %b %d')
-        alt_deadline_str = alt_deadline.strftime('%A, %b %d')
-        
-        # Estimated time to complete
-        est_hours = random.randint(2, 10)
-        
-        return {
-            "title": title,
-            "priority": priority,
-            "deadline": deadline_str,
-            "alternativeDeadline": alt_deadline_str,
-            "estimatedTime": f"{est_hours} hours"
-        }
+    def _extract_with_rules(self, command, today):
+        """Extract task information with precompiled rules"""
+        return dict(_extract_task(command, today))
     
-    def _extract_financial_with_model(self, command, person):
+    def _extract_financial_with_model(self, command, person, today):
         """Extract financial information using an ML model"""
         # This would use a financial entity extraction model
-        # For now, just call the simulation
-        return self._simulate_financial_extraction(command, person)
+        # For now, just use the rules
+        return self._extract_financial_with_rules(command, person, today)
     
-    def _simulate_financial_extraction(self, command, person):
-        """Simulate financial information extraction for development"""
-        # Transaction types
-        types = ['payment', 'invoice', 'reimbursement', 'transaction']
-        transaction_type = random.choice(types)
-        
-        # Direction (to/from)
-        directions = ['to', 'from']
-        direction = random.choice(directions)
-        
-        # Categories
-        categories = ['business expense', 'project fee', 'consultation', 'subscription']
-        category = random.choice(categories)
-        
-        # Try to extract an amount from the command
-        amount = None
-        amount_match = re.search(r'\$(\d+(?:\.\d+)?)|(\d+(?:\.\d+)?) dollars?', command, re.IGNORECASE)
-        if amount_match:
-            # Extract the amount value (either from group 1 or 2)
-            amount_value = amount_match.group(1) or amount_match.group(2)
-            amount = f"${amount_value}"
-        else:
-            # Generate a random amount if none found
-            amount = f"${random.randint(100, 1000)}"
-        
-        # Generate due date
-        today = datetime.datetime.now()
-        days_until_due = random.randint(7, 28)
-        due_date = today + datetime.timedelta(days=days_until_due)
-        due_date_str = due_date.strftime('%A, %b %d')
-        
-        return {
-            "type": transaction_type,
-            "direction": direction,
-            "amount": amount,
-            "dueDate": due_date_str,
-            "category": category,
-            "daysUntilDue": days_until_due
-        }
+    def _extract_financial_with_rules(self, command, person, today):
+        """Extract financial information with precompiled rules"""
+        return dict(_extract_financial(command, today))
@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(TimeoutError):
+    """No browser became free within the lease timeout"""
+
+
+class _PooledDriver:
+    __slots__ = ('driver', 'pages', 'created')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.monotonic()
+
+
+class WebDriverPool:
+    """
+    A fixed-size pool of Selenium browsers. Browsers are started on demand, up to `size`;
+    callers lease one for the duration of a page visit and return it, waiting up to
+    `lease_timeout` seconds when all are busy. A browser is quit and replaced after
+    `max_pages` leases, when it fails a health check, or when a WebDriver error escapes
+    the lease (a crashed or hung browser).
+    """
+
+    def __init__(self, factory, size=2, max_pages=50, lease_timeout=30.0):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+        self._condition = threading.Condition()
+        self._idle = []
+        self._total = 0
+        self._closed = False
+        self._stats = {'created': 0, 'recycled': 0, 'crashed': 0, 'closed': 0, 'leases': 0, 'timeouts': 0}
+
+    def warm(self, count=1):
+        """Start `count` browsers now, e.g. to find out at startup whether Chrome works"""
+        for _ in range(min(count, self.size)):
+            with self._condition:
+                if self._total >= self.size:
+                    return self
+                self._total += 1
+            pooled = self._spawn()
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+        return self
+
+    def _spawn(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._total -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+        return _PooledDriver(driver)
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + (timeout if timeout is not None else self.lease_timeout)
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver pool is closed")
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        pooled = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(f"No browser free after {timeout if timeout is not None else self.lease_timeout}s")
+                    self._condition.wait(remaining)
+            if pooled is None:
+                return self._spawn()
+            if self._healthy(pooled.driver):
+                return pooled
+            # Dead browser: drop it and try again (its slot is free for a new one)
+            logger.warning("Recycling a WebDriver that failed its health check")
+            self._discard(pooled, 'crashed')
+
+    def _discard(self, pooled, reason='recycled'):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._condition:
+            self._total -= 1
+            self._stats[reason] += 1
+            self._condition.notify()
+
+    def _release(self, pooled, broken):
+        pooled.pages += 1
+        with self._condition:
+            if self._closed:
+                reason = 'closed'
+            elif broken:
+                reason = 'crashed'
+            elif pooled.pages >= self.max_pages:
+                reason = 'recycled'
+            else:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+        self._discard(pooled, reason)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Borrow a browser: `with pool.lease() as driver: driver.get(url)`"""
+        pooled = self._acquire(timeout)
+        with self._condition:
+            self._stats['leases'] += 1
+        broken = False
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(pooled, broken)
+
+    def stats(self):
+        with self._condition:
+            return dict(self._stats, size=self.size, open=self._total, idle=len(self._idle))
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when they are returned"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled, 'closed')
@@ -0,0 +1,35 @@
+from data.analytics import Analytics
+
+
+def _users(count):
+    return [
+        {
+            'id': f'p{index}',
+            'company': f'Company {index}',
+            'relationshipStatus': 'Active',
+            'tasks': [{'id': 't1', 'status': 'pending', 'priority': 'high', 'dueDay': 19000}]
+        }
+        for index in range(count)
+    ]
+
+
+def test_query_cache_keeps_the_most_recently_used_queries():
+    analytics = Analytics(partition_size=2, max_queries=3).build(_users(6))
+
+    for index in range(5):
+        analytics.aggregate('tasks', 'status', filters={'company': f'Company {index}'})
+    analytics.aggregate('tasks', 'status', filters={'company': 'Company 2'})
+    analytics.aggregate('tasks', 'status', filters={'company': 'Company 5'})
+
+    companies = [dict(key[2])['company'] for key in analytics.queries]
+    assert companies == ['Company 4', 'Company 2', 'Company 5']
+
+
+def test_evicted_query_is_recomputed():
+    analytics = Analytics(max_queries=1).build(_users(3))
+
+    first = analytics.aggregate('tasks', 'company')
+    analytics.aggregate('tasks', 'status')
+
+    assert analytics.aggregate('tasks', 'company') == first
+    assert first['totals']['tasks'] == 3
@@ -0,0 +1,71 @@
+from datetime import datetime
+import numpy as np
+from data.availability import OWNER, AvailabilityIndex, parse_ics
+
+MONDAY = datetime(2024, 3, 4, 8, 0)
+
+CALENDAR = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+DTSTART:20240304T090000
+DTEND:20240304T113000
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20240305T090000
+DURATION:PT1H
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20240306T090000
+DURATION:PT8H
+TRANSP:TRANSPARENT
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def _index(*meetings):
+    return AvailabilityIndex().build([{'id': 'p1', 'meetings': list(meetings)}])
+
+
+def _starts(slots):
+    return [(start.strftime('%a %H:%M'), end.strftime('%H:%M')) for start, end in slots]
+
+
+def test_meetings_make_you_and_the_contact_busy():
+    index = _index({'id': 'm1', 'date': '2024-03-04', 'start': '09:00', 'durationMinutes': 60})
+
+    busy = index.busy([OWNER, 'p1', 'p2'], MONDAY)
+    nine = 9 * 4
+    assert busy[:, nine:nine + 4].tolist() == [[True] * 4, [True] * 4, [False] * 4]
+    assert busy.sum(axis=1).tolist() == [4, 4, 0]
+
+
+def test_free_slots_skip_busy_times_and_stay_in_working_hours():
+    index = _index({'id': 'm1', 'date': '2024-03-04', 'start': '09:00', 'durationMinutes': 60})
+
+    assert _starts(index.free_slots(['p1'], 60, limit=3, start=MONDAY, one_per_day=False)) == [
+        ('Mon 10:00', '11:00'), ('Mon 10:30', '11:30'), ('Mon 11:00', '12:00')]
+    assert _starts(index.free_slots(['p1'], 60, limit=3, start=MONDAY)) == [
+        ('Mon 10:00', '11:00'), ('Tue 09:00', '10:00'), ('Wed 09:00', '10:00')]
+
+
+def test_free_slots_skip_the_weekend_and_the_past():
+    friday_evening = datetime(2024, 3, 8, 17, 40)
+
+    assert _starts(_index().free_slots(['p1'], 30, limit=1, start=friday_evening)) == [('Mon 09:00', '09:30')]
+    assert _starts(_index().free_slots(['p1'], 30, limit=1, start=datetime(2024, 3, 5, 9, 10))) == [('Tue 09:30', '10:00')]
+
+
+def test_imported_calendar_blocks_time():
+    assert len(parse_ics(CALENDAR)) == 2
+
+    index = _index()
+    assert index.import_calendar(CALENDAR) == 2
+    assert _starts(index.free_slots(['p1'], 60, limit=2, start=MONDAY)) == [
+        ('Mon 11:30', '12:30'), ('Tue 10:00', '11:00')]
+
+
+def test_window_fits_needs_every_slot_free():
+    free = np.array([[True, True, False, True, True, True]])
+
+    assert AvailabilityIndex.window_fits(free, 2)[0].tolist() == [True, False, False, True, True, False]
+    assert AvailabilityIndex.window_fits(free, 7)[0].tolist() == [False] * 6
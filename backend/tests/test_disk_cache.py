@@ -0,0 +1,29 @@
+from data.disk_cache import DiskCache
+
+
+def test_memory_hits_keep_entries_from_being_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache.sqlite3'), max_bytes=10**6)
+    for index in range(5):
+        cache.set(f'key{index}', 'x' * 100)
+
+    # Served from memory only, never read back from the file
+    assert cache.get('key0') == 'x' * 100
+    cache.max_bytes = 400
+    cache.set('key5', 'x' * 100)
+
+    assert cache.get('key0') == 'x' * 100
+    assert cache.get('key1') is None
+    cache.close()
+
+
+def test_memory_hits_are_written_in_batches(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache.sqlite3'), touch_batch=3)
+    for index in range(3):
+        cache.set(f'key{index}', index)
+
+    cache.get('key0')
+    cache.get('key1')
+    assert len(cache._touched) == 2
+    cache.get('key2')
+    assert cache._touched == {}
+    cache.close()
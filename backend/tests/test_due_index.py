@@ -0,0 +1,75 @@
+from datetime import datetime, time as day_time
+from data.dates import from_epoch_day, today_epoch_day
+from data.due_index import DueIndex
+from data.reminder_scheduler import ReminderScheduler
+
+DAY = 20000
+
+
+def _users(base=DAY):
+    return [
+        {'id': 'p1', 'name': 'Jordan Smith', 'tasks': [
+            {'id': 't1', 'title': 'Send deck', 'status': 'pending', 'dueDay': base + 3},
+            {'id': 't2', 'title': 'Review', 'status': 'completed', 'dueDay': base - 1},
+            {'id': 't3', 'title': 'Call', 'status': 'in-progress', 'dueDay': base - 2},
+            {'id': 't4', 'title': 'Someday', 'status': 'pending'},
+        ], 'finances': [
+            {'id': 'f1', 'type': 'owed', 'amount': 120, 'description': 'Workshop', 'dueDay': base + 1},
+            {'id': 'f2', 'type': 'owed', 'amount': 80, 'dueDay': base, 'settled': True},
+            {'id': 'f3', 'type': 'paid', 'amount': 50, 'dueDay': base},
+        ]},
+        {'id': 'p2', 'name': 'Alex Lee', 'tasks': [
+            {'id': 't5', 'title': 'Contract', 'status': 'overdue', 'dueDay': base + 1},
+        ], 'finances': []},
+    ]
+
+
+def _items(due):
+    return [(item['type'], item['itemId']) for item in due]
+
+
+def test_due_lists_pending_items_soonest_first():
+    index = DueIndex().build(_users())
+
+    assert _items(index.due(before_day=DAY + 3)) == [('task', 't3'), ('finance', 'f1'), ('task', 't5'), ('task', 't1')]
+    assert _items(index.due(before_day=DAY + 1, after_day=DAY)) == [('finance', 'f1'), ('task', 't5')]
+    assert _items(index.due(before_day=DAY + 3, kinds=['task'], limit=2)) == [('task', 't3'), ('task', 't5')]
+    assert index.count_due(DAY + 1) == {'task': 2, 'finance': 1}
+
+
+def test_events_keep_the_index_current():
+    users = _users()
+    index = DueIndex().build(users)
+
+    task = users[0]['tasks'][0]
+    task['status'] = 'completed'
+    index.on_repository_event('task_completed', users[0], task)
+    added = {'id': 't6', 'title': 'Late addition', 'status': 'pending', 'dueDay': DAY - 5}
+    index.on_repository_event('task_added', users[1], added)
+
+    assert _items(index.due(before_day=DAY + 3)) == [('task', 't6'), ('task', 't3'), ('finance', 'f1'), ('task', 't5')]
+
+
+def _at(day, hour):
+    return datetime.combine(from_epoch_day(day), day_time(hour)).timestamp()
+
+
+def test_reminders_fire_before_on_and_after_the_due_day():
+    base = today_epoch_day() + 10
+    users = _users(base)
+    scheduler = ReminderScheduler().schedule_all(users)
+
+    # t1 (due base + 3) is completed before its reminders come up
+    users[0]['tasks'][0]['status'] = 'completed'
+    assert scheduler.fire_due(now=_at(base + 1, 9)) == 7
+    fired = scheduler.reminders()
+    assert [(reminder['kind'], reminder['itemId']) for reminder in fired['reminders']] == [
+        ('upcoming', 't3'), ('due', 't3'), ('overdue', 't3'),
+        ('upcoming', 'f1'), ('upcoming', 't5'), ('due', 'f1'), ('due', 't5')]
+    assert fired['reminders'][3]['message'] == 'Reminder: $120 owed (Workshop) for Jordan Smith is due tomorrow'
+
+    assert scheduler.fire_due(now=_at(base + 10, 9)) == 2
+    later = scheduler.reminders(since_id=fired['lastId'])
+    assert [(reminder['kind'], reminder['itemId']) for reminder in later['reminders']] == [('overdue', 'f1'), ('overdue', 't5')]
+    assert later['pending'] == 0
+    assert scheduler.reminders(person_id='p2', limit=1)['reminders'][0]['itemId'] == 't5'
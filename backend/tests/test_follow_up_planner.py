@@ -0,0 +1,73 @@
+import pytest
+import data.follow_up_planner
+from data.follow_up_planner import FollowUpPlanner
+
+TODAY = 20000
+
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    monkeypatch.setattr(data.follow_up_planner, 'today_epoch_day', lambda: TODAY)
+
+
+def _user(person_id, status, last_day=None, timeline=()):
+    return {'id': person_id, 'name': person_id.upper(), 'relationshipStatus': status,
+            'lastContactedDay': last_day, 'timeline': list(timeline)}
+
+
+def _users():
+    return [
+        _user('a', 'Active', TODAY - 20),      # due TODAY - 13
+        _user('b', 'New', TODAY - 4),          # due TODAY - 1
+        _user('c', 'Close', TODAY - 5),        # due TODAY + 5
+        _user('d', 'Inactive'),                # never contacted: due today
+        _user('e', 'Active', TODAY - 30, [{'type': 'meeting', 'day': TODAY - 2},
+                                          {'type': 'task', 'day': TODAY + 1}]),  # due TODAY + 5
+        _user('f', 'Unknown', TODAY - 10),     # default cadence: due TODAY - 3
+        _user('g', 'New', TODAY - 4),          # ties with b
+    ]
+
+
+def _ids(page):
+    return [follow_up['personId'] for follow_up in page['followUps']]
+
+
+def test_due_contacts_most_overdue_first():
+    planner = FollowUpPlanner().build(_users())
+
+    page = planner.due()
+    assert _ids(page) == ['a', 'f', 'b', 'g', 'd']
+    assert page['followUps'][0]['daysOverdue'] == 13
+    assert page['total'] == 5
+    assert page['nextCursor'] is None
+    assert _ids(planner.due(before_day=TODAY + 5)) == ['a', 'f', 'b', 'g', 'd', 'c', 'e']
+
+
+def test_cursor_pages_through_every_due_contact_once():
+    planner = FollowUpPlanner().build(_users())
+
+    seen, cursor = [], None
+    while True:
+        page = planner.due(before_day=TODAY + 5, limit=2, cursor=cursor)
+        seen += _ids(page)
+        cursor = page['nextCursor']
+        if cursor is None:
+            break
+    assert seen == ['a', 'f', 'b', 'g', 'd', 'c', 'e']
+
+    with pytest.raises(ValueError):
+        planner.due(cursor='not-a-cursor')
+
+
+def test_interactions_move_one_contact():
+    users = _users()
+    planner = FollowUpPlanner().build(users)
+
+    planner.on_repository_event('meeting_added', users[0], {'id': 'm9', 'day': TODAY})
+    planner.on_repository_event('user_added', _user('h', 'Active', TODAY - 9), None)
+    # A meeting in the future is not a contact yet
+    planner.on_repository_event('meeting_added', users[1], {'id': 'm9', 'day': TODAY + 3})
+
+    assert _ids(planner.due()) == ['f', 'h', 'b', 'g', 'd']
+    assert planner.next_follow_up('a') == TODAY + 7
+    assert planner.next_follow_up('zz') is None
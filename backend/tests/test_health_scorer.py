@@ -0,0 +1,35 @@
+from data.dates import today_epoch_day
+from models.health_scorer import SCORE_WEIGHTS, RelationshipHealthScorer
+
+
+def _user(person_id, finances):
+    today = today_epoch_day()
+    return {
+        'id': person_id,
+        'name': person_id,
+        'lastContactedDay': today - 3,
+        'timeline': [{'day': today - 3, 'type': 'meeting'}],
+        'meetings': [{'sentiment': 'positive'}],
+        'tasks': [],
+        'finances': finances
+    }
+
+
+def test_weights_sum_to_one():
+    assert abs(sum(SCORE_WEIGHTS.values()) - 1.0) < 1e-9
+
+
+def test_money_owed_lowers_the_score_and_overdue_debt_more():
+    today = today_epoch_day()
+    scorer = RelationshipHealthScorer().refresh([
+        _user('clear', []),
+        _user('owing', [{'type': 'owed', 'amount': 1000, 'dueDay': today + 10}]),
+        _user('overdue', [{'type': 'owed', 'amount': 1000, 'dueDay': today - 10}]),
+        _user('owed to me', [{'type': 'owed', 'direction': 'from', 'amount': 1000, 'dueDay': today - 10}])
+    ])
+    scores = {person_id: scorer.get_score(person_id) for person_id in ('clear', 'owing', 'overdue', 'owed to me')}
+
+    assert scores['clear']['score'] > scores['owing']['score'] > scores['overdue']['score']
+    assert scores['owed to me']['score'] == scores['clear']['score']
+    assert scores['overdue']['features']['overdueOwedAmount'] == 1000
+    assert round(scores['clear']['score'] - scores['owing']['score'], 1) == round(100 * SCORE_WEIGHTS['finances'] * 1000 / 5000, 1)
@@ -0,0 +1,20 @@
+from models.lexicon_scorer import LexiconScorer
+
+
+def test_identity_follows_the_lexicon_contents(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('good\t2.0\t0.5\nawful\t-3.0\t0.5\n', encoding='utf-8')
+
+    default = LexiconScorer()
+    from_file = LexiconScorer.from_vader_lexicon(str(path))
+    path.write_text('good\t1.0\t0.5\nawful\t-3.0\t0.5\n', encoding='utf-8')
+    edited = LexiconScorer.from_vader_lexicon(str(path))
+
+    assert default.identity == LexiconScorer().identity
+    assert default.identity.startswith('default:')
+    assert from_file.identity.startswith('words.txt:')
+    assert len({default.identity, from_file.identity, edited.identity}) == 3
+
+
+def test_identity_covers_the_negation_rules():
+    assert LexiconScorer(negation_window=2).identity != LexiconScorer().identity
@@ -0,0 +1,14 @@
+from models.profile_scraper import ProfileScraper
+
+
+def test_no_driver_pool_when_the_first_browser_fails(monkeypatch):
+    def missing_chrome(self):
+        raise RuntimeError("Chrome not found")
+
+    monkeypatch.setattr(ProfileScraper, '_create_driver', missing_chrome)
+
+    scraper = ProfileScraper()
+
+    assert not scraper.selenium_initialized
+    assert scraper.driver_pool is None
+    scraper.close()
@@ -0,0 +1,32 @@
+import asyncio
+import time
+from data.disk_cache import DiskCache
+from models.response_cache import PageResponse, ResponseCache
+
+URL = 'https://www.google.com/search?q=Jordan+Example'
+
+
+def test_async_fetch_refreshes_stale_pages_after_the_loop_closes(tmp_path):
+    cache = ResponseCache(DiskCache(str(tmp_path / 'http.sqlite3')), ttls={'google': 0.2})
+    versions = iter(['v1', 'v2', 'v3'])
+    loads = []
+
+    def revalidate(validators):
+        loads.append('thread')
+        return PageResponse(200, next(versions), {})
+
+    async def load(validators):
+        loads.append('loop')
+        return PageResponse(200, next(versions), {})
+
+    def fetch():
+        return asyncio.run(cache.fetch_async(URL, 'google', load, revalidate)).text
+
+    assert fetch() == 'v1'
+    time.sleep(0.3)
+    # Stale: answered from the cache, refreshed on a revalidation thread
+    assert fetch() == 'v1'
+    cache._executor.shutdown(wait=True)
+    assert fetch() == 'v2'
+    assert loads == ['loop', 'thread']
+    assert cache.stats()['refreshed'] == 2
@@ -0,0 +1,31 @@
+from data.search_index import SearchIndex
+
+
+def _user(summary):
+    return {
+        'id': 'p1',
+        'name': 'Jordan Smith',
+        'meetings': [{'id': 'm1', 'title': 'Roadmap review', 'summary': summary, 'date': '2024-05-01'}],
+        'tasks': [],
+        'timeline': []
+    }
+
+
+def test_highlight_escapes_item_text():
+    index = SearchIndex().build([_user('Budget <script>alert(1)</script> & <img src=x onerror=alert(2)> roadmap')])
+
+    hit = index.search('budget')['hits'][0]
+
+    assert hit['highlight'].startswith('<mark>Budget</mark>')
+    assert '<script>' not in hit['highlight']
+    assert '<img' not in hit['highlight']
+    assert '&lt;script&gt;alert(1)&lt;/script&gt; &amp; &lt;img src=x onerror=alert(2)&gt;' in hit['highlight']
+
+
+def test_highlight_marks_every_match():
+    index = SearchIndex().build([_user('Budget first, then the budget again')])
+
+    hit = index.search('budget')['hits'][0]
+
+    assert hit['field'] == 'summary'
+    assert hit['highlight'] == '<mark>Budget</mark> first, then the <mark>budget</mark> again'
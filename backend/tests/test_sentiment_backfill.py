@@ -0,0 +1,54 @@
+import json
+from data.sentiment_backfill import pending_meetings
+from data.user_repository import UserRepository
+
+
+class StubAnalyzer:
+    def analyze(self, text):
+        return {'overall': 'positive', 'confidenceScore': 80, 'model': 'stub'}
+
+
+def _repository(tmp_path, meetings):
+    data_file = tmp_path / 'users.json'
+    data_file.write_text(json.dumps([{'id': 'p1', 'name': 'Jordan Smith', 'meetings': meetings, 'tasks': [], 'timeline': []}]))
+    return UserRepository(str(data_file), sentiment_analyzer=StubAnalyzer())
+
+
+def test_add_meeting_marks_labels_and_model_scores(tmp_path):
+    repo = _repository(tmp_path, [])
+
+    labelled = repo.add_meeting('p1', {'date': '2024-05-01', 'summary': 'Went well', 'sentiment': 'negative'})
+    scored = repo.add_meeting('p1', {'date': '2024-05-02', 'summary': 'Went well'})
+
+    assert (labelled['sentiment'], labelled['sentimentSource']) == ('negative', 'label')
+    assert 'sentimentConfidence' not in labelled
+    assert (scored['sentiment'], scored['sentimentSource']) == ('positive', 'model')
+
+
+def test_backfill_skips_labelled_and_scored_meetings(tmp_path):
+    repo = _repository(tmp_path, [
+        # Stored before sentimentSource existed: a label from the generator, and a model score
+        {'id': 'm1', 'date': '2024-05-01', 'summary': 'Labelled', 'sentiment': 'negative'},
+        {'id': 'm2', 'date': '2024-05-02', 'summary': 'Scored', 'sentiment': 'positive',
+         'sentimentConfidence': 90, 'sentimentModel': 'stub'},
+        {'id': 'm3', 'date': '2024-05-03', 'summary': 'Not scored yet'},
+        {'id': 'm4', 'date': '2024-05-04', 'summary': '', 'sentiment': 'neutral'},
+        # The default add_meeting stored when it had no analyzer
+        {'id': 'm5', 'date': '2024-05-05', 'summary': 'Defaulted', 'sentiment': 'neutral'}
+    ])
+    users = repo.get_all_users()
+
+    assert [meeting['id'] for meeting in pending_meetings(users)] == ['m3', 'm5']
+    assert [meeting['id'] for meeting in pending_meetings(users, force=True)] == ['m1', 'm2', 'm3', 'm5']
+    assert users[0]['meetings'][0]['sentimentSource'] == 'label'
+
+
+def test_meeting_added_without_an_analyzer_is_left_for_the_backfill(tmp_path):
+    repo = _repository(tmp_path, [])
+    repo.sentiment_analyzer = None
+
+    meeting = repo.add_meeting('p1', {'date': '2024-05-01', 'summary': 'Went well'})
+    reloaded = UserRepository(repo.data_file).get_all_users()
+
+    assert 'sentiment' not in meeting and 'sentimentSource' not in meeting
+    assert [pending['id'] for pending in pending_meetings(reloaded)] == [meeting['id']]
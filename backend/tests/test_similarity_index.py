@@ -0,0 +1,63 @@
+import json
+from models.similarity_index import ContactSimilarityIndex, HashingEmbedder
+
+
+def _user(index, summary='Quarterly planning'):
+    return {
+        'id': f'p{index}',
+        'name': f'Person {index}',
+        'role': 'Engineer',
+        'company': f'Company {index}',
+        'meetings': [{'title': 'Sync', 'summary': summary}]
+    }
+
+
+def test_new_meeting_appends_to_the_log_instead_of_the_sidecar(tmp_path):
+    path = str(tmp_path / 'embeddings')
+    index = ContactSimilarityIndex(embedder=HashingEmbedder(), path=path).sync([_user(i) for i in range(3)])
+    with open(index.meta_path) as f:
+        sidecar = f.read()
+    with open(index.log_path) as f:
+        logged = len(f.readlines())
+
+    index.update_user(_user(1, summary='Discussed the data migration'))
+    index.update_user(_user(3))
+
+    with open(index.meta_path) as f:
+        assert f.read() == sidecar
+    with open(index.log_path) as f:
+        assert [json.loads(line)['id'] for line in f.readlines()[logged:]] == ['p1', 'p3']
+
+
+def test_reload_replays_the_log(tmp_path):
+    path = str(tmp_path / 'embeddings')
+    index = ContactSimilarityIndex(embedder=HashingEmbedder(), path=path).sync([_user(i) for i in range(3)])
+    index.update_user(_user(1, summary='Discussed the data migration'))
+    index.update_user(_user(3))
+
+    reloaded = ContactSimilarityIndex(embedder=HashingEmbedder(), path=path)
+
+    assert reloaded.ids == index.ids
+    assert reloaded.hashes == index.hashes
+    assert reloaded.similar_to('p3') == index.similar_to('p3')
+
+
+def test_long_log_is_folded_into_the_sidecar(tmp_path):
+    path = str(tmp_path / 'embeddings')
+    index = ContactSimilarityIndex(embedder=HashingEmbedder(), path=path).sync([_user(0)])
+
+    for count in range(1, 1100):
+        index.update_user(_user(0, summary=f'Meeting {count}'))
+
+    assert index._logged < 1024
+    reloaded = ContactSimilarityIndex(embedder=HashingEmbedder(), path=path)
+    assert reloaded.hashes == index.hashes
+
+
+def test_query_matching_nobody_returns_nothing(tmp_path):
+    index = ContactSimilarityIndex(embedder=HashingEmbedder(), path=str(tmp_path / 'embeddings'))
+    index.sync([_user(i) for i in range(3)])
+
+    assert index.search('zyzzyva quokka') == []
+    assert [match['personId'] for match in index.search('quarterly planning', k=5)] != []
+    assert all(match['similarity'] > 0 for match in index.search('engineer', k=5))
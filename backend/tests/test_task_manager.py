@@ -0,0 +1,97 @@
+import datetime
+import pytest
+from models.task_manager import TaskManager
+
+TODAY = datetime.date(2024, 3, 6)  # a Wednesday
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.delenv('USE_PRETRAINED_MODEL', raising=False)
+    return TaskManager()
+
+
+def _finance(manager, command):
+    return manager.extract_financial_info(command, {'id': 'p1'}, today=TODAY)
+
+
+@pytest.mark.parametrize('command, status, direction', [
+    ("I need to pay the invoice from Acme for $300 by Friday", 'owed', 'to'),
+    ("I received the invoice for $400, need to pay it", 'owed', 'to'),
+    ("They charged me $50 for the subscription, I owe it", 'owed', 'to'),
+    ("We owe Sarah $120 for the workshop", 'owed', 'to'),
+    ("John owes me $1,200 by Friday", 'owed', 'from'),
+    ("Remind Sarah to pay me back $80", 'owed', 'from'),
+    ("I invoiced Acme $2k for the project", 'owed', 'from'),
+    ("I sent the invoice to Acme for $800", 'owed', 'from'),
+    ("I received $500 from Acme", 'received', 'from'),
+    ("Received payment of $250 from John", 'received', 'from'),
+    ("I paid Sarah $45", 'paid', 'to'),
+])
+def test_direction_follows_who_pays(manager, command, status, direction):
+    info = _finance(manager, command)
+    assert (info['status'], info['direction']) == (status, direction)
+
+
+def test_invoice_and_charge_words_set_the_type(manager):
+    assert _finance(manager, "I need to pay the invoice from Acme for $300")['type'] == 'invoice'
+    assert _finance(manager, "They charged me $50 for the subscription")['type'] == 'invoice'
+
+
+def test_amount_and_due_date(manager):
+    info = _finance(manager, "John owes me $1.5k for the consultation by Friday")
+    assert info['amountValue'] == 1500
+    assert info['amount'] == '$1,500'
+    assert info['category'] == 'consultation'
+    assert info['dueDateIso'] == '2024-03-08'
+    assert info['daysUntilDue'] == 2
+
+
+def test_payment_without_a_deadline_is_due_in_two_weeks(manager):
+    info = _finance(manager, "I owe Sarah 40 dollars")
+    assert info['amountValue'] == 40
+    assert info['dueDateIso'] == '2024-03-20'
+
+
+def _task(manager, command):
+    return manager.extract_task_info(command, today=TODAY)
+
+
+@pytest.mark.parametrize('command, title, deadline', [
+    ("create task: draft the contract for Monday", 'draft the contract', '2024-03-11'),
+    ("Create task: by Friday send the deck to Acme", 'send the deck to Acme', '2024-03-08'),
+    ("Assign Sarah to review the proposal by next Friday", 'review the proposal', '2024-03-15'),
+    ("assign John to call the bank tomorrow, urgent", 'call the bank', '2024-03-07'),
+    ("Add a task to prepare the board report due 2024-04-02", 'prepare the board report', '2024-04-02'),
+])
+def test_title_leaves_out_the_deadline(manager, command, title, deadline):
+    info = _task(manager, command)
+    assert (info['title'], info['deadlineDate']) == (title, deadline)
+
+
+def test_priority_sets_the_default_deadline(manager):
+    urgent = _task(manager, "Create task to email the lawyer asap")
+    relaxed = _task(manager, "Create task to tidy the CRM, no rush")
+
+    assert (urgent['title'], urgent['priority'], urgent['deadlineDate']) == ('email the lawyer', 'high', '2024-03-08')
+    assert (relaxed['priority'], relaxed['deadlineDate']) == ('low', '2024-03-20')
+    assert urgent['estimatedTime'] == '1 hour'
+
+
+@pytest.mark.parametrize('phrase, deadline', [
+    ('in 3 days', '2024-03-09'),
+    ('in two weeks', '2024-03-20'),
+    ('day after tomorrow', '2024-03-08'),
+    ('this Wednesday', '2024-03-13'),
+    ('end of month', '2024-03-31'),
+    ('next week', '2024-03-11'),
+    ('March 1st', '2025-03-01'),
+    ('15th of April', '2024-04-15'),
+])
+def test_deadline_phrases(manager, phrase, deadline):
+    assert _task(manager, f"Create task to send the invoice {phrase}")['deadlineDate'] == deadline
+
+
+def test_batch_matches_single_extraction(manager):
+    commands = ["create task: draft the contract for Monday", "Assign Sarah to review the proposal by next Friday"]
+    assert manager.extract_task_info_batch(commands, today=TODAY) == [_task(manager, command) for command in commands]
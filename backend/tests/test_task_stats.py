@@ -0,0 +1,58 @@
+from data.task_stats import TaskStats, is_overdue
+
+TODAY = 20000
+
+
+def _tasks():
+    return [
+        {'id': 't1', 'status': 'pending', 'priority': 'high', 'dueDay': TODAY - 3},
+        {'id': 't2', 'status': 'overdue', 'priority': 'medium', 'dueDay': TODAY + 5},
+        {'id': 't3', 'status': 'overdue', 'priority': 'medium', 'dueDay': TODAY - 1},
+        {'id': 't4', 'status': 'overdue', 'priority': 'low'},
+        {'id': 't5', 'status': 'in-progress', 'priority': 'low', 'dueDay': TODAY + 2},
+        {'id': 't6', 'status': 'completed', 'priority': 'high', 'dueDay': TODAY - 9},
+    ]
+
+
+def test_overdue_count_matches_is_overdue():
+    tasks = _tasks()
+    stats = TaskStats(tasks)
+
+    assert [task['id'] for task in tasks if is_overdue(task, TODAY)] == ['t1', 't2', 't3', 't4']
+    assert stats.overdue(TODAY) == 4
+    assert stats.overdue(TODAY + 10) == 5
+
+
+def test_completing_tasks_updates_the_counts():
+    tasks = _tasks()
+    stats = TaskStats(tasks)
+
+    stats.complete(tasks[2], 'overdue')
+    stats.complete(tasks[0], 'pending')
+
+    counts = stats.to_dict(TODAY)
+    assert counts['overdue'] == 2
+    assert counts['open'] == 3
+    assert counts['byStatus'] == {'overdue': 2, 'in-progress': 1, 'completed': 3}
+    # Priority weights: 3 + 2 + 2 + 1 + 1 + 3 in all, 3 + 2 + 3 completed
+    assert counts['completion'] == round(100 * 8 / 12)
+    assert counts['earliestDue'] is not None
+
+
+def test_progress_report_and_health_score_agree(monkeypatch):
+    from models.health_scorer import RelationshipHealthScorer
+    from models.progress_analyzer import ProgressAnalyzer
+    import data.task_stats
+    import models.progress_analyzer
+
+    monkeypatch.delenv('USE_PRETRAINED_MODEL', raising=False)
+    monkeypatch.setattr(models.progress_analyzer, 'today_epoch_day', lambda: TODAY)
+    monkeypatch.setattr(data.task_stats, 'today_epoch_day', lambda: TODAY)
+    person = {'id': 'p1', 'name': 'Jordan Smith',
+              'tasks': [{'id': 't1', 'status': 'overdue', 'priority': 'medium', 'dueDay': TODAY + 5}]}
+
+    report = ProgressAnalyzer().generate_progress_report(person)
+    features = RelationshipHealthScorer()._extract(person, TODAY)
+
+    assert report['onTrack'] is False
+    assert report['tasks']['overdue'] == features[4] == 1
@@ -0,0 +1,78 @@
+import random
+from data.timeline_store import TimelineStore
+
+TYPES = ('meeting', 'task', 'payment', 'contact')
+
+
+def _users(count=40, entries=12, seed=7):
+    rng = random.Random(seed)
+    users = []
+    for person in range(count):
+        timeline = [{'id': f'tl{person}_{index}', 'type': rng.choice(TYPES), 'day': 19000 + rng.randint(0, 60)}
+                    for index in range(entries)]
+        timeline.append({'id': f'tl{person}_undated', 'type': 'contact', 'day': None})
+        users.append({'id': f'p{person}', 'name': f'Person {person}', 'timeline': timeline})
+    return users
+
+
+def _walk(store, limit, **kwargs):
+    events, cursor = [], None
+    while True:
+        page = store.feed(limit=limit, cursor=cursor, **kwargs)
+        events += [(event['personId'], event['id'], event['day']) for event in page['events']]
+        cursor = page['nextCursor']
+        if cursor is None:
+            return events
+
+
+def test_feed_pages_every_dated_entry_once_newest_first():
+    users = _users()
+    store = TimelineStore().build(users)
+
+    events = _walk(store, limit=7)
+    expected = {(user['id'], entry['id'], entry['day']) for user in users for entry in user['timeline'] if entry['day'] is not None}
+    assert len(events) == len(expected) and set(events) == expected
+    days = [day for _, _, day in events]
+    assert days == sorted(days, reverse=True)
+    # Page size does not change the order
+    assert _walk(store, limit=50) == events
+    assert _walk(store, limit=1)[:30] == events[:30]
+
+
+def test_feed_filters_by_range_and_type():
+    users = _users()
+    store = TimelineStore().build(users)
+
+    events = _walk(store, limit=10, start_day=19010, end_day=19020, types=['meeting', 'payment'])
+    expected = {
+        (user['id'], entry['id'], entry['day']) for user in users for entry in user['timeline']
+        if entry['day'] is not None and 19010 <= entry['day'] <= 19020 and entry['type'] in ('meeting', 'payment')
+    }
+    assert set(events) == expected and len(events) == len(expected)
+    assert [day for _, _, day in events] == sorted((day for _, _, day in events), reverse=True)
+
+
+def test_contact_timeline_range_queries():
+    users = _users(count=1)
+    store = TimelineStore().build(users)
+    dated = sorted((entry for entry in users[0]['timeline'] if entry['day'] is not None), key=lambda entry: entry['day'])
+
+    everything = store.get_timeline('p0')
+    assert everything[-1]['id'] == 'tl0_undated'
+    assert [entry['day'] for entry in everything[:-1]] == [entry['day'] for entry in reversed(dated)]
+    in_range = store.get_timeline('p0', start_day=19020, end_day=19040, newest_first=False)
+    assert [entry['day'] for entry in in_range] == [entry['day'] for entry in dated if 19020 <= entry['day'] <= 19040]
+    assert all(entry['type'] == 'task' for entry in store.get_timeline('p0', types=['task']))
+    assert store.get_timeline('nobody') == []
+
+
+def test_repository_events_add_entries():
+    users = _users(count=2, entries=2)
+    store = TimelineStore().build(users)
+
+    users[0]['timeline'].append({'id': 'tl_m9', 'type': 'meeting', 'day': 20000})
+    store.on_repository_event('meeting_added', users[0], {'id': 'm9'})
+    store.on_repository_event('user_added', {'id': 'p9', 'name': 'New', 'timeline': [{'id': 'tl_x', 'type': 'contact', 'day': 19999}]}, None)
+
+    assert [(event['personId'], event['id']) for event in store.feed(limit=2)['events']] == [('p0', 'tl_m9'), ('p9', 'tl_x')]
+    assert store.stats() == {'contacts': 3, 'entries': 2 * 3 + 2}
@@ -0,0 +1,59 @@
+import json
+from data.user_repository import UserRepository
+
+
+def _repository(tmp_path):
+    data_file = tmp_path / 'users.json'
+    data_file.write_text(json.dumps([{'id': 'p1', 'name': 'Jordan Smith', 'meetings': [], 'tasks': [], 'finances': [], 'timeline': []}]))
+    return UserRepository(str(data_file))
+
+
+def test_add_user_notifies_listeners_and_persists(tmp_path):
+    repo = _repository(tmp_path)
+    events = []
+    repo.add_listener(lambda event, user, item: events.append((event, user['id'])))
+
+    added = repo.add_user({'id': 'p2', 'name': 'Alex Lee', 'lastContactedDate': '2024-05-01',
+                           'meetings': [], 'tasks': [], 'finances': [], 'timeline': []})
+
+    assert events == [('user_added', 'p2')]
+    assert added['lastContactedDay'] is not None
+    assert repo.get_task_stats('p2').total == 0
+    assert [user['id'] for user in UserRepository(repo.data_file).get_all_users()] == ['p1', 'p2']
+
+
+def test_add_user_rejects_a_taken_id(tmp_path):
+    repo = _repository(tmp_path)
+
+    assert repo.add_user({'id': 'p1', 'name': 'Someone Else', 'meetings': [], 'tasks': [], 'timeline': []}) is None
+    assert len(repo.get_all_users()) == 1
+
+
+def test_add_user_indexes_existing_items(tmp_path):
+    from data.availability import AvailabilityIndex
+    from data.due_index import DueIndex
+    from data.finance_ledger import FinanceLedger
+    from data.reminder_scheduler import ReminderScheduler
+    from data.sentiment_trend import SentimentTrendIndex
+
+    repo = _repository(tmp_path)
+    users = repo.get_all_users()
+    trends, due, reminders = SentimentTrendIndex().build(users), DueIndex().build(users), ReminderScheduler().schedule_all(users)
+    ledger, availability = FinanceLedger().build(users), AvailabilityIndex().build(users)
+    for index in (trends, due, reminders, ledger, availability):
+        repo.add_listener(index.on_repository_event)
+
+    repo.add_user({
+        'id': 'p2', 'name': 'Alex Lee', 'company': 'Acme',
+        'meetings': [{'id': 'm1', 'date': '2024-05-01', 'start': '10:00', 'title': 'Intro',
+                      'summary': 'Went well', 'sentiment': 'positive'}],
+        'tasks': [{'id': 't1', 'title': 'Send deck', 'status': 'pending', 'dueDate': '2099-01-10'}],
+        'finances': [{'id': 'f1', 'type': 'owed', 'direction': 'from', 'amount': 250, 'dueDate': '2099-01-12'}],
+        'timeline': []
+    })
+
+    assert trends.get_trend('p2')['personId'] == 'p2'
+    assert [(item['type'], item['itemId']) for item in due.due(before_day=10 ** 6)] == [('task', 't1'), ('finance', 'f1')]
+    assert {entry[5]['id'] for entry in reminders._heap} == {'t1', 'f1'}
+    assert ledger.contact_balance('p2')['receivable'] == 250
+    assert len(availability.intervals['p2']) == 1